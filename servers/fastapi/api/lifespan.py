@@ -3,7 +3,15 @@ import os
 
 from fastapi import FastAPI
 
+from services.concurrent_service import CONCURRENT_SERVICE
 from services.database import create_db_and_tables
+from services.docling_executor_service import DOCLING_EXECUTOR_SERVICE
+from services.export_executor_service import EXPORT_EXECUTOR_SERVICE
+from services.http_client_service import HTTP_CLIENT_SERVICE
+from services.icon_finder_service import ICON_FINDER_SERVICE
+from services.libreoffice_pool_service import LIBREOFFICE_POOL_SERVICE
+from services.pdf_rasterizer_service import PDF_RASTERIZER_SERVICE
+from services.llm_client import LLM_CLIENT_REGISTRY
 from utils.get_env import get_app_data_directory_env
 from utils.model_availability import (
     check_llm_and_image_provider_api_or_model_availability,
@@ -15,9 +23,21 @@ async def app_lifespan(_: FastAPI):
     """
     Lifespan context manager for FastAPI application.
     Initializes the application data directory and checks LLM model availability.
+    Loads the icon search index in the background.
+    Opens the shared HTTP session and closes it, along with pooled LLM
+    client connections, the export, PDF rasterizer and docling worker pools
+    and pooled LibreOffice instances, on shutdown.
 
     """
     os.makedirs(get_app_data_directory_env(), exist_ok=True)
     await create_db_and_tables()
+    await HTTP_CLIENT_SERVICE.start()
     await check_llm_and_image_provider_api_or_model_availability()
+    CONCURRENT_SERVICE.run_task(None, ICON_FINDER_SERVICE.initialize)
     yield
+    await LLM_CLIENT_REGISTRY.aclose()
+    await HTTP_CLIENT_SERVICE.close()
+    EXPORT_EXECUTOR_SERVICE.shutdown()
+    PDF_RASTERIZER_SERVICE.shutdown()
+    DOCLING_EXECUTOR_SERVICE.shutdown()
+    await LIBREOFFICE_POOL_SERVICE.close()
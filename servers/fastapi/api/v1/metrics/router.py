@@ -0,0 +1,75 @@
+from fastapi import APIRouter
+
+from services.docling_executor_service import DOCLING_EXECUTOR_SERVICE
+from services.document_retrieval_service import DOCUMENT_RETRIEVAL_SERVICE
+from services.documents_loader import get_document_cache
+from services.export_cache_service import EXPORT_CACHE_SERVICE
+from services.export_executor_service import EXPORT_EXECUTOR_SERVICE
+from services.icon_finder_service import ICON_FINDER_SERVICE
+from services.image_generation_service import get_image_cache
+from services.libreoffice_pool_service import LIBREOFFICE_POOL_SERVICE
+from services.llm_client import LLM_CLIENT_REGISTRY
+from services.pdf_rasterizer_service import PDF_RASTERIZER_SERVICE
+from utils.download_helpers import get_download_cache
+
+API_V1_METRICS_ROUTER = APIRouter(
+    prefix="/api/v1/metrics", tags=["Metrics"], include_in_schema=False
+)
+
+
+@API_V1_METRICS_ROUTER.get("/llm-clients")
+async def get_llm_client_pool_stats():
+    return LLM_CLIENT_REGISTRY.get_stats()
+
+
+@API_V1_METRICS_ROUTER.get("/image-cache")
+async def get_image_cache_stats():
+    image_cache = get_image_cache()
+    return image_cache.get_stats() if image_cache else None
+
+
+@API_V1_METRICS_ROUTER.get("/icon-cache")
+async def get_icon_cache_stats():
+    return ICON_FINDER_SERVICE.get_cache_stats()
+
+
+@API_V1_METRICS_ROUTER.get("/download-cache")
+async def get_download_cache_stats():
+    download_cache = get_download_cache()
+    return download_cache.get_stats() if download_cache else None
+
+
+@API_V1_METRICS_ROUTER.get("/export-executor")
+async def get_export_executor_stats():
+    return EXPORT_EXECUTOR_SERVICE.get_stats()
+
+
+@API_V1_METRICS_ROUTER.get("/export-cache")
+async def get_export_cache_stats():
+    return EXPORT_CACHE_SERVICE.get_stats()
+
+
+@API_V1_METRICS_ROUTER.get("/libreoffice-pool")
+async def get_libreoffice_pool_stats():
+    return LIBREOFFICE_POOL_SERVICE.get_stats()
+
+
+@API_V1_METRICS_ROUTER.get("/pdf-rasterizer")
+async def get_pdf_rasterizer_stats():
+    return PDF_RASTERIZER_SERVICE.get_stats()
+
+
+@API_V1_METRICS_ROUTER.get("/docling-executor")
+async def get_docling_executor_stats():
+    return DOCLING_EXECUTOR_SERVICE.get_stats()
+
+
+@API_V1_METRICS_ROUTER.get("/document-cache")
+async def get_document_cache_stats():
+    document_cache = get_document_cache()
+    return document_cache.get_stats() if document_cache else None
+
+
+@API_V1_METRICS_ROUTER.get("/document-index")
+async def get_document_index_stats():
+    return DOCUMENT_RETRIEVAL_SERVICE.get_stats()
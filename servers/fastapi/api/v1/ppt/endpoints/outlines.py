@@ -16,9 +16,10 @@ from models.sse_response import (
     SSEResponse,
     SSEStatusResponse,
 )
-from services.temp_file_service import TEMP_FILE_SERVICE
 from services.database import get_async_session
+from services.document_retrieval_service import DOCUMENT_RETRIEVAL_SERVICE
 from services.documents_loader import DocumentsLoader
+from utils.file_utils import get_original_file_name
 from utils.llm_calls.generate_presentation_outlines import generate_ppt_outline
 from utils.ppt_utils import get_presentation_title_from_outlines
 
@@ -34,20 +35,31 @@ async def stream_outlines(
     if not presentation:
         raise HTTPException(status_code=404, detail="Presentation not found")
 
-    temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
-
     async def inner():
         yield SSEStatusResponse(
             status="Generating presentation outlines..."
         ).to_string()
 
         additional_context = ""
+        indexing_task = None
         if presentation.file_paths:
+            # Reports progress while later pages of large PDFs are still
+            # parsed; the outline prompt needs every section, so it is only
+            # sent once the last one arrives
             documents_loader = DocumentsLoader(file_paths=presentation.file_paths)
-            await documents_loader.load_documents(temp_dir)
-            documents = documents_loader.documents
-            if documents:
-                additional_context = "\n\n".join(documents)
+            sections = []
+            async for file_path, section in documents_loader.iterate_documents():
+                sections.append(section)
+                yield SSEStatusResponse(
+                    status=f"Reading {get_original_file_name(file_path)}..."
+                ).to_string()
+            additional_context = "\n\n".join(sections)
+            # Indexed for slide generation while the outlines are generated
+            indexing_task = asyncio.create_task(
+                DOCUMENT_RETRIEVAL_SERVICE.index_documents(
+                    presentation.id, presentation.file_paths, sections
+                )
+            )
 
         presentation_outlines_text = ""
 
@@ -106,6 +118,13 @@ async def stream_outlines(
         sql_session.add(presentation)
         await sql_session.commit()
 
+        if indexing_task:
+            try:
+                await indexing_task
+            except Exception:
+                # Slide generation indexes the documents again
+                traceback.print_exc()
+
         yield SSECompleteResponse(
             key="presentation", value=presentation.model_dump(mode="json")
         ).to_string()
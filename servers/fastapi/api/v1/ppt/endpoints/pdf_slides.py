@@ -35,7 +35,7 @@ async def process_pdf_slides(
 
     This endpoint:
     1. Validates the uploaded PDF file
-    2. Uses ImageMagick to convert PDF pages to PNG images
+    2. Renders PDF pages to JPEG images in parallel
     3. Returns screenshot URLs for each slide/page
 
     Note: Font installation is not needed since PDFs already have fonts embedded.
@@ -67,13 +67,6 @@ async def process_pdf_slides(
                 pdf_content = await pdf_file.read()
                 f.write(pdf_content)
 
-            # Generate screenshots from PDF using ImageMagick
-            screenshot_paths = await DocumentsLoader.get_page_images_from_pdf_async(
-                pdf_path, temp_dir
-            )
-            print(f"Generated {len(screenshot_paths)} PDF screenshots")
-
-            # Move screenshots to images directory and generate URLs
             images_dir = get_images_directory()
             presentation_id = uuid.uuid4()
             presentation_images_dir = os.path.join(images_dir, str(presentation_id))
@@ -81,9 +74,13 @@ async def process_pdf_slides(
 
             slides_data = []
 
-            for i, screenshot_path in enumerate(screenshot_paths, 1):
-                # Move screenshot to permanent location
-                screenshot_filename = f"slide_{i}.png"
+            # Render pages in parallel and move each screenshot to the images
+            # directory as soon as it is ready
+            async for screenshot_path in DocumentsLoader.iterate_page_images_from_pdf(
+                pdf_path, temp_dir, image_format="jpeg"
+            ):
+                i = len(slides_data) + 1
+                screenshot_filename = f"slide_{i}.jpg"
                 permanent_screenshot_path = os.path.join(
                     presentation_images_dir, screenshot_filename
                 )
@@ -104,6 +101,7 @@ async def process_pdf_slides(
                 slides_data.append(
                     PdfSlideData(slide_number=i, screenshot_url=screenshot_url)
                 )
+            print(f"Generated {len(slides_data)} PDF screenshots")
 
             return PdfSlidesResponse(
                 success=True, slides=slides_data, total_slides=len(slides_data)
@@ -1,18 +1,30 @@
+import io
 import os
 import shutil
 import zipfile
 import tempfile
 import subprocess
 import uuid
-from typing import List, Optional, Dict
+from typing import IO, Iterable, List, Optional, Dict, Set, Tuple, Union
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from pydantic import BaseModel
 import aiohttp
 import asyncio
 import xml.etree.ElementTree as ET
 import re
-
-from services.documents_loader import DocumentsLoader
+import json
+from fastapi.responses import StreamingResponse
+
+from models.sse_response import (
+    SSECompleteResponse,
+    SSEErrorResponse,
+    SSEResponse,
+    SSEStatusResponse,
+)
+from services.http_client_service import HTTP_CLIENT_SERVICE
+from services.libreoffice_pool_service import LIBREOFFICE_POOL_SERVICE
+from services.pdf_rasterizer_service import PDF_RASTERIZER_SERVICE
+from services.temp_file_service import TEMP_FILE_SERVICE
 from utils.asset_directory_utils import get_images_directory
 import uuid
 from constants.documents import POWERPOINT_TYPES
@@ -144,6 +156,25 @@ def normalize_font_family_name(raw_name: str) -> str:
     return normalized
 
 
+# Theme font placeholders, resolved through the theme rather than by name
+_THEME_FONT_REFERENCES = {"+mn-lt", "+mj-lt", "+mn-ea", "+mj-ea", "+mn-cs", "+mj-cs"}
+
+
+def _iterparse_fonts(source: Union[str, IO[bytes]]) -> Set[str]:
+    """
+    Collect every typeface reference (a:latin, a:ea, a:cs, a:font, a:sym,
+    run properties, ...) in a single streaming pass over an OXML part.
+    """
+    fonts = set()
+    for _, elem in ET.iterparse(source, events=("end",)):
+        typeface = elem.get("typeface")
+        if typeface and typeface.strip() and typeface not in _THEME_FONT_REFERENCES:
+            fonts.add(typeface)
+        # Drop parsed subtrees, only the typefaces are kept
+        elem.clear()
+    return fonts
+
+
 def extract_fonts_from_oxml(xml_content: str) -> List[str]:
     """
     Extract font names from OXML content.
@@ -154,62 +185,8 @@ def extract_fonts_from_oxml(xml_content: str) -> List[str]:
     Returns:
         List of unique font names found in the OXML
     """
-    fonts = set()
-
     try:
-        # Parse the XML content
-        root = ET.fromstring(xml_content)
-
-        # Define namespaces commonly used in OXML
-        namespaces = {
-            "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
-            "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
-            "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
-        }
-
-        # Search for font references in various OXML elements
-        # Look for latin fonts
-        for font_elem in root.findall(".//a:latin", namespaces):
-            if "typeface" in font_elem.attrib:
-                fonts.add(font_elem.attrib["typeface"])
-
-        # Look for east asian fonts
-        for font_elem in root.findall(".//a:ea", namespaces):
-            if "typeface" in font_elem.attrib:
-                fonts.add(font_elem.attrib["typeface"])
-
-        # Look for complex script fonts
-        for font_elem in root.findall(".//a:cs", namespaces):
-            if "typeface" in font_elem.attrib:
-                fonts.add(font_elem.attrib["typeface"])
-
-        # Look for font references in theme elements
-        for font_elem in root.findall(".//a:font", namespaces):
-            if "typeface" in font_elem.attrib:
-                fonts.add(font_elem.attrib["typeface"])
-
-        # Look for rPr (run properties) font references
-        for rpr_elem in root.findall(".//a:rPr", namespaces):
-            for font_elem in rpr_elem.findall(".//a:latin", namespaces):
-                if "typeface" in font_elem.attrib:
-                    fonts.add(font_elem.attrib["typeface"])
-
-        # Also search without namespace prefix for compatibility
-        for font_elem in root.findall(".//latin"):
-            if "typeface" in font_elem.attrib:
-                fonts.add(font_elem.attrib["typeface"])
-
-        # Regex fallback for fonts that might be missed
-        font_pattern = r'typeface="([^"]+)"'
-        regex_fonts = re.findall(font_pattern, xml_content)
-        fonts.update(regex_fonts)
-
-        # Filter out system fonts and empty values
-        system_fonts = {"+mn-lt", "+mj-lt", "+mn-ea", "+mj-ea", "+mn-cs", "+mj-cs", ""}
-        fonts = {font for font in fonts if font not in system_fonts and font.strip()}
-
-        return list(fonts)
-
+        return list(_iterparse_fonts(io.BytesIO(xml_content.encode("utf-8"))))
     except Exception as e:
         print(f"Error extracting fonts from OXML: {e}")
         return []
@@ -229,33 +206,27 @@ async def check_google_font_availability(font_name: str) -> bool:
         formatted_name = font_name.replace(" ", "+")
         url = f"https://fonts.googleapis.com/css2?family={formatted_name}&display=swap"
 
-        async with aiohttp.ClientSession() as session:
-            async with session.head(
-                url, timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                return response.status == 200
+        session = HTTP_CLIENT_SERVICE.get_session()
+        async with session.head(
+            url, timeout=aiohttp.ClientTimeout(total=10)
+        ) as response:
+            return response.status == 200
 
     except Exception as e:
         print(f"Error checking Google Font availability for {font_name}: {e}")
         return False
 
 
-async def analyze_fonts_in_all_slides(slide_xmls: List[str]) -> FontAnalysisResult:
+async def analyze_fonts(raw_fonts: Iterable[str]) -> FontAnalysisResult:
     """
     Analyze fonts across all slides and determine Google Fonts availability.
 
     Args:
-        slide_xmls: List of OXML content strings from all slides
+        raw_fonts: Raw font names used by the slides, see _get_slide_fonts
 
     Returns:
         FontAnalysisResult with supported and unsupported fonts
     """
-    # Extract fonts from all slides
-    raw_fonts = set()
-    for xml_content in slide_xmls:
-        slide_fonts = extract_fonts_from_oxml(xml_content)
-        raw_fonts.update(slide_fonts)
-
     # Normalize to root families (e.g., "Montserrat Italic" -> "Montserrat")
     normalized_fonts = {normalize_font_family_name(f) for f in raw_fonts}
     # Remove empties if any
@@ -297,27 +268,12 @@ async def process_pptx_slides(
     This endpoint:
     1. Validates the uploaded PPTX file
     2. Installs any provided font files
-    3. Unzips the PPTX to extract slide XMLs
+    3. Reads slide XMLs and their fonts from the PPTX archive
     4. Uses LibreOffice to generate slide screenshots
     5. Returns both screenshot URLs and XML content for each slide
     """
 
-    # Validate PPTX file
-    if pptx_file.content_type not in POWERPOINT_TYPES:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid file type. Expected PPTX file, got {pptx_file.content_type}",
-        )
-    # Enforce 100MB size limit
-    if (
-        hasattr(pptx_file, "size")
-        and pptx_file.size
-        and pptx_file.size > (100 * 1024 * 1024)
-    ):
-        raise HTTPException(
-            status_code=400,
-            detail="PPTX file exceeded max upload size of 100 MB",
-        )
+    _validate_pptx_file(pptx_file)
 
     # Create temporary directory for processing
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -332,20 +288,23 @@ async def process_pptx_slides(
             if fonts:
                 await _install_fonts(fonts, temp_dir)
 
-            # Extract slide XMLs from PPTX
-            slide_xmls = _extract_slide_xmls(pptx_path, temp_dir)
+            # Read every slide's fonts straight from the PPTX archive
+            slide_names, slide_fonts = await asyncio.to_thread(
+                _get_slide_fonts, pptx_path
+            )
+            raw_fonts = set().union(*slide_fonts)
 
             # Convert PPTX to PDF
-            pdf_path = await _convert_pptx_to_pdf(pptx_path, temp_dir)
+            pdf_path = await _convert_pptx_to_pdf(pptx_path, temp_dir, raw_fonts)
 
             # Generate screenshots using LibreOffice
-            screenshot_paths = await DocumentsLoader.get_page_images_from_pdf_async(
+            screenshot_paths = await PDF_RASTERIZER_SERVICE.get_page_images(
                 pdf_path, temp_dir
             )
             print(f"Screenshot paths: {screenshot_paths}")
 
             # Analyze fonts across all slides
-            font_analysis = await analyze_fonts_in_all_slides(slide_xmls)
+            font_analysis = await analyze_fonts(raw_fonts)
             print(
                 f"Font analysis completed: {len(font_analysis.internally_supported_fonts)} supported, {len(font_analysis.not_supported_fonts)} not supported"
             )
@@ -358,42 +317,28 @@ async def process_pptx_slides(
 
             slides_data = []
 
-            for i, (xml_content, screenshot_path) in enumerate(
-                zip(slide_xmls, screenshot_paths), 1
-            ):
-                # Move screenshot to permanent location
-                screenshot_filename = f"slide_{i}.png"
-                permanent_screenshot_path = os.path.join(
-                    presentation_images_dir, screenshot_filename
-                )
-
-                if (
-                    os.path.exists(screenshot_path)
-                    and os.path.getsize(screenshot_path) > 0
+            with zipfile.ZipFile(pptx_path, "r") as zip_ref:
+                for i, (slide_name, raw_slide_fonts, screenshot_path) in enumerate(
+                    zip(slide_names, slide_fonts, screenshot_paths), 1
                 ):
-                    # Use shutil.copy2 instead of os.rename to handle cross-device moves
-                    shutil.copy2(screenshot_path, permanent_screenshot_path)
-                    screenshot_url = (
-                        f"/app_data/images/{presentation_id}/{screenshot_filename}"
+                    # Move screenshot to permanent location
+                    screenshot_url = _save_slide_screenshot(
+                        screenshot_path, presentation_images_dir, presentation_id, i
                     )
-                else:
-                    # Fallback if screenshot generation failed or file is empty placeholder
-                    screenshot_url = "/static/images/placeholder.jpg"
-
-                # Compute normalized fonts for this slide
-                raw_slide_fonts = extract_fonts_from_oxml(xml_content)
-                normalized_fonts = sorted(
-                    {normalize_font_family_name(f) for f in raw_slide_fonts if f}
-                )
-
-                slides_data.append(
-                    SlideData(
-                        slide_number=i,
-                        screenshot_url=screenshot_url,
-                        xml_content=xml_content,
-                        normalized_fonts=normalized_fonts,
+
+                    # Normalize this slide's fonts
+                    normalized_fonts = sorted(
+                        {normalize_font_family_name(f) for f in raw_slide_fonts}
+                    )
+
+                    slides_data.append(
+                        SlideData(
+                            slide_number=i,
+                            screenshot_url=screenshot_url,
+                            xml_content=zip_ref.read(slide_name).decode("utf-8"),
+                            normalized_fonts=normalized_fonts,
+                        )
                     )
-                )
 
             return PptxSlidesResponse(
                 success=True,
@@ -403,6 +348,98 @@ async def process_pptx_slides(
             )
 
 
+@PPTX_SLIDES_ROUTER.post("/process/stream")
+async def stream_pptx_slides(
+    pptx_file: UploadFile = File(..., description="PPTX file to process"),
+    fonts: Optional[List[UploadFile]] = File(None, description="Optional font files"),
+):
+    """
+    Streaming variant of /process.
+
+    Emits each slide's screenshot URL, XML content and normalized fonts as
+    an SSE "slide" event as soon as its page is rasterized, then completes
+    with the total slide count and the font analysis. Font availability is
+    checked while the presentation is converted.
+    """
+    _validate_pptx_file(pptx_file)
+
+    # Uploads are read before the response starts streaming, inner() owns
+    # the temp dir from then on
+    temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
+    try:
+        pptx_path = os.path.join(temp_dir, "presentation.pptx")
+        with open(pptx_path, "wb") as f:
+            f.write(await pptx_file.read())
+        if fonts:
+            await _install_fonts(fonts, temp_dir)
+    except BaseException:
+        TEMP_FILE_SERVICE.cleanup_temp_dir(temp_dir)
+        raise
+
+    async def inner():
+        font_analysis_task = None
+        try:
+            yield SSEStatusResponse(status="Reading slides...").to_string()
+            slide_names, slide_fonts = await asyncio.to_thread(
+                _get_slide_fonts, pptx_path
+            )
+            raw_fonts = set().union(*slide_fonts)
+            font_analysis_task = asyncio.create_task(analyze_fonts(raw_fonts))
+
+            yield SSEStatusResponse(status="Converting presentation...").to_string()
+            pdf_path = await _convert_pptx_to_pdf(pptx_path, temp_dir, raw_fonts)
+
+            presentation_id = uuid.uuid4()
+            presentation_images_dir = os.path.join(
+                get_images_directory(), str(presentation_id)
+            )
+            os.makedirs(presentation_images_dir, exist_ok=True)
+
+            total_slides = 0
+            with zipfile.ZipFile(pptx_path, "r") as zip_ref:
+                async for screenshot_path in PDF_RASTERIZER_SERVICE.iterate_page_images(
+                    pdf_path, temp_dir
+                ):
+                    if total_slides == len(slide_names):
+                        break
+                    i = total_slides + 1
+                    slide = SlideData(
+                        slide_number=i,
+                        screenshot_url=_save_slide_screenshot(
+                            screenshot_path, presentation_images_dir, presentation_id, i
+                        ),
+                        xml_content=zip_ref.read(slide_names[i - 1]).decode("utf-8"),
+                        normalized_fonts=sorted(
+                            {normalize_font_family_name(f) for f in slide_fonts[i - 1]}
+                        ),
+                    )
+                    total_slides = i
+                    yield SSEResponse(
+                        event="response",
+                        data=json.dumps({"type": "slide", "slide": slide.model_dump()}),
+                    ).to_string()
+
+            font_analysis = await font_analysis_task
+            yield SSECompleteResponse(
+                key="pptx_slides",
+                value={
+                    "total_slides": total_slides,
+                    "fonts": font_analysis.model_dump(),
+                },
+            ).to_string()
+        except Exception as e:
+            print(f"Error processing PPTX slides: {str(e)}")
+            yield SSEErrorResponse(
+                detail=f"Failed to process PPTX: {str(e)}"
+            ).to_string()
+        finally:
+            if font_analysis_task:
+                font_analysis_task.cancel()
+            TEMP_FILE_SERVICE.cleanup_temp_dir(temp_dir)
+
+    return StreamingResponse(inner(), media_type="text/event-stream")
+
+
 # NEW: Fonts-only endpoint leveraging the same font extraction/analysis
 @PPTX_FONTS_ROUTER.post("/process", response_model=PptxFontsResponse)
 async def process_pptx_fonts(
@@ -428,11 +465,11 @@ async def process_pptx_fonts(
             pptx_content = await pptx_file.read()
             f.write(pptx_content)
 
-        # Extract slide XMLs from PPTX
-        slide_xmls = _extract_slide_xmls(pptx_path, temp_dir)
+        # Read every slide's fonts straight from the PPTX archive
+        _, slide_fonts = await asyncio.to_thread(_get_slide_fonts, pptx_path)
 
         # Analyze fonts across all slides (same logic as in /pptx-slides)
-        font_analysis = await analyze_fonts_in_all_slides(slide_xmls)
+        font_analysis = await analyze_fonts(set().union(*slide_fonts))
 
         return PptxFontsResponse(
             success=True,
@@ -440,42 +477,53 @@ async def process_pptx_fonts(
         )
 
 
-def _create_font_alias_config(raw_fonts: List[str]) -> str:
-    """Create a temporary fontconfig configuration that aliases variant family names to normalized root families.
-    Returns the path to the config file.
-    """
-    # Build mapping from raw -> normalized where different
+def _validate_pptx_file(pptx_file: UploadFile) -> None:
+    # Validate PPTX file
+    if pptx_file.content_type not in POWERPOINT_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file type. Expected PPTX file, got {pptx_file.content_type}",
+        )
+    # Enforce 100MB size limit
+    if (
+        hasattr(pptx_file, "size")
+        and pptx_file.size
+        and pptx_file.size > (100 * 1024 * 1024)
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="PPTX file exceeded max upload size of 100 MB",
+        )
+
+
+def _save_slide_screenshot(
+    screenshot_path: str,
+    presentation_images_dir: str,
+    presentation_id: uuid.UUID,
+    slide_number: int,
+) -> str:
+    """Copy a slide screenshot to the images directory and return its URL."""
+    screenshot_filename = f"slide_{slide_number}.png"
+    permanent_screenshot_path = os.path.join(
+        presentation_images_dir, screenshot_filename
+    )
+
+    if os.path.exists(screenshot_path) and os.path.getsize(screenshot_path) > 0:
+        # Use shutil.copy2 instead of os.rename to handle cross-device moves
+        shutil.copy2(screenshot_path, permanent_screenshot_path)
+        return f"/app_data/images/{presentation_id}/{screenshot_filename}"
+    # Fallback if screenshot generation failed or file is empty placeholder
+    return "/static/images/placeholder.jpg"
+
+
+def _get_font_aliases(raw_fonts: Iterable[str]) -> Dict[str, str]:
+    """Map variant family names to their normalized root families where they differ."""
     mappings: Dict[str, str] = {}
     for f in raw_fonts:
         normalized = normalize_font_family_name(f)
         if normalized and normalized != f:
             mappings[f] = normalized
-    # Create config only if we have mappings
-    fd, fonts_conf_path = tempfile.mkstemp(prefix="fonts_alias_", suffix=".conf")
-    os.close(fd)
-    with open(fonts_conf_path, "w", encoding="utf-8") as cfg:
-        cfg.write(
-            """<?xml version='1.0'?>
-<!DOCTYPE fontconfig SYSTEM "urn:fontconfig:fonts.dtd">
-<fontconfig>
-  <include>/etc/fonts/fonts.conf</include>
-"""
-        )
-        for src, dst in mappings.items():
-            cfg.write(
-                f"""
-  <match target="pattern">
-    <test name="family" compare="eq">
-      <string>{src}</string>
-    </test>
-    <edit name="family" mode="assign" binding="strong">
-      <string>{dst}</string>
-    </edit>
-  </match>
-"""
-            )
-        cfg.write("\n</fontconfig>\n")
-    return fonts_conf_path
+    return mappings
 
 
 async def _install_fonts(fonts: List[UploadFile], temp_dir: str) -> None:
@@ -506,107 +554,65 @@ async def _install_fonts(fonts: List[UploadFile], temp_dir: str) -> None:
     except subprocess.CalledProcessError as e:
         print(f"Warning: Failed to refresh font cache: {e}")
 
+    # Pooled LibreOffice instances only see new fonts after a restart
+    LIBREOFFICE_POOL_SERVICE.invalidate_fonts()
 
-def _extract_slide_xmls(pptx_path: str, temp_dir: str) -> List[str]:
-    """Extract slide XML content from PPTX file."""
-    slide_xmls = []
-    extract_dir = os.path.join(temp_dir, "pptx_extract")
-
-    try:
-        # Unzip PPTX file
-        with zipfile.ZipFile(pptx_path, "r") as zip_ref:
-            zip_ref.extractall(extract_dir)
 
-        # Look for slides in ppt/slides/ directory
-        slides_dir = os.path.join(extract_dir, "ppt", "slides")
+def _get_slide_xml_names(zip_ref: zipfile.ZipFile) -> List[str]:
+    """Slide XML part names sorted by slide number."""
+    slide_names = [
+        name
+        for name in zip_ref.namelist()
+        if re.fullmatch(r"ppt/slides/slide\d+\.xml", name)
+    ]
+    slide_names.sort(key=lambda x: int(re.search(r"(\d+)\.xml$", x).group(1)))
+    return slide_names
 
-        if not os.path.exists(slides_dir):
-            raise Exception("No slides directory found in PPTX file")
 
-        # Get all slide XML files and sort them numerically
-        slide_files = [
-            f
-            for f in os.listdir(slides_dir)
-            if f.startswith("slide") and f.endswith(".xml")
-        ]
-        slide_files.sort(key=lambda x: int(x.replace("slide", "").replace(".xml", "")))
-
-        # Read XML content from each slide
-        for slide_file in slide_files:
-            slide_path = os.path.join(slides_dir, slide_file)
-            with open(slide_path, "r", encoding="utf-8") as f:
-                slide_xmls.append(f.read())
-
-        return slide_xmls
+def _get_slide_fonts(pptx_path: str) -> Tuple[List[str], List[Set[str]]]:
+    """
+    Read the fonts of every slide straight from the PPTX archive, parsing
+    each slide part once without extracting it. Returns the slide part
+    names and the raw fonts of each slide.
+    """
+    try:
+        with zipfile.ZipFile(pptx_path, "r") as zip_ref:
+            slide_names = _get_slide_xml_names(zip_ref)
+            if not slide_names:
+                raise Exception("No slides directory found in PPTX file")
+
+            slide_fonts = []
+            for name in slide_names:
+                try:
+                    with zip_ref.open(name) as slide_part:
+                        slide_fonts.append(_iterparse_fonts(slide_part))
+                except ET.ParseError as e:
+                    print(f"Error extracting fonts from {name}: {e}")
+                    slide_fonts.append(set())
+        return slide_names, slide_fonts
 
     except Exception as e:
         raise Exception(f"Failed to extract slide XMLs: {str(e)}")
 
 
-async def _convert_pptx_to_pdf(pptx_path: str, temp_dir: str) -> str:
-    """Generate PNG screenshots of PPTX slides using LibreOffice + ImageMagick."""
+async def _convert_pptx_to_pdf(
+    pptx_path: str, temp_dir: str, raw_fonts: Iterable[str]
+) -> str:
+    """Convert a PPTX file to PDF on the pooled LibreOffice instances."""
     screenshots_dir = os.path.join(temp_dir, "screenshots")
     os.makedirs(screenshots_dir, exist_ok=True)
 
     try:
-        # First, get the number of slides by extracting XMLs
-        slide_xmls = _extract_slide_xmls(pptx_path, temp_dir)
-        slide_count = len(slide_xmls)
-
-        # Build font alias config to force variant families to resolve to normalized root families
-        raw_fonts: List[str] = []
-        for xml in slide_xmls:
-            raw_fonts.extend(extract_fonts_from_oxml(xml))
-        raw_fonts = list({f for f in raw_fonts if f})
-        fonts_conf_path = _create_font_alias_config(raw_fonts)
-        env = os.environ.copy()
-        env["FONTCONFIG_FILE"] = fonts_conf_path
-
-        print(f"Found {slide_count} slides in presentation")
+        # Alias variant families to their normalized root families
+        font_aliases = _get_font_aliases(raw_fonts)
 
         # Step 1: Convert PPTX to PDF using LibreOffice
         print("Starting LibreOffice PDF conversion...")
-        pdf_filename = "temp_presentation.pdf"
-        pdf_path = os.path.join(screenshots_dir, pdf_filename)
-
-        try:
-            libreoffice_cmd = os.getenv("LIBREOFFICE_PATH", "libreoffice")
-            print(f"Using LibreOffice command: {libreoffice_cmd}")
-            
-            result = subprocess.run(
-                [
-                    libreoffice_cmd,
-                    "--headless",
-                    "--convert-to",
-                    "pdf",
-                    "--outdir",
-                    screenshots_dir,
-                    pptx_path,
-                ],
-                check=True,
-                capture_output=True,
-                text=True,
-                timeout=500,
-                env=env,
-            )
-
-            print(f"LibreOffice PDF conversion output: {result.stdout}")
-            if result.stderr:
-                print(f"LibreOffice PDF conversion warnings: {result.stderr}")
-        except subprocess.TimeoutExpired:
-            raise Exception("LibreOffice PDF conversion timed out after 120 seconds")
-        except subprocess.CalledProcessError as e:
-            error_msg = e.stderr if e.stderr else str(e)
-            raise Exception(f"LibreOffice PDF conversion failed: {error_msg}")
-
-        # Find the generated PDF file (LibreOffice uses original filename)
-        pdf_files = [f for f in os.listdir(screenshots_dir) if f.endswith(".pdf")]
-        if not pdf_files:
-            raise Exception("LibreOffice failed to generate PDF file")
-
-        actual_pdf_path = os.path.join(screenshots_dir, pdf_files[0])
-        print(f"Generated PDF: {actual_pdf_path}")
-        return actual_pdf_path
+        pdf_path = await LIBREOFFICE_POOL_SERVICE.convert_to_pdf(
+            pptx_path, screenshots_dir, font_aliases
+        )
+        print(f"Generated PDF: {pdf_path}")
+        return pdf_path
 
     except Exception as e:
         # Re-raise the specific exceptions we've already handled
@@ -1,13 +1,22 @@
 import asyncio
+from contextlib import aclosing
 from datetime import datetime
 import json
 import math
 import os
 import random
 import traceback
-from typing import Annotated, List, Literal, Optional, Tuple
+from typing import Annotated, Dict, List, Literal, Optional, Tuple
 import dirtyjson
-from fastapi import APIRouter, BackgroundTasks, Body, Depends, HTTPException, Path
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Body,
+    Depends,
+    HTTPException,
+    Path,
+    Query,
+)
 from fastapi.responses import StreamingResponse
 from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -32,13 +41,15 @@ from models.presentation_with_slides import (
 )
 from models.sql.template import TemplateModel
 
+from services.document_retrieval_service import DOCUMENT_RETRIEVAL_SERVICE
 from services.documents_loader import DocumentsLoader
 from services.webhook_service import WebhookService
 from utils.get_layout_by_name import get_layout_by_name
 from services.image_generation_service import ImageGenerationService
 from utils.dict_utils import deep_update
-from utils.export_utils import export_presentation
+from utils.export_utils import export_presentation, export_presentation_with_cache
 from utils.llm_calls.generate_presentation_outlines import generate_ppt_outline
+from utils.llm_provider import get_llm_concurrency
 from models.sql.slide import SlideModel
 from models.sse_response import SSECompleteResponse, SSEErrorResponse, SSEResponse
 
@@ -46,11 +57,13 @@ from services.database import get_async_session
 from services.temp_file_service import TEMP_FILE_SERVICE
 from services.concurrent_service import CONCURRENT_SERVICE
 from models.sql.presentation import PresentationModel
-from services.pptx_presentation_creator import PptxPresentationCreator
+from services.export_cache_service import EXPORT_CACHE_SERVICE
+from services.export_executor_service import EXPORT_EXECUTOR_SERVICE
 from models.sql.async_presentation_generation_status import (
     AsyncPresentationGenerationTaskModel,
 )
 from utils.asset_directory_utils import get_exports_directory, get_images_directory
+from utils.async_iterator import bounded_as_completed
 from utils.llm_calls.generate_presentation_structure import (
     generate_presentation_structure,
 )
@@ -124,6 +137,7 @@ async def delete_presentation(
 
     await sql_session.delete(presentation)
     await sql_session.commit()
+    EXPORT_CACHE_SERVICE.invalidate(id)
 
 
 @PRESENTATION_ROUTER.post("/create", response_model=PresentationModel)
@@ -282,7 +296,12 @@ async def prepare_presentation(
 
 @PRESENTATION_ROUTER.get("/stream/{id}", response_model=PresentationWithSlides)
 async def stream_presentation(
-    id: uuid.UUID, sql_session: AsyncSession = Depends(get_async_session)
+    id: uuid.UUID,
+    ordered: bool = Query(
+        True,
+        description="Emit slides in index order. If false, slides are emitted as soon as they finish and each chunk carries its index",
+    ),
+    sql_session: AsyncSession = Depends(get_async_session),
 ):
     presentation = await sql_session.get(PresentationModel, id)
     if not presentation:
@@ -321,52 +340,101 @@ async def stream_presentation(
             event="response",
             data=json.dumps({"type": "chunk", "chunk": '{ "slides": [ '}),
         ).to_string()
-        for i, slide_layout_index in enumerate(structure.slides):
-            slide_layout = layout.slides[slide_layout_index]
-            
+        slide_layouts = [layout.slides[index] for index in structure.slides]
+        concurrency = get_llm_concurrency()
+        print(f"[STREAM] Concurrency: {concurrency}, Ordered: {ordered}")
+
+        # Every slide only gets the document chunks relevant to its outline
+        slide_contexts = [None] * len(outline.slides)
+        if presentation.file_paths:
+            slide_contexts = (
+                await DOCUMENT_RETRIEVAL_SERVICE.get_presentation_slide_contexts(
+                    id,
+                    presentation.file_paths,
+                    [slide.content for slide in outline.slides],
+                )
+            )
+
+        async def generate_slide_content(i: int, slide_layout):
             print(f"[STREAM] Slide [{i+1}/{total_slides}] Start - Layout: {slide_layout.id}")
             slide_start_time = datetime.now()
+            slide_content = await get_slide_content_from_type_and_outline(
+                slide_layout,
+                outline.slides[i],
+                presentation.language,
+                presentation.tone,
+                presentation.verbosity,
+                presentation.instructions,
+                slide_contexts[i],
+            )
+            slide_elapsed = (datetime.now() - slide_start_time).total_seconds()
+            print(f"[STREAM] Slide [{i+1}/{total_slides}] End - Elapsed: {slide_elapsed:.2f}s")
+            return slide_content
 
-            try:
-                slide_content = await get_slide_content_from_type_and_outline(
-                    slide_layout,
-                    outline.slides[i],
-                    presentation.language,
-                    presentation.tone,
-                    presentation.verbosity,
-                    presentation.instructions,
-                )
+        # Slides that finished ahead of the next index to emit
+        reorder_buffer: Dict[int, SlideModel] = {}
+        next_index_to_emit = 0
+
+        try:
+            async for i, slide_content in bounded_as_completed(
+                slide_layouts, generate_slide_content, concurrency
+            ):
                 print(f"[DEBUG] Generated Slide Content for slide {i}: {json.dumps(slide_content, ensure_ascii=False)}")
-                slide_elapsed = (datetime.now() - slide_start_time).total_seconds()
-                print(f"[STREAM] Slide [{i+1}/{total_slides}] End - Elapsed: {slide_elapsed:.2f}s")
-            except HTTPException as e:
-                slide_elapsed = (datetime.now() - slide_start_time).total_seconds()
-                print(f"[STREAM] Slide [{i+1}/{total_slides}] ERROR - Elapsed: {slide_elapsed:.2f}s - {e.detail}")
-                yield SSEErrorResponse(detail=e.detail).to_string()
-                return
-
-            slide = SlideModel(
-                presentation=id,
-                layout_group=layout.name,
-                layout=slide_layout.id,
-                index=i,
-                speaker_note=slide_content.get("__speaker_note__", ""),
-                content=slide_content,
-            )
-            slides.append(slide)
+                slide = SlideModel(
+                    presentation=id,
+                    layout_group=layout.name,
+                    layout=slide_layouts[i].id,
+                    index=i,
+                    speaker_note=slide_content.get("__speaker_note__", ""),
+                    content=slide_content,
+                )
+                slides.append(slide)
 
-            # This will mutate slide and add placeholder assets
-            process_slide_add_placeholder_assets(slide)
+                # This will mutate slide and add placeholder assets
+                process_slide_add_placeholder_assets(slide)
 
-            # This will mutate slide
-            async_assets_generation_tasks.append(
-                process_slide_and_fetch_assets(image_generation_service, slide)
-            )
+                # This will mutate slide
+                async_assets_generation_tasks.append(
+                    process_slide_and_fetch_assets(image_generation_service, slide)
+                )
 
-            yield SSEResponse(
-                event="response",
-                data=json.dumps({"type": "chunk", "chunk": slide.model_dump_json()}),
-            ).to_string()
+                if not ordered:
+                    yield SSEResponse(
+                        event="response",
+                        data=json.dumps(
+                            {
+                                "type": "chunk",
+                                "index": i,
+                                "chunk": slide.model_dump_json(),
+                            }
+                        ),
+                    ).to_string()
+                    continue
+
+                reorder_buffer[i] = slide
+                while next_index_to_emit in reorder_buffer:
+                    ready_slide = reorder_buffer.pop(next_index_to_emit)
+                    yield SSEResponse(
+                        event="response",
+                        data=json.dumps(
+                            {"type": "chunk", "chunk": ready_slide.model_dump_json()}
+                        ),
+                    ).to_string()
+                    next_index_to_emit += 1
+        except HTTPException as e:
+            print(f"[STREAM] Slide generation ERROR - {e.detail}")
+            # Assets of the slides generated so far are never saved
+            for assets_generation_task in async_assets_generation_tasks:
+                assets_generation_task.close()
+            yield SSEErrorResponse(detail=e.detail).to_string()
+            return
+        except BaseException:
+            # e.g. the client disconnected
+            for assets_generation_task in async_assets_generation_tasks:
+                assets_generation_task.close()
+            raise
+
+        slides.sort(key=lambda slide: slide.index)
 
         yield SSEResponse(
             event="response",
@@ -435,6 +503,7 @@ async def update_presentation(
         sql_session.add_all(slides)
 
     await sql_session.commit()
+    EXPORT_CACHE_SERVICE.invalidate(presentation.id)
 
     return PresentationWithSlides(
         **presentation.model_dump(),
@@ -445,19 +514,27 @@ async def update_presentation(
 @PRESENTATION_ROUTER.post("/export/pptx", response_model=str)
 async def export_presentation_as_pptx(
     pptx_model: Annotated[PptxPresentationModel, Body()],
+    image_dpi: Annotated[
+        Optional[int],
+        Query(
+            gt=0,
+            description="Resample pictures to this DPI of their rendered size and store opaque ones as JPEG",
+        ),
+    ] = None,
+    incremental: Annotated[
+        bool,
+        Query(description="Restore unchanged slides from the slide cache"),
+    ] = False,
 ):
     temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
 
-    pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
-    await pptx_creator.create_ppt()
-
     export_directory = get_exports_directory()
     pptx_path = os.path.join(
         export_directory, f"{pptx_model.name or uuid.uuid4()}.pptx"
     )
-    pptx_creator.save(pptx_path)
-
-    return pptx_path
+    return await EXPORT_EXECUTOR_SERVICE.export_pptx(
+        pptx_model, temp_dir, pptx_path, image_dpi, incremental
+    )
 
 
 @PRESENTATION_ROUTER.post("/export", response_model=PresentationPathAndEditPath)
@@ -466,6 +543,17 @@ async def export_presentation_as_pptx_or_pdf(
     export_as: Annotated[
         Literal["pptx", "pdf"], Body(description="Format to export the presentation as")
     ] = "pptx",
+    image_dpi: Annotated[
+        Optional[int],
+        Body(
+            gt=0,
+            description="Resample pictures to this DPI of their rendered size and store opaque ones as JPEG (pptx only)",
+        ),
+    ] = None,
+    incremental: Annotated[
+        bool,
+        Body(description="Restore unchanged slides from the slide cache (pptx only)"),
+    ] = False,
     sql_session: AsyncSession = Depends(get_async_session),
 ):
     presentation = await sql_session.get(PresentationModel, id)
@@ -473,10 +561,8 @@ async def export_presentation_as_pptx_or_pdf(
     if not presentation:
         raise HTTPException(status_code=404, detail="Presentation not found")
 
-    presentation_and_path = await export_presentation(
-        id,
-        presentation.title or str(uuid.uuid4()),
-        export_as,
+    presentation_and_path = await export_presentation_with_cache(
+        sql_session, presentation, export_as, image_dpi, incremental
     )
 
     return PresentationPathAndEditPath(
@@ -557,6 +643,13 @@ async def generate_presentation_handler(
                 documents = documents_loader.documents
                 if documents:
                     additional_context = "\n\n".join(documents)
+                    try:
+                        await DOCUMENT_RETRIEVAL_SERVICE.index_documents(
+                            presentation_id, request.files, documents
+                        )
+                    except Exception:
+                        # Slide generation indexes the documents again
+                        traceback.print_exc()
 
             # Finding number of slides to generate by considering table of contents
             n_slides_to_generate = request.n_slides
@@ -714,72 +807,82 @@ async def generate_presentation_handler(
         image_generation_service = ImageGenerationService(get_images_directory())
         async_assets_generation_tasks = []
 
-        # 7. Generate slide content concurrently (batched), then build slides and fetch assets
-        slides: List[SlideModel] = []
-
+        # 7. Generate slide content with a bounded worker pool, fetching assets
+        # for each slide as soon as its content lands
         slide_layout_indices = presentation_structure.slides
         slide_layouts = [layout_model.slides[idx] for idx in slide_layout_indices]
 
-        # Schedule slide content generation and asset fetching in batches of 10
-        batch_size = 10
         total_slides = len(slide_layouts)
-        print(f"[BATCH] Total slides to generate: {total_slides}, Batch size: {batch_size}")
-        
-        for start in range(0, len(slide_layouts), batch_size):
-            end = min(start + batch_size, len(slide_layouts))
-            batch_num = (start // batch_size) + 1
-            total_batches = math.ceil(len(slide_layouts) / batch_size)
-
-            print(f"[BATCH {batch_num}/{total_batches}] Slides [{start+1}-{end}/{total_slides}] Start")
-            batch_start_time = datetime.now()
-
-            # Generate contents for this batch concurrently
-            content_tasks = [
-                get_slide_content_from_type_and_outline(
-                    slide_layouts[i],
-                    presentation_outlines.slides[i],
-                    request.language,
-                    request.tone.value,
-                    request.verbosity.value,
-                    request.instructions,
-                )
-                for i in range(start, end)
-            ]
-            batch_contents: List[dict] = await asyncio.gather(*content_tasks)
-            batch_elapsed = (datetime.now() - batch_start_time).total_seconds()
-            print(f"[BATCH {batch_num}/{total_batches}] Slides [{start+1}-{end}/{total_slides}] End - Elapsed: {batch_elapsed:.2f}s - Avg: {batch_elapsed/(end-start):.2f}s/slide")
-
-            # Build slides for this batch
-            batch_slides: List[SlideModel] = []
-            for offset, slide_content in enumerate(batch_contents):
-                i = start + offset
-                slide_layout = slide_layouts[i]
-                slide = SlideModel(
-                    presentation=presentation_id,
-                    layout_group=layout_model.name,
-                    layout=slide_layout.id,
-                    index=i,
-                    speaker_note=slide_content.get("__speaker_note__"),
-                    content=slide_content,
+        concurrency = get_llm_concurrency()
+        slides: List[SlideModel] = [None] * total_slides
+        print(f"[POOL] Total slides to generate: {total_slides}, Concurrency: {concurrency}")
+        generation_start_time = datetime.now()
+
+        # Every slide only gets the document chunks relevant to its outline
+        slide_contexts = [None] * len(presentation_outlines.slides)
+        if request.files:
+            slide_contexts = (
+                await DOCUMENT_RETRIEVAL_SERVICE.get_presentation_slide_contexts(
+                    presentation_id,
+                    request.files,
+                    [slide.content for slide in presentation_outlines.slides],
                 )
-                slides.append(slide)
-                batch_slides.append(slide)
+            )
 
-            # Start asset fetch tasks for just-generated slides so they run while next batch is processed
-            asset_tasks = [
-                process_slide_and_fetch_assets(image_generation_service, slide)
-                for slide in batch_slides
-            ]
-            async_assets_generation_tasks.extend(asset_tasks)
+        async def generate_slide_content(i: int, slide_layout):
+            return await get_slide_content_from_type_and_outline(
+                slide_layout,
+                presentation_outlines.slides[i],
+                request.language,
+                request.tone.value,
+                request.verbosity.value,
+                request.instructions,
+                slide_contexts[i],
+            )
 
-        if async_status:
-            async_status.message = "Fetching assets for slides"
-            async_status.updated_at = datetime.now()
-            sql_session.add(async_status)
-            await sql_session.commit()
+        try:
+            async with aclosing(
+                bounded_as_completed(slide_layouts, generate_slide_content, concurrency)
+            ) as slide_contents:
+                async for i, slide_content in slide_contents:
+                    slide = SlideModel(
+                        presentation=presentation_id,
+                        layout_group=layout_model.name,
+                        layout=slide_layouts[i].id,
+                        index=i,
+                        speaker_note=slide_content.get("__speaker_note__"),
+                        content=slide_content,
+                    )
+                    slides[i] = slide
+                    async_assets_generation_tasks.append(
+                        asyncio.create_task(
+                            process_slide_and_fetch_assets(
+                                image_generation_service, slide
+                            )
+                        )
+                    )
+
+            generation_elapsed = (
+                datetime.now() - generation_start_time
+            ).total_seconds()
+            print(
+                f"[POOL] Generated {total_slides} slides - Elapsed: {generation_elapsed:.2f}s"
+            )
 
-        # Run all asset tasks concurrently while batches may still be generating content
-        generated_assets_list = await asyncio.gather(*async_assets_generation_tasks)
+            if async_status:
+                async_status.message = "Fetching assets for slides"
+                async_status.updated_at = datetime.now()
+                sql_session.add(async_status)
+                await sql_session.commit()
+
+            generated_assets_list = await asyncio.gather(
+                *async_assets_generation_tasks
+            )
+        finally:
+            # A failed slide leaves no image generation or download running
+            for task in async_assets_generation_tasks:
+                task.cancel()
+            await asyncio.gather(*async_assets_generation_tasks, return_exceptions=True)
         generated_assets = []
         for assets_list in generated_assets_list:
             generated_assets.extend(assets_list)
@@ -960,8 +1063,8 @@ async def edit_presentation_with_new_content(
     sql_session.add_all(new_slides)
     await sql_session.commit()
 
-    presentation_and_path = await export_presentation(
-        presentation.id, presentation.title or str(uuid.uuid4()), data.export_as
+    presentation_and_path = await export_presentation_with_cache(
+        sql_session, presentation, data.export_as
     )
 
     return PresentationPathAndEditPath(
@@ -18,3 +18,7 @@ WEBP_MIME_TYPES = ["image/webp"]
 UPLOAD_ACCEPTED_FILE_TYPES = (
     PDF_MIME_TYPES + TEXT_MIME_TYPES + POWERPOINT_TYPES + WORD_TYPES
 )
+
+
+# Options of the docling pipeline, part of the parsed document cache key
+DOCLING_PIPELINE_OPTIONS = {"do_ocr": False}
@@ -4,3 +4,12 @@ OPENAI_URL = "https://api.openai.com/v1"
 DEFAULT_OPENAI_MODEL = "gpt-4.1"
 DEFAULT_GOOGLE_MODEL = "models/gemini-2.5-flash"
 DEFAULT_ANTHROPIC_MODEL = "claude-sonnet-4-20250514"
+
+# Slide content requests kept in flight at once, per provider
+DEFAULT_LLM_CONCURRENCY = {
+    "openai": 16,
+    "google": 16,
+    "anthropic": 8,
+    "ollama": 1,
+    "custom": 4,
+}
@@ -0,0 +1,91 @@
+"""
+Compares the Chroma and NumPy icon index backends.
+
+Reports startup time, resident memory growth and per-query latency for
+single queries and for one batched query. Run from servers/fastapi:
+
+    python scripts/benchmark_icon_index.py --queries 200 --batch-size 80
+"""
+
+import argparse
+import gc
+import os
+import resource
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+current_file = Path(__file__).resolve()
+server_dir = current_file.parent.parent
+sys.path.append(str(server_dir))
+
+from services.icon_index import ChromaIconIndex, NumpyIconIndex
+
+SAMPLE_QUERIES = [
+    "growth",
+    "team",
+    "security",
+    "money",
+    "chart",
+    "rocket launch",
+    "global network",
+    "education",
+    "health care",
+    "calendar schedule",
+]
+
+
+def get_max_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def benchmark_backend(name, index_class, n_queries: int, batch_size: int):
+    gc.collect()
+    rss_before = get_max_rss_mb()
+    start = time.perf_counter()
+    index = index_class()
+    startup_seconds = time.perf_counter() - start
+    rss_after = get_max_rss_mb()
+
+    queries = [SAMPLE_QUERIES[i % len(SAMPLE_QUERIES)] for i in range(n_queries)]
+
+    # Warm up the ONNX session so model loading is not counted per query
+    index.query(queries[:1], 1)
+
+    single_latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.query([query], 1)
+        single_latencies.append((time.perf_counter() - start) * 1000)
+
+    batch = queries[:batch_size]
+    start = time.perf_counter()
+    index.query(batch, 1)
+    batch_ms = (time.perf_counter() - start) * 1000
+
+    print(f"\n[{name}]")
+    print(f"  startup:            {startup_seconds:.2f}s")
+    print(f"  max rss growth:     {rss_after - rss_before:.1f} MB")
+    print(f"  single query p50:   {statistics.median(single_latencies):.2f} ms")
+    print(
+        f"  single query p95:   {statistics.quantiles(single_latencies, n=20)[18]:.2f} ms"
+    )
+    print(f"  batch of {len(batch):<4}      {batch_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark icon index backends")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=80)
+    parser.add_argument(
+        "--backends", nargs="+", default=["numpy", "chroma"], choices=["numpy", "chroma"]
+    )
+    args = parser.parse_args()
+
+    os.chdir(server_dir)
+    backends = {"numpy": NumpyIconIndex, "chroma": ChromaIconIndex}
+    for backend in args.backends:
+        benchmark_backend(backend, backends[backend], args.queries, args.batch_size)
@@ -0,0 +1,169 @@
+"""
+Compares the previous pure-PIL/per-pixel image transforms with the
+vectorized implementations in utils/image_utils.py.
+
+Run from servers/fastapi:
+
+    python scripts/benchmark_image_utils.py --sizes 400x300 2000x1500 --repeat 5
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+# Add parent directory to path to import app modules
+current_file = Path(__file__).resolve()
+server_dir = current_file.parent.parent
+sys.path.append(str(server_dir))
+
+from utils import image_utils
+
+
+def legacy_round_image_corners(image: Image.Image, radii: List[int]) -> Image.Image:
+    w, h = image.size
+    max_radius = min(w // 2, h // 2)
+    clamped_radii = [min(radius, max_radius) for radius in radii]
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+
+    rounded_mask = Image.new("L", image.size, 0)
+    rectangular_mask = Image.new("L", image.size, 255)
+    for i, radius in enumerate(clamped_radii):
+        if radius > 0:
+            circle = Image.new("L", (radius * 2, radius * 2), 0)
+            draw = ImageDraw.Draw(circle)
+            draw.ellipse((0, 0, radius * 2 - 1, radius * 2 - 1), fill=255)
+            if i == 0:
+                rounded_mask.paste(circle.crop((0, 0, radius, radius)), (0, 0))
+                rectangular_mask.paste(0, (0, 0, radius, radius))
+            elif i == 1:
+                rounded_mask.paste(
+                    circle.crop((radius, 0, radius * 2, radius)), (w - radius, 0)
+                )
+                rectangular_mask.paste(0, (w - radius, 0, w, radius))
+            elif i == 2:
+                rounded_mask.paste(
+                    circle.crop((radius, radius, radius * 2, radius * 2)),
+                    (w - radius, h - radius),
+                )
+                rectangular_mask.paste(0, (w - radius, h - radius, w, h))
+            else:
+                rounded_mask.paste(
+                    circle.crop((0, radius, radius, radius * 2)), (0, h - radius)
+                )
+                rectangular_mask.paste(0, (0, h - radius, radius, h))
+
+    original_alpha = image.getchannel("A")
+    corner_mask = Image.composite(rounded_mask, rectangular_mask, rounded_mask)
+    final_alpha = Image.composite(
+        original_alpha, Image.new("L", image.size, 0), corner_mask
+    )
+    result = Image.new("RGBA", image.size)
+    result.paste(image.convert("RGB"), (0, 0))
+    result.putalpha(final_alpha)
+    return result
+
+
+def legacy_invert_image(img: Image.Image) -> Image.Image:
+    new_data = []
+    for r, g, b, a in img.getdata():
+        if a != 0:
+            new_data.append((255 - r, 255 - g, 255 - b, a))
+        else:
+            new_data.append((0, 0, 0, 0))
+    new_img = Image.new("RGBA", img.size)
+    new_img.putdata(new_data)
+    return new_img
+
+
+def legacy_create_circle_image(image: Image.Image) -> Image.Image:
+    img = image.convert("RGBA")
+    size = img.size
+    mask = Image.new("RGBA", size, color=(0, 0, 0, 0))
+    draw = ImageDraw.Draw(mask)
+    center_x = size[0] // 2
+    center_y = size[1] // 2
+    radius = min(size) // 2
+    draw.ellipse(
+        (
+            center_x - radius,
+            center_y - radius,
+            center_x + radius,
+            center_y + radius,
+        ),
+        fill=(255, 255, 255, 255),
+    )
+    return Image.composite(img, mask, mask)
+
+
+def legacy_set_image_opacity(image: Image.Image, opacity: float) -> Image.Image:
+    opacity = max(0.0, min(1.0, opacity))
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+    new_alpha = image.getchannel("A").point(lambda x: int(x * opacity))
+    result = Image.new("RGBA", image.size)
+    result.paste(image.convert("RGB"), (0, 0))
+    result.putalpha(new_alpha)
+    return result
+
+
+TRANSFORMS = {
+    "round_image_corners": (
+        lambda image: legacy_round_image_corners(image, [40, 0, 80, 120]),
+        lambda image: image_utils.round_image_corners(image, [40, 0, 80, 120]),
+    ),
+    "invert_image": (legacy_invert_image, image_utils.invert_image),
+    "create_circle_image": (
+        legacy_create_circle_image,
+        image_utils.create_circle_image,
+    ),
+    "set_image_opacity": (
+        lambda image: legacy_set_image_opacity(image, 0.4),
+        lambda image: image_utils.set_image_opacity(image, 0.4),
+    ),
+}
+
+
+def create_random_image(width: int, height: int) -> Image.Image:
+    rng = np.random.default_rng(0)
+    data = rng.integers(0, 256, size=(height, width, 4), dtype=np.uint8)
+    # Make some pixels fully transparent so invert_image takes both branches
+    data[::7, ::5, 3] = 0
+    return Image.fromarray(data, "RGBA")
+
+
+def time_transform(transform, image: Image.Image, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        transform(image)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark image_utils transforms")
+    parser.add_argument(
+        "--sizes", nargs="+", default=["400x300", "1280x720", "2000x1500"]
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'transform':<22}{'size':>12}{'legacy ms':>12}{'new ms':>10}{'speedup':>10}")
+    for size in args.sizes:
+        width, height = (int(value) for value in size.split("x"))
+        image = create_random_image(width, height)
+        for name, (legacy, new) in TRANSFORMS.items():
+            if legacy(image).tobytes() != new(image).tobytes():
+                raise AssertionError(f"{name} output differs at {size}")
+            legacy_ms = time_transform(legacy, image, args.repeat)
+            new_ms = time_transform(new, image, args.repeat)
+            print(
+                f"{name:<22}{size:>12}{legacy_ms:>12.2f}{new_ms:>10.2f}{legacy_ms / new_ms:>9.1f}x"
+            )
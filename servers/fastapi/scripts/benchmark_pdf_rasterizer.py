@@ -0,0 +1,104 @@
+"""
+Compares serial pdfplumber page rendering, as DocumentsLoader did before,
+with the page-range sharded PdfRasterizerService.
+
+Run from servers/fastapi:
+
+    python scripts/benchmark_pdf_rasterizer.py --pages 10 40 120 --workers 4
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import pdfplumber
+from PIL import Image, ImageDraw
+
+# Add parent directory to path to import app modules
+current_file = Path(__file__).resolve()
+server_dir = current_file.parent.parent
+sys.path.append(str(server_dir))
+
+from services.pdf_rasterizer_service import PdfRasterizerService
+
+
+def create_pdf(path: str, n_pages: int):
+    pages = []
+    for index in range(n_pages):
+        page = Image.new("RGB", (960, 540), (255, 255, 255))
+        draw = ImageDraw.Draw(page)
+        for row in range(12):
+            draw.rectangle(
+                (40, 40 + row * 40, 200 + (index * 37 + row * 53) % 700, 64 + row * 40),
+                fill=((index * 20) % 256, (row * 20) % 256, 160),
+            )
+        pages.append(page)
+    pages[0].save(path, "PDF", save_all=True, append_images=pages[1:])
+
+
+def legacy_get_page_images_from_pdf(file_path: str, temp_dir: str) -> List[str]:
+    with pdfplumber.open(file_path) as pdf:
+        images = []
+        for page in pdf.pages:
+            img = page.to_image(resolution=150)
+            image_path = os.path.join(temp_dir, f"page_{page.page_number}.png")
+            img.save(image_path)
+            images.append(image_path)
+        return images
+
+
+async def time_service(
+    service: PdfRasterizerService, pdf_path: str, image_format: str
+) -> tuple:
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        first_page_ms = None
+        async for _ in service.iterate_page_images(
+            pdf_path, output_dir, image_format=image_format
+        ):
+            if first_page_ms is None:
+                first_page_ms = (time.perf_counter() - start) * 1000
+        return (time.perf_counter() - start) * 1000, first_page_ms
+
+
+async def main(args):
+    os.environ["PDF_RASTER_WORKERS"] = str(args.workers)
+    service = PdfRasterizerService()
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Start the worker processes outside of the measurements
+            warmup_path = os.path.join(temp_dir, "warmup.pdf")
+            create_pdf(warmup_path, args.workers * 8)
+            await time_service(service, warmup_path, "png")
+
+            print(
+                f"{'pages':>6}{'serial ms':>12}{'png ms':>10}{'first page ms':>15}{'jpeg ms':>10}{'speedup':>10}"
+            )
+            for n_pages in args.pages:
+                pdf_path = os.path.join(temp_dir, f"deck_{n_pages}.pdf")
+                create_pdf(pdf_path, n_pages)
+
+                with tempfile.TemporaryDirectory() as output_dir:
+                    start = time.perf_counter()
+                    legacy_get_page_images_from_pdf(pdf_path, output_dir)
+                    serial_ms = (time.perf_counter() - start) * 1000
+
+                png_ms, first_page_ms = await time_service(service, pdf_path, "png")
+                jpeg_ms, _ = await time_service(service, pdf_path, "jpeg")
+                print(
+                    f"{n_pages:>6}{serial_ms:>12.0f}{png_ms:>10.0f}{first_page_ms:>15.0f}{jpeg_ms:>10.0f}{serial_ms / png_ms:>9.1f}x"
+                )
+    finally:
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark PDF page rendering")
+    parser.add_argument("--pages", nargs="+", type=int, default=[10, 40, 120])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,162 @@
+"""
+Compares the previous PPTX font analysis, which extracted the archive and
+ran several findall traversals plus a regex per slide, with the single
+pass iterparse analysis in api/v1/ppt/endpoints/pptx_slides.py.
+
+Run from servers/fastapi:
+
+    python scripts/benchmark_pptx_fonts.py --slides 20 100 400 --repeat 3
+"""
+
+import argparse
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+from pathlib import Path
+from typing import List, Set
+
+from pptx import Presentation
+from pptx.util import Inches, Pt
+
+# Add parent directory to path to import app modules
+current_file = Path(__file__).resolve()
+server_dir = current_file.parent.parent
+sys.path.append(str(server_dir))
+
+from api.v1.ppt.endpoints.pptx_slides import _get_slide_fonts
+
+FONTS = ["Montserrat Bold", "Open Sans", "Roboto Light", "Lato", "Playfair Display"]
+
+
+def legacy_extract_fonts_from_oxml(xml_content: str) -> List[str]:
+    fonts = set()
+
+    try:
+        # Parse the XML content
+        root = ET.fromstring(xml_content)
+
+        # Define namespaces commonly used in OXML
+        namespaces = {
+            "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+            "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+            "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+        }
+
+        # Search for font references in various OXML elements
+        # Look for latin fonts
+        for font_elem in root.findall(".//a:latin", namespaces):
+            if "typeface" in font_elem.attrib:
+                fonts.add(font_elem.attrib["typeface"])
+
+        # Look for east asian fonts
+        for font_elem in root.findall(".//a:ea", namespaces):
+            if "typeface" in font_elem.attrib:
+                fonts.add(font_elem.attrib["typeface"])
+
+        # Look for complex script fonts
+        for font_elem in root.findall(".//a:cs", namespaces):
+            if "typeface" in font_elem.attrib:
+                fonts.add(font_elem.attrib["typeface"])
+
+        # Look for font references in theme elements
+        for font_elem in root.findall(".//a:font", namespaces):
+            if "typeface" in font_elem.attrib:
+                fonts.add(font_elem.attrib["typeface"])
+
+        # Look for rPr (run properties) font references
+        for rpr_elem in root.findall(".//a:rPr", namespaces):
+            for font_elem in rpr_elem.findall(".//a:latin", namespaces):
+                if "typeface" in font_elem.attrib:
+                    fonts.add(font_elem.attrib["typeface"])
+
+        # Also search without namespace prefix for compatibility
+        for font_elem in root.findall(".//latin"):
+            if "typeface" in font_elem.attrib:
+                fonts.add(font_elem.attrib["typeface"])
+
+        # Regex fallback for fonts that might be missed
+        font_pattern = r'typeface="([^"]+)"'
+        regex_fonts = re.findall(font_pattern, xml_content)
+        fonts.update(regex_fonts)
+
+        # Filter out system fonts and empty values
+        system_fonts = {"+mn-lt", "+mj-lt", "+mn-ea", "+mj-ea", "+mn-cs", "+mj-cs", ""}
+        fonts = {font for font in fonts if font not in system_fonts and font.strip()}
+
+        return list(fonts)
+
+    except Exception as e:
+        print(f"Error extracting fonts from OXML: {e}")
+        return []
+
+
+def legacy_get_slide_fonts(pptx_path: str, temp_dir: str) -> List[Set[str]]:
+    extract_dir = os.path.join(temp_dir, "pptx_extract")
+    with zipfile.ZipFile(pptx_path, "r") as zip_ref:
+        zip_ref.extractall(extract_dir)
+    slides_dir = os.path.join(extract_dir, "ppt", "slides")
+    slide_files = [
+        f
+        for f in os.listdir(slides_dir)
+        if f.startswith("slide") and f.endswith(".xml")
+    ]
+    slide_files.sort(key=lambda x: int(x.replace("slide", "").replace(".xml", "")))
+    slide_fonts = []
+    for slide_file in slide_files:
+        with open(os.path.join(slides_dir, slide_file), "r", encoding="utf-8") as f:
+            slide_fonts.append(set(legacy_extract_fonts_from_oxml(f.read())))
+    return slide_fonts
+
+
+def create_pptx(path: str, n_slides: int, runs_per_slide: int = 40):
+    presentation = Presentation()
+    for index in range(n_slides):
+        slide = presentation.slides.add_slide(presentation.slide_layouts[6])
+        text_frame = slide.shapes.add_textbox(
+            Inches(0.5), Inches(0.5), Inches(8), Inches(6)
+        ).text_frame
+        for run_index in range(runs_per_slide):
+            run = text_frame.add_paragraph().add_run()
+            run.text = f"Slide {index} run {run_index}"
+            run.font.name = FONTS[(index + run_index) % len(FONTS)]
+            run.font.size = Pt(12)
+    presentation.save(path)
+
+
+def time_function(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark PPTX font analysis")
+    parser.add_argument("--slides", nargs="+", type=int, default=[20, 100, 400])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'slides':>7}{'legacy ms':>12}{'new ms':>10}{'speedup':>10}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for n_slides in args.slides:
+            pptx_path = os.path.join(temp_dir, f"deck_{n_slides}.pptx")
+            create_pptx(pptx_path, n_slides)
+
+            def run_legacy():
+                with tempfile.TemporaryDirectory() as extract_dir:
+                    return legacy_get_slide_fonts(pptx_path, extract_dir)
+
+            if run_legacy() != _get_slide_fonts(pptx_path)[1]:
+                raise AssertionError(f"Fonts differ for {n_slides} slides")
+            legacy_ms = time_function(run_legacy, args.repeat)
+            new_ms = time_function(lambda: _get_slide_fonts(pptx_path), args.repeat)
+            print(
+                f"{n_slides:>7}{legacy_ms:>12.1f}{new_ms:>10.1f}{legacy_ms / new_ms:>9.1f}x"
+            )
@@ -0,0 +1,143 @@
+"""
+Compares the previous ScoreBasedChunker, which split the text into lines
+twice and matched every heading line against every heading, with the
+single pass chunker in services/score_based_chunker.py.
+
+Run from servers/fastapi:
+
+    python scripts/benchmark_score_based_chunker.py --headings 1000 5000 10000 --repeat 3
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# Add parent directory to path to import app modules
+current_file = Path(__file__).resolve()
+server_dir = current_file.parent.parent
+sys.path.append(str(server_dir))
+
+from models.document_chunk import DocumentChunk
+from services.score_based_chunker import ScoreBasedChunker
+
+
+def legacy_extract_headings(text: str) -> List[str]:
+    lines = text.split("\n")
+    headings = []
+
+    for line in lines:
+        line = line.strip()
+        if line.startswith("#"):
+            headings.append(line)
+
+    return headings
+
+
+def legacy_get_chunks_from_headings(
+    text: str,
+    headings: List[str],
+    heading_scores: List[float],
+    top_k: int = 10,
+) -> List[DocumentChunk]:
+    selected_indices = ScoreBasedChunker().select_top_k(heading_scores, top_k)
+
+    chunks = []
+    lines = text.split("\n")
+    heading_positions = {}
+
+    for i, line in enumerate(lines):
+        line_stripped = line.strip()
+        if line_stripped.startswith("#"):
+            for heading_idx, heading in enumerate(headings):
+                if heading == line_stripped and heading_idx not in heading_positions:
+                    heading_positions[heading_idx] = i
+                    break
+
+    for i, heading_idx in enumerate(selected_indices):
+        if heading_idx not in heading_positions:
+            continue
+
+        heading = headings[heading_idx]
+        heading_line_idx = heading_positions[heading_idx]
+
+        if i + 1 < len(selected_indices):
+            next_heading_idx = selected_indices[i + 1]
+            if next_heading_idx in heading_positions:
+                content_end = heading_positions[next_heading_idx]
+            else:
+                content_end = len(lines)
+        else:
+            content_end = len(lines)
+
+        content = "\n".join(lines[heading_line_idx + 1 : content_end]).strip()
+        chunks.append(
+            DocumentChunk(
+                heading=heading,
+                content=content,
+                heading_index=heading_idx,
+                score=heading_scores[heading_idx],
+            )
+        )
+
+    return chunks
+
+
+def legacy_get_n_chunks(text: str, n: int) -> List[DocumentChunk]:
+    headings = legacy_extract_headings(text)
+    heading_scores = ScoreBasedChunker().score_headings(headings)
+    return legacy_get_chunks_from_headings(text, headings, heading_scores, n)
+
+
+def create_markdown(n_headings: int) -> str:
+    sections = []
+    for index in range(n_headings):
+        level = 1 + index % 4
+        # Repeated titles, as in documents with one "Summary" per chapter
+        title = f"Section {index}" if index % 5 else "Summary"
+        sections.append(
+            f"{'#' * level} {title}\n\n"
+            f"Paragraph {index} describes the results of section {index}.\n"
+            "It spans a couple of lines of body text.\n"
+        )
+    return "Document introduction.\n\n" + "\n".join(sections)
+
+
+def time_function(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark ScoreBasedChunker")
+    parser.add_argument("--headings", nargs="+", type=int, default=[1000, 5000, 10000])
+    parser.add_argument("--top-k", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    chunker = ScoreBasedChunker()
+    print(f"{'headings':>9}{'legacy ms':>12}{'new ms':>10}{'speedup':>10}{'budget ms':>11}")
+    for n_headings in args.headings:
+        text = create_markdown(n_headings)
+
+        if legacy_get_n_chunks(text, args.top_k) != chunker._get_n_chunks(text, args.top_k):
+            raise AssertionError(f"Chunks differ for {n_headings} headings")
+        legacy_ms = time_function(
+            lambda: legacy_get_n_chunks(text, args.top_k), args.repeat
+        )
+        new_ms = time_function(
+            lambda: chunker._get_n_chunks(text, args.top_k), args.repeat
+        )
+        budget_ms = time_function(
+            lambda: chunker.get_chunks_within_token_budget(text, 4000), args.repeat
+        )
+        print(
+            f"{n_headings:>9}{legacy_ms:>12.1f}{new_ms:>10.1f}"
+            f"{legacy_ms / new_ms:>9.1f}x{budget_ms:>11.1f}"
+        )
@@ -0,0 +1,213 @@
+import json
+import os
+import shutil
+import time
+from typing import Optional
+
+# Entries are also written by other processes, so the directory is scanned
+# at least this often even while the size estimate stays under the limit
+EVICTION_SCAN_INTERVAL_SECONDS = 60
+# Eviction frees space down to this share of the limit, so a full cache is
+# not rescanned on every set
+EVICTION_LOW_WATER_MARK = 0.9
+
+
+class DiskCacheService:
+    """
+    Content-addressed cache stored as files in a directory.
+
+    Every entry has a `<key>.json` metadata sidecar and optionally a
+    `<key><extension>` blob. Reads touch the sidecar, so its mtime tracks
+    recency and the least recently used entries are evicted first once the
+    directory grows past `max_size_bytes`, until it is back under
+    EVICTION_LOW_WATER_MARK of the limit. The directory size is estimated
+    from the entries this instance writes and rescanned when the estimate
+    passes `max_size_bytes` or every EVICTION_SCAN_INTERVAL_SECONDS.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_size_bytes: int,
+        ttl_seconds: Optional[int] = None,
+    ):
+        self.directory = directory
+        self.max_size_bytes = max_size_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._estimated_size: Optional[int] = None
+        self._last_scan_at = 0.0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _get_metadata_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _get_blob_path(self, key: str, extension: str) -> str:
+        return os.path.join(self.directory, f"{key}{extension}")
+
+    def _remove_entry(self, key: str, metadata: Optional[dict]):
+        # Other threads and processes evict from the same directory
+        if metadata and metadata.get("extension") is not None:
+            remove_file(self._get_blob_path(key, metadata["extension"]))
+        remove_file(self._get_metadata_path(key))
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Returns the entry metadata, with `path` set to the blob path if the
+        entry has one, or None if the entry is missing or expired.
+        """
+        metadata_path = self._get_metadata_path(key)
+        try:
+            with open(metadata_path, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        expires_at = metadata.get("expires_at")
+        if expires_at is not None and expires_at < time.time():
+            self._remove_entry(key, metadata)
+            self.misses += 1
+            return None
+
+        if metadata.get("extension") is not None:
+            blob_path = self._get_blob_path(key, metadata["extension"])
+            if not os.path.exists(blob_path):
+                self._remove_entry(key, metadata)
+                self.misses += 1
+                return None
+            metadata["path"] = blob_path
+
+        try:
+            os.utime(metadata_path)
+        except FileNotFoundError:
+            # Evicted by another thread or process since it was read
+            self.misses += 1
+            return None
+        self.hits += 1
+        return metadata
+
+    def set(
+        self,
+        key: str,
+        value: Optional[dict] = None,
+        source_path: Optional[str] = None,
+        ttl_seconds: Optional[int] = None,
+    ) -> Optional[str]:
+        """
+        Stores value as the entry metadata. If source_path is given, the file
+        is hard-linked (or copied) into the cache as the entry blob and the
+        blob path is returned.
+        """
+        metadata = dict(value or {})
+        ttl_seconds = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        metadata["expires_at"] = time.time() + ttl_seconds if ttl_seconds else None
+        metadata["extension"] = None
+
+        blob_path = None
+        size = 0
+        if source_path:
+            extension = os.path.splitext(source_path)[1]
+            blob_path = self._get_blob_path(key, extension)
+            link_or_copy_file(source_path, blob_path)
+            metadata["extension"] = extension
+            size += os.path.getsize(blob_path)
+
+        metadata_path = self._get_metadata_path(key)
+        with open(metadata_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+        size += os.path.getsize(metadata_path)
+
+        if self._estimated_size is not None:
+            self._estimated_size += size
+        if (
+            self._estimated_size is None
+            or self._estimated_size > self.max_size_bytes
+            or time.monotonic() - self._last_scan_at > EVICTION_SCAN_INTERVAL_SECONDS
+        ):
+            self.evict()
+        return blob_path
+
+    def update(self, key: str, value: dict):
+        """
+        Merges value into the metadata of an existing entry, keeping its
+        blob and expiry.
+        """
+        metadata_path = self._get_metadata_path(key)
+        try:
+            with open(metadata_path, "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            return
+        metadata.update(value)
+        with open(metadata_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+
+    def delete(self, key: str):
+        metadata = None
+        try:
+            with open(self._get_metadata_path(key), "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            pass
+        self._remove_entry(key, metadata)
+
+    def evict(self):
+        entries = []
+        total_size = 0
+        for file_name in os.listdir(self.directory):
+            if not file_name.endswith(".json"):
+                continue
+            key = file_name[: -len(".json")]
+            metadata_path = os.path.join(self.directory, file_name)
+            try:
+                with open(metadata_path, "r", encoding="utf-8") as f:
+                    metadata = json.load(f)
+                size = os.path.getsize(metadata_path)
+                if metadata.get("extension") is not None:
+                    blob_path = self._get_blob_path(key, metadata["extension"])
+                    if os.path.exists(blob_path):
+                        size += os.path.getsize(blob_path)
+                entries.append((os.path.getmtime(metadata_path), key, metadata, size))
+                total_size += size
+            except (OSError, ValueError):
+                continue
+
+        if total_size > self.max_size_bytes:
+            target_size = self.max_size_bytes * EVICTION_LOW_WATER_MARK
+            entries.sort(key=lambda entry: entry[0])
+            for _, key, metadata, size in entries:
+                if total_size <= target_size:
+                    break
+                self._remove_entry(key, metadata)
+                total_size -= size
+                self.evictions += 1
+
+        self._estimated_size = total_size
+        self._last_scan_at = time.monotonic()
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
+
+
+def remove_file(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def link_or_copy_file(source_path: str, destination_path: str):
+    remove_file(destination_path)
+    try:
+        os.link(source_path, destination_path)
+    except OSError:
+        shutil.copyfile(source_path, destination_path)
@@ -0,0 +1,122 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import traceback
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+
+from utils.get_env import get_docling_workers_env
+
+DEFAULT_DOCLING_WORKERS = 1
+
+
+def init_docling_worker():
+    # docling is only imported in the workers, the API process never loads
+    # its models
+    try:
+        from services.docling_service import get_docling_service
+
+        get_docling_service()
+    except Exception:
+        # An initializer error would break the whole pool. The worker stays
+        # up and parse_to_markdown raises the error for every document.
+        print("Failed to load docling in a document parsing worker")
+        traceback.print_exc()
+
+
+def parse_to_markdown(
+    file_path: str, page_range: Optional[Tuple[int, int]] = None
+) -> str:
+    """
+    Runs in a docling worker.
+    """
+    from services.docling_service import get_docling_service
+
+    return get_docling_service().parse_to_markdown(file_path, page_range)
+
+
+class DoclingExecutorService:
+    """
+    Parses documents with docling in a process pool of DOCLING_WORKERS
+    workers. Each worker builds one DocumentConverter when it starts and
+    keeps its models loaded for every document it parses, and parsing
+    never blocks the event loop. If a worker dies, e.g. on a document that
+    crashes docling, the pool is replaced and the document is retried once.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._restarts = 0
+
+    @property
+    def workers(self) -> int:
+        return int(get_docling_workers_env() or DEFAULT_DOCLING_WORKERS)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_docling_worker,
+            )
+        return self._executor
+
+    def _reset_executor(self, executor: ProcessPoolExecutor):
+        # A broken pool fails every job, the next one creates a new pool
+        if self._executor is executor:
+            self._executor = None
+            self._restarts += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run_in_executor(
+        self, file_path: str, page_range: Optional[Tuple[int, int]]
+    ) -> str:
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                return await asyncio.get_running_loop().run_in_executor(
+                    executor, parse_to_markdown, file_path, page_range
+                )
+            except BrokenProcessPool:
+                self._reset_executor(executor)
+                if attempt:
+                    raise HTTPException(
+                        status_code=500,
+                        detail="Document parsing worker crashed while parsing the document",
+                    )
+
+    async def parse_to_markdown(
+        self, file_path: str, page_range: Optional[Tuple[int, int]] = None
+    ) -> str:
+        self._in_flight += 1
+        try:
+            document = await self._run_in_executor(file_path, page_range)
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+        self._completed += 1
+        return document
+
+    def get_stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "in_flight": self._in_flight,
+            "completed": self._completed,
+            "failed": self._failed,
+            "restarts": self._restarts,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+DOCLING_EXECUTOR_SERVICE = DoclingExecutorService()
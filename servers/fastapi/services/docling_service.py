@@ -1,3 +1,5 @@
+from typing import Optional, Tuple
+
 from docling.document_converter import (
     DocumentConverter,
     PdfFormatOption,
@@ -7,11 +9,12 @@ from docling.document_converter import (
 from docling.datamodel.pipeline_options import PdfPipelineOptions
 from docling.datamodel.base_models import InputFormat
 
+from constants.documents import DOCLING_PIPELINE_OPTIONS
+
 
 class DoclingService:
     def __init__(self):
-        self.pipeline_options = PdfPipelineOptions()
-        self.pipeline_options.do_ocr = False
+        self.pipeline_options = PdfPipelineOptions(**DOCLING_PIPELINE_OPTIONS)
 
         self.converter = DocumentConverter(
             allowed_formats=[InputFormat.PPTX, InputFormat.PDF, InputFormat.DOCX],
@@ -28,6 +31,26 @@ class DoclingService:
             },
         )
 
-    def parse_to_markdown(self, file_path: str) -> str:
-        result = self.converter.convert(file_path)
+    def parse_to_markdown(
+        self, file_path: str, page_range: Optional[Tuple[int, int]] = None
+    ) -> str:
+        """page_range is 1-based and inclusive, None parses every page"""
+        if page_range:
+            result = self.converter.convert(file_path, page_range=page_range)
+        else:
+            result = self.converter.convert(file_path)
         return result.document.export_to_markdown()
+
+
+_DOCLING_SERVICE: Optional[DoclingService] = None
+
+
+def get_docling_service() -> DoclingService:
+    """
+    One converter per process, so layout models are loaded once and reused
+    for every document.
+    """
+    global _DOCLING_SERVICE
+    if _DOCLING_SERVICE is None:
+        _DOCLING_SERVICE = DoclingService()
+    return _DOCLING_SERVICE
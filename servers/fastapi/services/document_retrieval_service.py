@@ -0,0 +1,378 @@
+import asyncio
+from collections import OrderedDict
+import hashlib
+import json
+import traceback
+from typing import Callable, List, Optional, Tuple
+import uuid
+
+import numpy as np
+
+from models.document_chunk import DocumentChunk
+from services.disk_cache_service import DiskCacheService
+from services.documents_loader import DocumentsLoader, get_file_hash
+from services.score_based_chunker import ScoreBasedChunker
+from services.temp_file_service import TEMP_FILE_SERVICE
+from utils.asset_directory_utils import get_cache_directory
+from utils.get_env import (
+    get_app_data_directory_env,
+    get_document_context_top_k_env,
+    get_document_index_cache_max_size_mb_env,
+)
+
+DEFAULT_DOCUMENT_CONTEXT_TOP_K = 4
+DOCUMENT_CHUNK_MAX_CHARACTERS = 1200
+DOCUMENT_INDEX_CACHE_MAX_SIZE = 32
+DEFAULT_DOCUMENT_INDEX_CACHE_MAX_SIZE_MB = 256
+# Model of get_document_embedding_function, part of the index cache key
+DOCUMENT_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+_EMBEDDING_FUNCTION: Optional[Callable[[List[str]], List]] = None
+_DOCUMENT_INDEX_CACHE: Optional[DiskCacheService] = None
+
+
+def get_document_index_cache() -> Optional[DiskCacheService]:
+    global _DOCUMENT_INDEX_CACHE
+    if not get_app_data_directory_env():
+        return None
+    if _DOCUMENT_INDEX_CACHE is None:
+        _DOCUMENT_INDEX_CACHE = DiskCacheService(
+            get_cache_directory("document_indexes"),
+            max_size_bytes=int(
+                get_document_index_cache_max_size_mb_env()
+                or DEFAULT_DOCUMENT_INDEX_CACHE_MAX_SIZE_MB
+            )
+            * 1024
+            * 1024,
+        )
+    return _DOCUMENT_INDEX_CACHE
+
+
+def get_document_embedding_function() -> Callable[[List[str]], List]:
+    global _EMBEDDING_FUNCTION
+    if _EMBEDDING_FUNCTION is None:
+        # Same MiniLM model as the icon index, already downloaded on startup
+        from services.icon_index import get_icon_embedding_function
+
+        _EMBEDDING_FUNCTION = get_icon_embedding_function()
+    return _EMBEDDING_FUNCTION
+
+
+def embed_texts(texts: List[str]) -> np.ndarray:
+    embeddings = np.asarray(get_document_embedding_function()(texts), dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+
+def split_content(content: str, max_characters: int) -> List[str]:
+    """
+    Splits content into windows of at most max_characters on paragraph
+    boundaries, cutting paragraphs that are longer than a window.
+    """
+    windows = []
+    window = ""
+    for paragraph in content.split("\n\n"):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if window and len(window) + len(paragraph) + 2 > max_characters:
+            windows.append(window)
+            window = ""
+        while len(paragraph) > max_characters:
+            windows.append(paragraph[:max_characters])
+            paragraph = paragraph[max_characters:]
+        window = f"{window}\n\n{paragraph}" if window else paragraph
+    if window:
+        windows.append(window)
+    return windows
+
+
+def chunk_document(
+    text: str, max_characters: int = DOCUMENT_CHUNK_MAX_CHARACTERS
+) -> List[DocumentChunk]:
+    """
+    Splits a markdown document into one section per heading, and text
+    before the first heading, then splits long sections into windows
+    small enough to embed.
+    """
+    chunker = ScoreBasedChunker()
+    heading_offsets = chunker.extract_heading_offsets(text)
+    headings = [heading for heading, _, _ in heading_offsets]
+
+    sections: List[DocumentChunk] = []
+    preamble = text[: heading_offsets[0][1]] if heading_offsets else text
+    if preamble.strip():
+        sections.append(
+            DocumentChunk(heading="", content=preamble, heading_index=-1, score=0.0)
+        )
+    if headings:
+        sections.extend(
+            chunker.get_chunks_from_headings(
+                text,
+                headings,
+                chunker.score_headings(headings),
+                len(headings),
+                heading_offsets,
+            )
+        )
+
+    chunks = []
+    for section in sections:
+        windows = split_content(section.content, max_characters) or [""]
+        for window in windows:
+            if not (section.heading or window):
+                continue
+            chunks.append(section.model_copy(update={"content": window}))
+    return chunks
+
+
+def build_document_index(
+    file_paths: List[str], documents: List[str]
+) -> Tuple[List[DocumentChunk], np.ndarray]:
+    chunks = [chunk for document in documents for chunk in chunk_document(document)]
+    if not chunks:
+        return chunks, np.zeros((0, 0), dtype=np.float32)
+    return chunks, embed_texts([f"{c.heading}\n{c.content}" for c in chunks])
+
+
+def get_document_index_cache_key(
+    presentation_id: uuid.UUID, file_paths: List[str]
+) -> str:
+    """
+    SHA-256 of the documents' content hashes and of everything that changes
+    how they are chunked and embedded. Reads every file, so it raises
+    OSError if one is missing.
+    """
+    return hashlib.sha256(
+        json.dumps(
+            {
+                "presentation": str(presentation_id),
+                "file_paths": file_paths,
+                "files": [get_file_hash(file_path) for file_path in file_paths],
+                "chunk_max_characters": DOCUMENT_CHUNK_MAX_CHARACTERS,
+                "embedding_model": DOCUMENT_EMBEDDING_MODEL,
+            }
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+class DocumentIndex:
+    """
+    Cosine search over the chunks of a presentation's documents, on a
+    normalized float32 embedding matrix.
+    """
+
+    def __init__(
+        self,
+        file_paths: List[str],
+        chunks: List[DocumentChunk],
+        embeddings: np.ndarray,
+    ):
+        self.file_paths = file_paths
+        self.chunks = chunks
+        self.embeddings = embeddings
+
+    def query(self, query_embeddings: np.ndarray, k: int) -> List[List[DocumentChunk]]:
+        if not self.chunks:
+            return [[] for _ in range(len(query_embeddings))]
+
+        k = min(k, len(self.chunks))
+        scores = query_embeddings @ self.embeddings.T
+
+        if k < len(self.chunks):
+            top_k = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top_k = np.tile(np.arange(len(self.chunks)), (len(scores), 1))
+        top_k_scores = np.take_along_axis(scores, top_k, axis=1)
+        ordered_top_k = np.take_along_axis(
+            top_k, np.argsort(-top_k_scores, axis=1), axis=1
+        )
+        return [[self.chunks[index] for index in row] for row in ordered_top_k]
+
+
+def load_cached_document_index(
+    cache: DiskCacheService, cache_key: str, file_paths: List[str]
+) -> Optional[DocumentIndex]:
+    cached = cache.get(cache_key)
+    if not cached:
+        return None
+    try:
+        with np.load(cached["path"], allow_pickle=False) as data:
+            chunks = [
+                DocumentChunk(**chunk) for chunk in json.loads(str(data["chunks"]))
+            ]
+            embeddings = data["embeddings"]
+    except (OSError, ValueError, KeyError):
+        return None
+    return DocumentIndex(list(file_paths), chunks, embeddings)
+
+
+def cache_document_index(cache: DiskCacheService, cache_key: str, index: DocumentIndex):
+    index_path = TEMP_FILE_SERVICE.create_temp_file_path(f"{uuid.uuid4()}.npz")
+    np.savez(
+        index_path,
+        embeddings=index.embeddings,
+        chunks=np.array(json.dumps([chunk.model_dump() for chunk in index.chunks])),
+    )
+    try:
+        cache.set(cache_key, source_path=index_path)
+    finally:
+        TEMP_FILE_SERVICE.cleanup_temp_file(index_path)
+
+
+def format_document_context(chunks: List[DocumentChunk]) -> str:
+    return "\n\n---\n\n".join(
+        f"{chunk.heading}\n{chunk.content}" if chunk.heading else chunk.content
+        for chunk in chunks
+    )
+
+
+class DocumentRetrievalService:
+    """
+    Keeps a vector index of the uploaded documents of recent presentations,
+    so every slide is generated with the DOCUMENT_CONTEXT_TOP_K document
+    chunks most relevant to its outline instead of whole documents.
+
+    Indexes are also stored in the document index disk cache, so they
+    outlive the in-memory LRU and server restarts without the documents
+    being parsed and embedded again.
+    """
+
+    def __init__(self):
+        self._indexes: OrderedDict[uuid.UUID, DocumentIndex] = OrderedDict()
+        self._indexed_chunks = 0
+        self._queries = 0
+        self._failures = 0
+
+    @property
+    def top_k(self) -> int:
+        return int(get_document_context_top_k_env() or DEFAULT_DOCUMENT_CONTEXT_TOP_K)
+
+    async def index_documents(
+        self,
+        presentation_id: uuid.UUID,
+        file_paths: List[str],
+        documents: List[str],
+    ) -> DocumentIndex:
+        index = self._indexes.get(presentation_id)
+        if index is None or index.file_paths != file_paths:
+            chunks, embeddings = await asyncio.to_thread(
+                build_document_index, file_paths, documents
+            )
+            index = DocumentIndex(list(file_paths), chunks, embeddings)
+            self._indexed_chunks += len(chunks)
+
+            document_index_cache = get_document_index_cache()
+            if document_index_cache:
+                try:
+                    cache_key = await asyncio.to_thread(
+                        get_document_index_cache_key, presentation_id, file_paths
+                    )
+                except OSError:
+                    cache_key = None
+                if cache_key:
+                    await asyncio.to_thread(
+                        cache_document_index, document_index_cache, cache_key, index
+                    )
+
+        self._remember_index(presentation_id, index)
+        return index
+
+    def _remember_index(self, presentation_id: uuid.UUID, index: DocumentIndex):
+        self._indexes[presentation_id] = index
+        self._indexes.move_to_end(presentation_id)
+        while len(self._indexes) > DOCUMENT_INDEX_CACHE_MAX_SIZE:
+            self._indexes.popitem(last=False)
+
+    async def get_index(
+        self, presentation_id: uuid.UUID, file_paths: List[str]
+    ) -> DocumentIndex:
+        """
+        Returns the index of the presentation, loading and indexing its
+        documents if they are not indexed yet.
+        """
+        index = self._indexes.get(presentation_id)
+        if index is not None and index.file_paths == file_paths:
+            self._indexes.move_to_end(presentation_id)
+            return index
+
+        document_index_cache = get_document_index_cache()
+        if document_index_cache:
+            try:
+                cache_key = await asyncio.to_thread(
+                    get_document_index_cache_key, presentation_id, file_paths
+                )
+            except OSError:
+                # Missing files are reported by the documents loader
+                cache_key = None
+            index = (
+                await asyncio.to_thread(
+                    load_cached_document_index,
+                    document_index_cache,
+                    cache_key,
+                    file_paths,
+                )
+                if cache_key
+                else None
+            )
+            if index is not None:
+                self._remember_index(presentation_id, index)
+                return index
+
+        documents_loader = DocumentsLoader(file_paths=file_paths)
+        await documents_loader.load_documents()
+        return await self.index_documents(
+            presentation_id, file_paths, documents_loader.documents
+        )
+
+    async def get_slide_contexts(
+        self, index: DocumentIndex, outlines: List[str]
+    ) -> List[str]:
+        """
+        Returns the formatted document context for every outline, in input
+        order.
+        """
+        if not outlines or not index.chunks:
+            return ["" for _ in outlines]
+        self._queries += len(outlines)
+        query_embeddings = await asyncio.to_thread(embed_texts, outlines)
+        return [
+            format_document_context(chunks)
+            for chunks in index.query(query_embeddings, self.top_k)
+        ]
+
+    async def get_presentation_slide_contexts(
+        self,
+        presentation_id: uuid.UUID,
+        file_paths: List[str],
+        outlines: List[str],
+    ) -> List[Optional[str]]:
+        """
+        Returns the document context for every outline of the presentation.
+        Retrieval only improves grounding, so if the documents can not be
+        indexed or embedded, e.g. the embedding model is not available
+        offline, slides are generated without document context.
+        """
+        try:
+            index = await self.get_index(presentation_id, file_paths)
+            return await self.get_slide_contexts(index, outlines)
+        except Exception:
+            self._failures += 1
+            print(
+                "Document retrieval failed, generating slides without document context"
+            )
+            traceback.print_exc()
+            return [None for _ in outlines]
+
+    def get_stats(self) -> dict:
+        return {
+            "indexes": len(self._indexes),
+            "max_indexes": DOCUMENT_INDEX_CACHE_MAX_SIZE,
+            "indexed_chunks": self._indexed_chunks,
+            "queries": self._queries,
+            "failures": self._failures,
+            "top_k": self.top_k,
+        }
+
+
+DOCUMENT_RETRIEVAL_SERVICE = DocumentRetrievalService()
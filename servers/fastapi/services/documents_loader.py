@@ -1,24 +1,118 @@
+import hashlib
+from importlib import metadata
+import json
 import mimetypes
+import uuid
 from fastapi import HTTPException
 import os, asyncio
-from typing import List, Optional, Tuple
-import pdfplumber
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 from constants.documents import (
+    DOCLING_PIPELINE_OPTIONS,
     PDF_MIME_TYPES,
     POWERPOINT_TYPES,
     TEXT_MIME_TYPES,
     WORD_TYPES,
 )
-from services.docling_service import DoclingService
+from services.disk_cache_service import DiskCacheService
+from services.docling_executor_service import DOCLING_EXECUTOR_SERVICE
+from services.pdf_rasterizer_service import (
+    DEFAULT_PDF_PAGE_DPI,
+    PDF_RASTERIZER_SERVICE,
+    get_pdf_page_count,
+    render_pdf_pages,
+)
+from services.temp_file_service import TEMP_FILE_SERVICE
+from utils.asset_directory_utils import get_cache_directory
+from utils.get_env import (
+    get_app_data_directory_env,
+    get_document_cache_max_size_mb_env,
+)
+
+DEFAULT_DOCUMENT_CACHE_MAX_SIZE_MB = 256
+DOCUMENT_STREAM_PAGE_WINDOW = 10
+
+_DOCUMENT_CACHE: Optional[DiskCacheService] = None
+
+
+def get_document_cache() -> Optional[DiskCacheService]:
+    global _DOCUMENT_CACHE
+    if not get_app_data_directory_env():
+        return None
+    if _DOCUMENT_CACHE is None:
+        _DOCUMENT_CACHE = DiskCacheService(
+            get_cache_directory("documents"),
+            max_size_bytes=int(
+                get_document_cache_max_size_mb_env()
+                or DEFAULT_DOCUMENT_CACHE_MAX_SIZE_MB
+            )
+            * 1024
+            * 1024,
+        )
+    return _DOCUMENT_CACHE
+
+
+def get_docling_version() -> Optional[str]:
+    try:
+        return metadata.version("docling")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def get_file_hash(file_path: str) -> str:
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def get_document_cache_key(
+    file_hash: str, page_range: Optional[Tuple[int, int]] = None
+) -> str:
+    """
+    SHA-256 of the file content hash and of everything that changes how
+    docling parses it.
+    """
+    return hashlib.sha256(
+        json.dumps(
+            {
+                "file": file_hash,
+                "docling": get_docling_version(),
+                "options": DOCLING_PIPELINE_OPTIONS,
+                "page_range": page_range,
+            },
+            sort_keys=True,
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+def get_cached_document(cache: DiskCacheService, cache_key: str) -> Optional[str]:
+    cached = cache.get(cache_key)
+    if not cached:
+        return None
+    try:
+        with open(cached["path"], "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def cache_document(cache: DiskCacheService, cache_key: str, document: str):
+    markdown_path = TEMP_FILE_SERVICE.create_temp_file_path(f"{uuid.uuid4()}.md")
+    with open(markdown_path, "w", encoding="utf-8") as f:
+        f.write(document)
+    try:
+        cache.set(cache_key, source_path=markdown_path)
+    finally:
+        TEMP_FILE_SERVICE.cleanup_temp_file(markdown_path)
 
 
 class DocumentsLoader:
 
     def __init__(self, file_paths: List[str]):
         self._file_paths = file_paths
-
-        self.docling_service = DoclingService()
+        self._file_hashes: Dict[str, str] = {}
 
         self._documents: List[str] = []
         self._images: List[List[str]] = []
@@ -31,6 +125,13 @@ class DocumentsLoader:
     def images(self):
         return self._images
 
+    def _check_files_exist(self):
+        for file_path in self._file_paths:
+            if not os.path.exists(file_path):
+                raise HTTPException(
+                    status_code=404, detail=f"File {file_path} not found"
+                )
+
     async def load_documents(
         self,
         temp_dir: Optional[str] = None,
@@ -39,35 +140,90 @@ class DocumentsLoader:
     ):
         """If load_images is True, temp_dir must be provided"""
 
-        documents: List[str] = []
-        images: List[str] = []
+        self._check_files_exist()
 
-        for file_path in self._file_paths:
-            if not os.path.exists(file_path):
-                raise HTTPException(
-                    status_code=404, detail=f"File {file_path} not found"
-                )
+        # Files are parsed concurrently, results keep the order of file_paths
+        results = await asyncio.gather(
+            *[
+                self.load_document(file_path, load_text, load_images, temp_dir)
+                for file_path in self._file_paths
+            ]
+        )
 
-            document = ""
-            imgs = []
+        self._documents = [document for document, _ in results]
+        self._images = [imgs for _, imgs in results]
 
+    async def iterate_documents(self) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Streaming variant of load_documents for text only. Yields
+        (file_path, markdown section) pairs file by file as sections are
+        parsed, one section per PDF page window. Only the stream is
+        windowed; load_documents still parses each PDF in one pass.
+        """
+        self._check_files_exist()
+
+        for file_path in self._file_paths:
             mime_type = mimetypes.guess_type(file_path)[0]
             if mime_type in PDF_MIME_TYPES:
-                document, imgs = await self.load_pdf(
-                    file_path, load_text, load_images, temp_dir
-                )
-            elif mime_type in TEXT_MIME_TYPES:
-                document = await self.load_text(file_path)
-            elif mime_type in POWERPOINT_TYPES:
-                document = self.load_powerpoint(file_path)
-            elif mime_type in WORD_TYPES:
-                document = self.load_msword(file_path)
+                async for section in self.iterate_pdf_sections(file_path):
+                    yield file_path, section
+            else:
+                document, _ = await self.load_document(file_path, True, False)
+                yield file_path, document
+
+    async def iterate_pdf_sections(self, file_path: str) -> AsyncIterator[str]:
+        """
+        Parses the PDF DOCUMENT_STREAM_PAGE_WINDOW pages at a time with the
+        next window parsed ahead, so docling never holds a whole large PDF.
+        Each window is cached separately.
+        """
+        page_count = await asyncio.to_thread(get_pdf_page_count, file_path)
+        page_ranges = [
+            (first_page, min(first_page + DOCUMENT_STREAM_PAGE_WINDOW - 1, page_count))
+            for first_page in range(1, page_count + 1, DOCUMENT_STREAM_PAGE_WINDOW)
+        ]
+        if not page_ranges:
+            return
+
+        next_section = asyncio.create_task(
+            self.parse_to_markdown(file_path, page_ranges[0])
+        )
+        section_task = next_section
+        try:
+            for index in range(len(page_ranges)):
+                section_task = next_section
+                if index + 1 < len(page_ranges):
+                    next_section = asyncio.create_task(
+                        self.parse_to_markdown(file_path, page_ranges[index + 1])
+                    )
+                yield await section_task
+        finally:
+            section_task.cancel()
+            next_section.cancel()
+
+    async def load_document(
+        self,
+        file_path: str,
+        load_text: bool,
+        load_images: bool,
+        temp_dir: Optional[str] = None,
+    ) -> Tuple[str, List[str]]:
+        document = ""
+        imgs = []
 
-            documents.append(document)
-            images.append(imgs)
+        mime_type = mimetypes.guess_type(file_path)[0]
+        if mime_type in PDF_MIME_TYPES:
+            document, imgs = await self.load_pdf(
+                file_path, load_text, load_images, temp_dir
+            )
+        elif mime_type in TEXT_MIME_TYPES:
+            document = await self.load_text(file_path)
+        elif mime_type in POWERPOINT_TYPES:
+            document = await self.load_powerpoint(file_path)
+        elif mime_type in WORD_TYPES:
+            document = await self.load_msword(file_path)
 
-        self._documents = documents
-        self._images = images
+        return document, imgs
 
     async def load_pdf(
         self,
@@ -79,10 +235,14 @@ class DocumentsLoader:
         image_paths = []
         document: str = ""
 
-        if load_text:
-            document = self.docling_service.parse_to_markdown(file_path)
-
-        if load_images:
+        if load_text and load_images:
+            document, image_paths = await asyncio.gather(
+                self.parse_to_markdown(file_path),
+                self.get_page_images_from_pdf_async(file_path, temp_dir),
+            )
+        elif load_text:
+            document = await self.parse_to_markdown(file_path)
+        elif load_images:
             image_paths = await self.get_page_images_from_pdf_async(file_path, temp_dir)
 
         return document, image_paths
@@ -91,25 +251,77 @@ class DocumentsLoader:
         with open(file_path, "r") as file:
             return await asyncio.to_thread(file.read)
 
-    def load_msword(self, file_path: str) -> str:
-        return self.docling_service.parse_to_markdown(file_path)
+    async def load_msword(self, file_path: str) -> str:
+        return await self.parse_to_markdown(file_path)
+
+    async def load_powerpoint(self, file_path: str) -> str:
+        return await self.parse_to_markdown(file_path)
+
+    async def parse_to_markdown(
+        self, file_path: str, page_range: Optional[Tuple[int, int]] = None
+    ) -> str:
+        """Parses with docling, reusing the markdown of files parsed before"""
+        document_cache = get_document_cache()
+        if not document_cache:
+            return await DOCLING_EXECUTOR_SERVICE.parse_to_markdown(
+                file_path, page_range
+            )
+
+        if file_path not in self._file_hashes:
+            self._file_hashes[file_path] = await asyncio.to_thread(
+                get_file_hash, file_path
+            )
+        cache_key = get_document_cache_key(self._file_hashes[file_path], page_range)
+        document = await asyncio.to_thread(
+            get_cached_document, document_cache, cache_key
+        )
+        if document is not None:
+            return document
+
+        document = await DOCLING_EXECUTOR_SERVICE.parse_to_markdown(
+            file_path, page_range
+        )
+        await asyncio.to_thread(cache_document, document_cache, cache_key, document)
+        return document
 
-    def load_powerpoint(self, file_path: str) -> str:
-        return self.docling_service.parse_to_markdown(file_path)
+    @classmethod
+    def get_page_images_from_pdf(
+        cls,
+        file_path: str,
+        temp_dir: str,
+        dpi: int = DEFAULT_PDF_PAGE_DPI,
+        image_format: str = "png",
+    ) -> List[str]:
+        return render_pdf_pages(
+            file_path,
+            temp_dir,
+            1,
+            get_pdf_page_count(file_path),
+            dpi,
+            image_format,
+        )
 
     @classmethod
-    def get_page_images_from_pdf(cls, file_path: str, temp_dir: str) -> List[str]:
-        with pdfplumber.open(file_path) as pdf:
-            images = []
-            for page in pdf.pages:
-                img = page.to_image(resolution=150)
-                image_path = os.path.join(temp_dir, f"page_{page.page_number}.png")
-                img.save(image_path)
-                images.append(image_path)
-            return images
+    async def get_page_images_from_pdf_async(
+        cls,
+        file_path: str,
+        temp_dir: str,
+        dpi: int = DEFAULT_PDF_PAGE_DPI,
+        image_format: str = "png",
+    ) -> List[str]:
+        return await PDF_RASTERIZER_SERVICE.get_page_images(
+            file_path, temp_dir, dpi, image_format
+        )
 
     @classmethod
-    async def get_page_images_from_pdf_async(cls, file_path: str, temp_dir: str):
-        return await asyncio.to_thread(
-            cls.get_page_images_from_pdf, file_path, temp_dir
+    def iterate_page_images_from_pdf(
+        cls,
+        file_path: str,
+        temp_dir: str,
+        dpi: int = DEFAULT_PDF_PAGE_DPI,
+        image_format: str = "png",
+    ) -> AsyncIterator[str]:
+        """Yields page image paths in page order as soon as they are saved"""
+        return PDF_RASTERIZER_SERVICE.iterate_page_images(
+            file_path, temp_dir, dpi, image_format
         )
@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+from typing import Iterable, Literal, Optional
+import uuid
+
+from models.presentation_and_path import PresentationAndPath
+from models.sql.presentation import PresentationModel
+from models.sql.slide import SlideModel
+from services.disk_cache_service import DiskCacheService, link_or_copy_file
+from utils.asset_directory_utils import get_cache_directory
+from utils.get_env import (
+    get_app_data_directory_env,
+    get_export_cache_max_size_mb_env,
+)
+
+DEFAULT_EXPORT_CACHE_MAX_SIZE_MB = 1024
+EXPORT_FORMATS = ("pptx", "pdf")
+
+
+def get_presentation_content_hash(
+    presentation: PresentationModel,
+    slides: Iterable[SlideModel],
+    export_as: Literal["pptx", "pdf"],
+    image_dpi: Optional[int] = None,
+) -> str:
+    """
+    Hash of everything that ends up in an exported file: the ordered slides,
+    the presentation layout (theme), the title used as file name and the
+    export options.
+    """
+    content = {
+        "title": presentation.title,
+        "layout": presentation.layout,
+        "export_as": export_as,
+        "image_dpi": image_dpi,
+        "slides": [
+            {
+                "layout": slide.layout,
+                "content": slide.content,
+                "properties": slide.properties,
+                "speaker_note": slide.speaker_note,
+                "html_content": slide.html_content,
+            }
+            for slide in sorted(slides, key=lambda slide: slide.index)
+        ],
+    }
+    return hashlib.sha256(
+        json.dumps(content, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+class ExportCacheService:
+    """
+    Remembers the last exported file of every presentation and format.
+
+    Entries store the content hash the file was built from and a hard link
+    to the file, so a repeat export with the same hash only restores the
+    file into the exports directory. Exports are named after the
+    presentation title, so the file may have been overwritten by another
+    presentation; the link's size and mtime are checked before reuse.
+    """
+
+    def __init__(self):
+        self._cache: Optional[DiskCacheService] = None
+
+    def _get_cache(self) -> Optional[DiskCacheService]:
+        if not get_app_data_directory_env():
+            return None
+        if self._cache is None:
+            self._cache = DiskCacheService(
+                get_cache_directory("exports"),
+                max_size_bytes=int(
+                    get_export_cache_max_size_mb_env()
+                    or DEFAULT_EXPORT_CACHE_MAX_SIZE_MB
+                )
+                * 1024
+                * 1024,
+            )
+        return self._cache
+
+    def _get_key(self, presentation_id: uuid.UUID, export_as: str) -> str:
+        return f"{presentation_id}_{export_as}"
+
+    def get(
+        self,
+        presentation_id: uuid.UUID,
+        export_as: Literal["pptx", "pdf"],
+        content_hash: str,
+    ) -> Optional[PresentationAndPath]:
+        cache = self._get_cache()
+        if not cache:
+            return None
+
+        key = self._get_key(presentation_id, export_as)
+        cached_export = cache.get(key)
+        if not cached_export:
+            return None
+
+        try:
+            stat = os.stat(cached_export["path"])
+            if (
+                cached_export["content_hash"] != content_hash
+                or stat.st_size != cached_export.get("size")
+                or stat.st_mtime_ns != cached_export.get("mtime_ns")
+            ):
+                cache.delete(key)
+                return None
+
+            export_path = cached_export["export_path"]
+            if not (
+                os.path.exists(export_path)
+                and os.path.samefile(export_path, cached_export["path"])
+            ):
+                os.makedirs(os.path.dirname(export_path), exist_ok=True)
+                link_or_copy_file(cached_export["path"], export_path)
+        except FileNotFoundError:
+            # Evicted since it was looked up
+            return None
+
+        return PresentationAndPath(presentation_id=presentation_id, path=export_path)
+
+    def set(
+        self,
+        presentation_and_path: PresentationAndPath,
+        export_as: Literal["pptx", "pdf"],
+        content_hash: str,
+    ):
+        cache = self._get_cache()
+        export_path = presentation_and_path.path
+        if not cache or not os.path.isfile(export_path):
+            return
+
+        key = self._get_key(presentation_and_path.presentation_id, export_as)
+        blob_path = cache.set(
+            key,
+            {"content_hash": content_hash, "export_path": export_path},
+            source_path=export_path,
+        )
+        if not os.path.exists(blob_path):
+            return
+        # The blob is a copy if hard links are not supported
+        stat = os.stat(blob_path)
+        cache.update(key, {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns})
+
+    def invalidate(self, presentation_id: uuid.UUID):
+        cache = self._get_cache()
+        if not cache:
+            return
+        for export_as in EXPORT_FORMATS:
+            cache.delete(self._get_key(presentation_id, export_as))
+
+    def get_stats(self) -> Optional[dict]:
+        cache = self._get_cache()
+        return cache.get_stats() if cache else None
+
+
+EXPORT_CACHE_SERVICE = ExportCacheService()
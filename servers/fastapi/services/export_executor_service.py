@@ -0,0 +1,168 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import time
+from typing import Dict, List, Optional, Tuple
+from fastapi import HTTPException
+
+from models.pptx_models import PptxPresentationModel
+from services.pptx_presentation_creator import PptxPresentationCreator
+from utils.get_env import get_export_queue_depth_env, get_export_workers_env
+
+DEFAULT_EXPORT_WORKERS = 2
+DEFAULT_EXPORT_QUEUE_DEPTH = 16
+
+
+def build_and_save_pptx(
+    ppt_model: PptxPresentationModel,
+    temp_dir: str,
+    pptx_path: str,
+    image_dpi: Optional[int] = None,
+    incremental: bool = False,
+    slide_cache_keys: Optional[List[str]] = None,
+    cached_slides: Optional[Dict[int, dict]] = None,
+) -> Tuple[str, float]:
+    """
+    Runs in an export worker process. Returns the saved path and the time
+    the worker picked up the job.
+    """
+    started_at = time.time()
+    pptx_creator = PptxPresentationCreator(
+        ppt_model,
+        temp_dir,
+        image_dpi=image_dpi,
+        incremental=incremental,
+        slide_cache_keys=slide_cache_keys,
+        cached_slides=cached_slides,
+    )
+    pptx_creator.build_slides()
+    pptx_creator.save(pptx_path)
+    return pptx_path, started_at
+
+
+class ExportExecutorService:
+    """
+    Builds and saves PPTX files in a process pool, so python-pptx and PIL
+    work does not block the event loop.
+
+    Network assets are downloaded on the event loop first; the worker only
+    receives the pickled model with local image paths, and in incremental
+    mode the slides already restored from the slide cache. At most
+    EXPORT_QUEUE_DEPTH exports may wait for a free worker, further exports
+    are rejected with a 503. If a worker dies, e.g. killed for running out
+    of memory, the pool is replaced and the export is retried once.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._restarts = 0
+        self._total_queue_wait = 0.0
+        self._max_queue_wait = 0.0
+
+    @property
+    def workers(self) -> int:
+        return int(get_export_workers_env() or DEFAULT_EXPORT_WORKERS)
+
+    @property
+    def queue_depth(self) -> int:
+        return int(get_export_queue_depth_env() or DEFAULT_EXPORT_QUEUE_DEPTH)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Forking a process that runs the event loop and worker threads
+            # is unsafe, so workers are spawned
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _reset_executor(self, executor: ProcessPoolExecutor):
+        # A broken pool fails every job, the next one creates a new pool
+        if self._executor is executor:
+            self._executor = None
+            self._restarts += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run_in_executor(self, *args) -> Tuple[str, float]:
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                return await asyncio.get_running_loop().run_in_executor(
+                    executor, build_and_save_pptx, *args
+                )
+            except BrokenProcessPool:
+                self._reset_executor(executor)
+                if attempt:
+                    raise HTTPException(
+                        status_code=500,
+                        detail="Export worker crashed while building the presentation",
+                    )
+
+    async def export_pptx(
+        self,
+        ppt_model: PptxPresentationModel,
+        temp_dir: str,
+        pptx_path: str,
+        image_dpi: Optional[int] = None,
+        incremental: bool = False,
+    ) -> str:
+        pptx_creator = PptxPresentationCreator(
+            ppt_model, temp_dir, image_dpi=image_dpi, incremental=incremental
+        )
+        await pptx_creator.fetch_network_assets()
+
+        # Only exports waiting for or running on a worker count as queued
+        if self._in_flight >= self.workers + self.queue_depth:
+            self._rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Too many exports in progress, please try again later",
+            )
+
+        self._in_flight += 1
+        try:
+            queued_at = time.time()
+            pptx_path, started_at = await self._run_in_executor(
+                ppt_model,
+                temp_dir,
+                pptx_path,
+                image_dpi,
+                incremental,
+                pptx_creator.slide_cache_keys,
+                pptx_creator.cached_slides,
+            )
+        finally:
+            self._in_flight -= 1
+
+        queue_wait = max(0.0, started_at - queued_at)
+        self._completed += 1
+        self._total_queue_wait += queue_wait
+        self._max_queue_wait = max(self._max_queue_wait, queue_wait)
+        return pptx_path
+
+    def get_stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queue_depth,
+            "in_flight": self._in_flight,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "restarts": self._restarts,
+            "average_queue_wait_seconds": (
+                self._total_queue_wait / self._completed if self._completed else 0.0
+            ),
+            "max_queue_wait_seconds": self._max_queue_wait,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+EXPORT_EXECUTOR_SERVICE = ExportExecutorService()
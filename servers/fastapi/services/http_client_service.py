@@ -0,0 +1,87 @@
+import asyncio
+from typing import Dict, Set
+import aiohttp
+
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_CONNECTIONS_PER_HOST = 16
+HTTP_DNS_CACHE_TTL = 300
+HTTP_KEEPALIVE_TIMEOUT = 30
+
+
+class HttpClientService:
+    """
+    App-scoped aiohttp sessions shared by every outgoing HTTP call.
+
+    The sessions are opened in app_lifespan and closed on shutdown. They are
+    also created on first use, so scripts and background tasks running
+    outside the app lifespan can use them too. Callers that should honour
+    proxy environment variables ask for the trust_env session.
+
+    aiohttp sessions are bound to the event loop they were created on, so
+    every loop gets its own sessions. Sessions of loops that have been
+    closed are released by the next get_session() on another loop.
+    """
+
+    def __init__(self):
+        # Sessions reference their loop, so these are released explicitly
+        # rather than through weak references
+        self._sessions: Dict[
+            asyncio.AbstractEventLoop, Dict[bool, aiohttp.ClientSession]
+        ] = {}
+        self._close_tasks: Set[asyncio.Task] = set()
+
+    def _create_session(self, trust_env: bool) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_MAX_CONNECTIONS,
+            limit_per_host=HTTP_MAX_CONNECTIONS_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        )
+        return aiohttp.ClientSession(connector=connector, trust_env=trust_env)
+
+    def _release_closed_loops(self, loop: asyncio.AbstractEventLoop):
+        for other_loop, sessions in list(self._sessions.items()):
+            if not other_loop.is_closed():
+                continue
+            del self._sessions[other_loop]
+            for session in sessions.values():
+                if session.closed:
+                    continue
+                # Connections of a closed loop are already gone, closing
+                # only releases the session and its connector
+                task = loop.create_task(session.close())
+                self._close_tasks.add(task)
+                task.add_done_callback(self._close_tasks.discard)
+
+    def get_session(self, trust_env: bool = False) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        sessions = self._sessions.get(loop)
+        if sessions is None:
+            self._release_closed_loops(loop)
+            sessions = self._sessions[loop] = {}
+        session = sessions.get(trust_env)
+        if session is None or session.closed:
+            session = self._create_session(trust_env)
+            sessions[trust_env] = session
+        return session
+
+    async def start(self):
+        self.get_session()
+
+    async def close(self):
+        loop = asyncio.get_running_loop()
+        for other_loop, sessions in list(self._sessions.items()):
+            for session in sessions.values():
+                if session.closed:
+                    continue
+                if other_loop is not loop and other_loop.is_running():
+                    # The other loop runs in another thread
+                    asyncio.run_coroutine_threadsafe(session.close(), other_loop)
+                else:
+                    await session.close()
+        self._sessions = {}
+        if self._close_tasks:
+            await asyncio.gather(*self._close_tasks, return_exceptions=True)
+
+
+HTTP_CLIENT_SERVICE = HttpClientService()
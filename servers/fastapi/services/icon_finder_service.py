@@ -1,56 +1,285 @@
 import asyncio
-import json
-import chromadb
-from chromadb.config import Settings
-from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+from collections import OrderedDict
+from enum import Enum
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+from sqlmodel import select
+
+from models.sql.presentation import PresentationModel
+from models.sql.slide import SlideModel
+from services.database import async_session_maker
+from services.icon_index import IconIndex, create_icon_index, load_bold_icons
+from utils.dict_utils import get_dict_at_path, get_dict_paths_with_key
+
+# Concurrent search_icons calls arriving within this window share one query
+ICON_SEARCH_BATCH_WINDOW = 0.01
+ICON_SEARCH_MAX_BATCH_SIZE = 256
+
+ICON_CACHE_MAX_SIZE = 4096
+# Number of most recent slides scanned for icon queries on startup
+ICON_CACHE_WARM_UP_SLIDES = 2000
+# A failed index load is retried by the next search after this many seconds
+ICON_INDEX_RETRY_INTERVAL = 60
+
+
+class IconIndexStatus(Enum):
+    PENDING = "pending"
+    INITIALIZING = "initializing"
+    READY = "ready"
+    FAILED = "failed"
+
+
+def normalize_icon_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def tokenize_icon_text(text: str) -> List[str]:
+    return [token for token in re.split(r"[^a-z0-9]+", text.lower()) if token]
 
 
 class IconFinderService:
+    """
+    Semantic icon search backed by an IconIndex (Chroma or NumPy, selected
+    with ICON_INDEX_BACKEND).
+
+    The index and ONNX model are loaded by initialize(), which
+    app_lifespan starts in the background. Until the index is ready,
+    searches fall back to lexical matching on icon names and tags, and a
+    failed load is retried every ICON_INDEX_RETRY_INTERVAL seconds.
+    """
+
     def __init__(self):
-        self.collection_name = "icons"
-        self.client = chromadb.PersistentClient(
-            path="chroma", settings=Settings(anonymized_telemetry=False)
-        )
-        print("Initializing icons collection...")
-        self._initialize_icons_collection()
-        print("Icons collection initialized.")
-
-    def _initialize_icons_collection(self):
-        self.embedding_function = ONNXMiniLM_L6_V2()
-        self.embedding_function.DOWNLOAD_PATH = "chroma/models"
-        self.embedding_function._download_model_if_not_exists()
+        self.index: Optional[IconIndex] = None
+        self.status = IconIndexStatus.PENDING
+        self._initialize_task: Optional[asyncio.Task] = None
+        self._failed_at = 0.0
+        self._lexical_index: Optional[List[Tuple[str, set, set]]] = None
+
+        self._pending_searches: List[Tuple[str, int, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+        self._icon_cache: OrderedDict[Tuple[str, int], List[str]] = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    @property
+    def is_ready(self) -> bool:
+        return self.status == IconIndexStatus.READY
+
+    async def initialize(self):
+        if self.status not in (IconIndexStatus.PENDING, IconIndexStatus.FAILED):
+            return
+        self.status = IconIndexStatus.INITIALIZING
         try:
-            self.collection = self.client.get_collection(
-                self.collection_name, embedding_function=self.embedding_function
-            )
-        except Exception:
-            with open("assets/icons.json", "r") as f:
-                icons = json.load(f)
-
-            documents = []
-            ids = []
-
-            for i, each in enumerate(icons["icons"]):
-                if each["name"].split("-")[-1] == "bold":
-                    doc_text = f"{each['name']} {each['tags']}"
-                    documents.append(doc_text)
-                    ids.append(each["name"])
-
-            if documents:
-                self.collection = self.client.create_collection(
-                    name=self.collection_name,
-                    embedding_function=self.embedding_function,
-                    metadata={"hnsw:space": "cosine"},
+            await asyncio.to_thread(self._initialize_icon_index)
+        except Exception as e:
+            self.status = IconIndexStatus.FAILED
+            self._failed_at = time.monotonic()
+            print(f"Failed to initialize icon index: {e}")
+            return
+        self.status = IconIndexStatus.READY
+        await self.warm_up_cache()
+
+    def _start_initialization(self):
+        if self._initialize_task is not None and not self._initialize_task.done():
+            return
+        if self.status == IconIndexStatus.PENDING or (
+            self.status == IconIndexStatus.FAILED
+            and time.monotonic() - self._failed_at >= ICON_INDEX_RETRY_INTERVAL
+        ):
+            self._initialize_task = asyncio.create_task(self.initialize())
+
+    def _initialize_icon_index(self):
+        print("Initializing icon index...")
+        self.index = create_icon_index()
+        print(f"Icon index initialized ({type(self.index).__name__}).")
+
+    def search_icons_lexical(self, query: str, k: int = 1) -> List[str]:
+        """
+        Ranks icons by how many query tokens appear in their name or tags.
+        """
+        if self._lexical_index is None:
+            self._lexical_index = [
+                (
+                    name,
+                    set(tokenize_icon_text(name)) - {"bold"},
+                    set(tokenize_icon_text(tags)),
                 )
-                self.collection.add(documents=documents, ids=ids)
+                for name, tags in load_bold_icons()
+            ]
+
+        query_tokens = set(tokenize_icon_text(query))
+        if not query_tokens:
+            return []
+
+        scored_icons = []
+        for name, name_tokens, tag_tokens in self._lexical_index:
+            score = 2 * len(query_tokens & name_tokens) + len(
+                query_tokens & tag_tokens
+            )
+            if score:
+                # Shorter names are the more generic icons, so they win ties
+                scored_icons.append((-score, len(name_tokens), name))
+
+        scored_icons.sort()
+        return [f"/static/icons/bold/{name}.svg" for _, _, name in scored_icons[:k]]
 
     async def search_icons(self, query: str, k: int = 1):
-        result = await asyncio.to_thread(
-            self.collection.query,
-            query_texts=[query],
-            n_results=k,
+        """
+        Queues the query for the next micro-batch, so concurrent callers
+        (e.g. every slide of a presentation) share one embedding pass.
+        """
+        # Misses are counted once the query reaches search_icons_batch
+        cached_icons = self._get_cached_icons(query, k, record_miss=False)
+        if cached_icons is not None:
+            return cached_icons
+
+        if not self.is_ready:
+            self._start_initialization()
+            self._cache_misses += 1
+            return self.search_icons_lexical(query, k)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending_searches.append((query, k, future))
+
+        if len(self._pending_searches) >= ICON_SEARCH_MAX_BATCH_SIZE:
+            await self._flush_pending_searches()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(
+                self._flush_pending_searches(ICON_SEARCH_BATCH_WINDOW)
+            )
+
+        return await future
+
+    async def search_icons_batch(self, queries: List[str], k: int = 1):
+        """
+        Embeds all queries in one ONNX forward pass and runs a single index
+        query. Returns one list of icon urls per query, in input order.
+        """
+        if not self.is_ready:
+            self._start_initialization()
+            # Lexical matches are not cached, so every query is a miss
+            self._cache_misses += len(queries)
+            return [self.search_icons_lexical(query, k) for query in queries]
+
+        icons_by_query: Dict[str, List[str]] = {}
+        for query in queries:
+            cached_icons = self._get_cached_icons(query, k)
+            if cached_icons is not None:
+                icons_by_query[query] = cached_icons
+
+        uncached_queries = list(
+            dict.fromkeys(query for query in queries if query not in icons_by_query)
         )
-        return [f"/static/icons/bold/{each}.svg" for each in result["ids"][0]]
+        if uncached_queries:
+            result = await asyncio.to_thread(self.index.query, uncached_queries, k)
+            for query, ids in zip(uncached_queries, result):
+                icons = [f"/static/icons/bold/{each}.svg" for each in ids]
+                icons_by_query[query] = icons
+                self._set_cached_icons(query, k, icons)
+
+        return [icons_by_query[query] for query in queries]
+
+    def _get_cached_icons(
+        self, query: str, k: int, record_miss: bool = True
+    ) -> Optional[List[str]]:
+        key = (normalize_icon_query(query), k)
+        icons = self._icon_cache.get(key)
+        if icons is None:
+            if record_miss:
+                self._cache_misses += 1
+            return None
+        self._icon_cache.move_to_end(key)
+        self._cache_hits += 1
+        return list(icons)
+
+    def _set_cached_icons(self, query: str, k: int, icons: List[str]):
+        key = (normalize_icon_query(query), k)
+        self._icon_cache[key] = icons
+        self._icon_cache.move_to_end(key)
+        while len(self._icon_cache) > ICON_CACHE_MAX_SIZE:
+            self._icon_cache.popitem(last=False)
+
+    async def warm_up_cache(self):
+        """
+        Pre-populates the icon cache with the icon queries of recent slides.
+        """
+        try:
+            queries = await self._get_recent_icon_queries()
+        except Exception as e:
+            print(f"Failed to load icon queries for cache warm up: {e}")
+            return
+
+        for start in range(0, len(queries), ICON_SEARCH_MAX_BATCH_SIZE):
+            await self.search_icons_batch(
+                queries[start : start + ICON_SEARCH_MAX_BATCH_SIZE]
+            )
+        print(f"Icon cache warmed up with {len(queries)} queries.")
+
+    async def _get_recent_icon_queries(self) -> List[str]:
+        async with async_session_maker() as sql_session:
+            slide_contents = await sql_session.scalars(
+                select(SlideModel.content)
+                .join(
+                    PresentationModel,
+                    SlideModel.presentation == PresentationModel.id,
+                )
+                .order_by(PresentationModel.created_at.desc())
+                .limit(ICON_CACHE_WARM_UP_SLIDES)
+            )
+
+            queries = []
+            for content in slide_contents:
+                if not isinstance(content, dict):
+                    continue
+                for path in get_dict_paths_with_key(content, "__icon_query__"):
+                    query = get_dict_at_path(content, path)["__icon_query__"]
+                    if isinstance(query, str) and query.strip():
+                        queries.append(query)
+
+        return list(dict.fromkeys(queries))[:ICON_CACHE_MAX_SIZE]
+
+    def get_cache_stats(self) -> dict:
+        lookups = self._cache_hits + self._cache_misses
+        return {
+            "index_status": self.status.value,
+            "size": len(self._icon_cache),
+            "max_size": ICON_CACHE_MAX_SIZE,
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "hit_ratio": (self._cache_hits / lookups) if lookups else 0.0,
+        }
+
+    async def _flush_pending_searches(self, delay: float = 0):
+        if delay:
+            await asyncio.sleep(delay)
+
+        pending_searches = self._pending_searches
+        self._pending_searches = []
+        if self._flush_task is asyncio.current_task():
+            self._flush_task = None
+        if not pending_searches:
+            return
+
+        searches_by_k: Dict[int, List[Tuple[str, asyncio.Future]]] = {}
+        for query, k, future in pending_searches:
+            searches_by_k.setdefault(k, []).append((query, future))
+
+        for k, searches in searches_by_k.items():
+            try:
+                results = await self.search_icons_batch(
+                    [query for query, _ in searches], k
+                )
+            except Exception as e:
+                for _, future in searches:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), icons in zip(searches, results):
+                if not future.done():
+                    future.set_result(icons)
 
 
 ICON_FINDER_SERVICE = IconFinderService()
@@ -0,0 +1,166 @@
+from abc import ABC, abstractmethod
+import hashlib
+import json
+import os
+from typing import List, Tuple
+import chromadb
+from chromadb.config import Settings
+from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+import numpy as np
+
+from utils.get_env import get_icon_index_backend_env
+
+ICONS_JSON_PATH = "assets/icons.json"
+BOLD_ICONS_DIRECTORY = "static/icons/bold"
+CHROMA_DIRECTORY = "chroma"
+NUMPY_INDEX_EMBEDDINGS_PATH = os.path.join(CHROMA_DIRECTORY, "icons_embeddings.npy")
+NUMPY_INDEX_METADATA_PATH = os.path.join(CHROMA_DIRECTORY, "icons_embeddings.json")
+
+
+def load_bold_icons() -> List[Tuple[str, str]]:
+    """
+    Returns (name, tags) for every bold icon, from icons.json if available
+    or from the bundled svg file names otherwise.
+    """
+    if os.path.exists(ICONS_JSON_PATH):
+        with open(ICONS_JSON_PATH, "r") as f:
+            icons = json.load(f)
+        return [
+            (each["name"], str(each["tags"]))
+            for each in icons["icons"]
+            if each["name"].split("-")[-1] == "bold"
+        ]
+
+    if not os.path.isdir(BOLD_ICONS_DIRECTORY):
+        return []
+    return [
+        (os.path.splitext(file_name)[0], "")
+        for file_name in sorted(os.listdir(BOLD_ICONS_DIRECTORY))
+        if file_name.endswith(".svg")
+    ]
+
+
+def get_icon_embedding_function() -> ONNXMiniLM_L6_V2:
+    embedding_function = ONNXMiniLM_L6_V2()
+    embedding_function.DOWNLOAD_PATH = os.path.join(CHROMA_DIRECTORY, "models")
+    embedding_function._download_model_if_not_exists()
+    return embedding_function
+
+
+class IconIndex(ABC):
+    """
+    Nearest-neighbour index over the bold icon set. query() returns the top-k
+    icon names for every query text, in input order.
+    """
+
+    @abstractmethod
+    def query(self, texts: List[str], k: int) -> List[List[str]]:
+        pass
+
+
+class ChromaIconIndex(IconIndex):
+    def __init__(self, collection_name: str = "icons"):
+        self.client = chromadb.PersistentClient(
+            path=CHROMA_DIRECTORY, settings=Settings(anonymized_telemetry=False)
+        )
+        self.embedding_function = get_icon_embedding_function()
+        try:
+            self.collection = self.client.get_collection(
+                collection_name, embedding_function=self.embedding_function
+            )
+        except Exception:
+            documents = []
+            ids = []
+
+            for name, tags in load_bold_icons():
+                documents.append(f"{name} {tags}")
+                ids.append(name)
+
+            self.collection = self.client.create_collection(
+                name=collection_name,
+                embedding_function=self.embedding_function,
+                metadata={"hnsw:space": "cosine"},
+            )
+            if documents:
+                self.collection.add(documents=documents, ids=ids)
+
+    def query(self, texts: List[str], k: int) -> List[List[str]]:
+        result = self.collection.query(query_texts=texts, n_results=k)
+        return result["ids"]
+
+
+class NumpyIconIndex(IconIndex):
+    """
+    Brute-force cosine search over a normalized float32 embedding matrix.
+
+    The matrix is built once from the icon list, saved as a .npy file and
+    memory-mapped on later starts. It is rebuilt when the icon list changes.
+    """
+
+    def __init__(
+        self,
+        embeddings_path: str = NUMPY_INDEX_EMBEDDINGS_PATH,
+        metadata_path: str = NUMPY_INDEX_METADATA_PATH,
+    ):
+        self.embedding_function = get_icon_embedding_function()
+
+        icons = load_bold_icons()
+        documents = [f"{name} {tags}" for name, tags in icons]
+        source_hash = hashlib.sha256("\n".join(documents).encode("utf-8")).hexdigest()
+
+        metadata = None
+        if os.path.exists(embeddings_path) and os.path.exists(metadata_path):
+            with open(metadata_path, "r") as f:
+                metadata = json.load(f)
+
+        if not metadata or metadata.get("source_hash") != source_hash:
+            embeddings = self._embed(documents) if documents else np.zeros((0, 0))
+            os.makedirs(os.path.dirname(embeddings_path), exist_ok=True)
+            np.save(embeddings_path, embeddings.astype(np.float32))
+            metadata = {
+                "source_hash": source_hash,
+                "ids": [name for name, _ in icons],
+            }
+            with open(metadata_path, "w") as f:
+                json.dump(metadata, f)
+
+        self.ids: List[str] = metadata["ids"]
+        self.embeddings: np.ndarray = np.load(embeddings_path, mmap_mode="r")
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        embeddings = np.asarray(self.embedding_function(texts), dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+    def query(self, texts: List[str], k: int) -> List[List[str]]:
+        if not texts:
+            return []
+        if not self.ids:
+            return [[] for _ in texts]
+
+        k = min(k, len(self.ids))
+        scores = self._embed(texts) @ self.embeddings.T
+
+        if k < len(self.ids):
+            top_k = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top_k = np.tile(np.arange(len(self.ids)), (len(texts), 1))
+        top_k_scores = np.take_along_axis(scores, top_k, axis=1)
+        ordered_top_k = np.take_along_axis(
+            top_k, np.argsort(-top_k_scores, axis=1), axis=1
+        )
+        return [[self.ids[index] for index in row] for row in ordered_top_k]
+
+
+ICON_INDEX_BACKENDS = {
+    "chroma": ChromaIconIndex,
+    "numpy": NumpyIconIndex,
+}
+
+
+def create_icon_index() -> IconIndex:
+    backend = (get_icon_index_backend_env() or "chroma").lower()
+    if backend not in ICON_INDEX_BACKENDS:
+        print(f"Unknown icon index backend '{backend}', using chroma")
+        backend = "chroma"
+    return ICON_INDEX_BACKENDS[backend]()
@@ -1,13 +1,18 @@
+import asyncio
+import hashlib
 import os
-import aiohttp
 import uuid
 import base64
-from typing import Union, Optional
+from typing import Tuple, Union, Optional
 from openai import AsyncOpenAI
 
 from models.image_prompt import ImagePrompt
 from models.sql.image_asset import ImageAsset
+from services.disk_cache_service import DiskCacheService, link_or_copy_file
+from services.http_client_service import HTTP_CLIENT_SERVICE
+from utils.asset_directory_utils import get_cache_directory
 from utils.image_provider import (
+    get_selected_image_provider,
     is_dalle3_selected,
     is_gemini_flash_selected,
     is_pixels_selected,
@@ -18,12 +23,45 @@ from utils.image_provider import (
     is_comfyui_selected
 )
 from utils.get_env import (
+    get_app_data_directory_env,
+    get_image_cache_max_size_mb_env,
     get_pexels_api_key_env,
     get_pixabay_api_key_env,
     get_openai_api_key_env,
-    get_google_api_key_env
+    get_google_api_key_env,
+    get_stock_image_cache_ttl_env,
 )
 
+PLACEHOLDER_IMAGE_URL = "/static/images/placeholder.jpg"
+OPENAI_IMAGE_SIZE = "1024x1024"
+
+DEFAULT_IMAGE_CACHE_MAX_SIZE_MB = 1024
+# Stock photo URLs can be taken down, so they are only reused for a while
+DEFAULT_STOCK_IMAGE_CACHE_TTL = 7 * 24 * 60 * 60
+
+_IMAGE_CACHE: Optional[DiskCacheService] = None
+
+
+def get_image_cache() -> Optional[DiskCacheService]:
+    global _IMAGE_CACHE
+    if not get_app_data_directory_env():
+        return None
+    if _IMAGE_CACHE is None:
+        _IMAGE_CACHE = DiskCacheService(
+            get_cache_directory("images"),
+            max_size_bytes=int(
+                get_image_cache_max_size_mb_env() or DEFAULT_IMAGE_CACHE_MAX_SIZE_MB
+            )
+            * 1024
+            * 1024,
+        )
+    return _IMAGE_CACHE
+
+
+def normalize_image_prompt(prompt: str) -> str:
+    return " ".join(prompt.lower().split())
+
+
 class ImageGenerationService:
     def __init__(self, output_directory: str):
         self.output_directory = output_directory
@@ -49,10 +87,86 @@ class ImageGenerationService:
 
     async def generate_image(self, image_prompt: ImagePrompt) -> Union[str, ImageAsset]:
         if self.image_gen_func:
-            return await self.image_gen_func(image_prompt.prompt, self.output_directory)
+            image_cache = get_image_cache()
+            if not image_cache:
+                return await self.image_gen_func(
+                    image_prompt.prompt, self.output_directory
+                )
+
+            cache_key = self.get_image_cache_key(image_prompt.prompt)
+            cached_image = await asyncio.to_thread(
+                self.get_cached_image, image_cache, cache_key, image_prompt.prompt
+            )
+            if cached_image:
+                return cached_image
+
+            image = await self.image_gen_func(image_prompt.prompt, self.output_directory)
+            await asyncio.to_thread(self.cache_image, image_cache, cache_key, image)
+            return image
         
         # Fallback or default
-        return "/static/images/placeholder.jpg"
+        return PLACEHOLDER_IMAGE_URL
+
+    def get_image_model_and_size(self) -> Tuple[Optional[str], Optional[str]]:
+        if self.image_gen_func == self.generate_image_openai:
+            return self.get_openai_image_model(), OPENAI_IMAGE_SIZE
+        if self.image_gen_func == self.get_image_from_pexels:
+            return None, "large"
+        if self.image_gen_func == self.get_image_from_pixabay:
+            return None, "largeImageURL"
+        return None, None
+
+    def get_image_cache_key(self, prompt: str) -> str:
+        provider = get_selected_image_provider()
+        model, size = self.get_image_model_and_size()
+        key = "|".join(
+            [
+                provider.value if provider else "",
+                model or "",
+                size or "",
+                normalize_image_prompt(prompt),
+            ]
+        )
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def get_cached_image(
+        self, image_cache: DiskCacheService, cache_key: str, prompt: str
+    ) -> Union[str, ImageAsset, None]:
+        entry = image_cache.get(cache_key)
+        if not entry:
+            return None
+        if entry.get("url"):
+            return entry["url"]
+
+        # Each slide gets its own copy so cache eviction never breaks a deck
+        extension = os.path.splitext(entry["path"])[1]
+        image_path = os.path.join(self.output_directory, f"{uuid.uuid4()}{extension}")
+        try:
+            link_or_copy_file(entry["path"], image_path)
+        except FileNotFoundError:
+            # Evicted since it was looked up
+            return None
+        return ImageAsset(path=image_path, extras={"prompt": prompt})
+
+    def cache_image(
+        self,
+        image_cache: DiskCacheService,
+        cache_key: str,
+        image: Union[str, ImageAsset],
+    ):
+        if isinstance(image, ImageAsset):
+            image_cache.set(cache_key, source_path=image.path)
+        elif image and image != PLACEHOLDER_IMAGE_URL:
+            image_cache.set(
+                cache_key,
+                {"url": image},
+                ttl_seconds=int(
+                    get_stock_image_cache_ttl_env() or DEFAULT_STOCK_IMAGE_CACHE_TTL
+                ),
+            )
+
+    def get_openai_image_model(self) -> str:
+        return "dall-e-3" if is_dalle3_selected() else "dall-e-2" # Simplified logic
 
     async def get_image_from_pexels(self, prompt: str, output_directory: str) -> str:
         api_key = get_pexels_api_key_env()
@@ -60,17 +174,17 @@ class ImageGenerationService:
             print("PEXELS_API_KEY not set")
             return "/static/images/placeholder.jpg"
             
-        async with aiohttp.ClientSession() as session:
-            headers = {"Authorization": api_key}
-            url = f"https://api.pexels.com/v1/search?query={prompt}&per_page=1"
-            try:
-                async with session.get(url, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get("photos"):
-                            return data["photos"][0]["src"]["large"]
-            except Exception as e:
-                print(f"Pexels error: {e}")
+        session = HTTP_CLIENT_SERVICE.get_session()
+        headers = {"Authorization": api_key}
+        url = f"https://api.pexels.com/v1/search?query={prompt}&per_page=1"
+        try:
+            async with session.get(url, headers=headers) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if data.get("photos"):
+                        return data["photos"][0]["src"]["large"]
+        except Exception as e:
+            print(f"Pexels error: {e}")
         return "/static/images/placeholder.jpg"
 
     async def get_image_from_pixabay(self, prompt: str, output_directory: str) -> str:
@@ -80,15 +194,15 @@ class ImageGenerationService:
             return "/static/images/placeholder.jpg"
 
         url = f"https://pixabay.com/api/?key={api_key}&q={prompt}&image_type=photo"
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get("hits"):
-                            return data["hits"][0]["largeImageURL"]
-            except Exception as e:
-                print(f"Pixabay error: {e}")
+        session = HTTP_CLIENT_SERVICE.get_session()
+        try:
+            async with session.get(url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if data.get("hits"):
+                        return data["hits"][0]["largeImageURL"]
+        except Exception as e:
+            print(f"Pixabay error: {e}")
         return "/static/images/placeholder.jpg"
 
     async def generate_image_openai(self, prompt: str, output_directory: str) -> ImageAsset:
@@ -98,14 +212,14 @@ class ImageGenerationService:
             
         client = AsyncOpenAI(api_key=api_key)
         
-        model = "dall-e-3" if is_dalle3_selected() else "dall-e-2" # Simplified logic
+        model = self.get_openai_image_model()
         
         try:
             response = await client.images.generate(
                 model=model,
                 prompt=prompt,
                 n=1,
-                size="1024x1024",
+                size=OPENAI_IMAGE_SIZE,
                 response_format="b64_json",
             )
             
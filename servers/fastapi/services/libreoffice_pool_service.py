@@ -0,0 +1,423 @@
+import asyncio
+import os
+import socket
+import uuid
+from typing import Dict, List, Optional
+
+from services.temp_file_service import TEMP_FILE_SERVICE
+from utils.get_env import (
+    get_libreoffice_conversion_timeout_env,
+    get_libreoffice_max_jobs_per_instance_env,
+    get_libreoffice_path_env,
+    get_libreoffice_pool_size_env,
+    get_libreoffice_python_env,
+)
+
+DEFAULT_LIBREOFFICE_POOL_SIZE = 2
+DEFAULT_LIBREOFFICE_MAX_JOBS_PER_INSTANCE = 50
+DEFAULT_LIBREOFFICE_CONVERSION_TIMEOUT = 500
+LIBREOFFICE_START_TIMEOUT = 60
+# Another process may take the free port before soffice binds it
+LIBREOFFICE_START_ATTEMPTS = 3
+LIBREOFFICE_HEALTH_CHECK_TIMEOUT = 2
+
+LIBREOFFICE_UNO_CLIENT_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "libreoffice_uno_client.py"
+)
+
+
+def write_font_alias_config(path: str, font_aliases: Dict[str, str]):
+    """
+    Writes a fontconfig file that resolves every key of font_aliases to its
+    value, e.g. variant family names to their root family. The file is
+    replaced atomically, as processes may be reading it.
+    """
+    temp_path = f"{path}.{uuid.uuid4()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as cfg:
+        cfg.write(
+            """<?xml version='1.0'?>
+<!DOCTYPE fontconfig SYSTEM "urn:fontconfig:fonts.dtd">
+<fontconfig>
+  <include>/etc/fonts/fonts.conf</include>
+"""
+        )
+        for src, dst in font_aliases.items():
+            cfg.write(
+                f"""
+  <match target="pattern">
+    <test name="family" compare="eq">
+      <string>{src}</string>
+    </test>
+    <edit name="family" mode="assign" binding="strong">
+      <string>{dst}</string>
+    </edit>
+  </match>
+"""
+            )
+        cfg.write("\n</fontconfig>\n")
+    os.replace(temp_path, path)
+
+
+def get_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def stop_process(process: Optional[asyncio.subprocess.Process]):
+    if process is None or process.returncode is not None:
+        return
+    process.terminate()
+    try:
+        await asyncio.wait_for(process.wait(), 10)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+
+
+class LibreOfficeInstance:
+    """
+    A headless soffice process with its own user profile, accepting UNO
+    connections on a local port.
+    """
+
+    def __init__(self, profile_directory: str):
+        self.profile_directory = profile_directory
+        self.port: Optional[int] = None
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.jobs = 0
+        self.font_generation = -1
+        self.font_aliases: Dict[str, str] = {}
+
+    def has_font_aliases(self, font_aliases: Dict[str, str]) -> bool:
+        return all(self.font_aliases.get(src) == dst for src, dst in font_aliases.items())
+
+    async def start(
+        self, env: dict, font_generation: int, font_aliases: Dict[str, str]
+    ):
+        for attempt in range(LIBREOFFICE_START_ATTEMPTS):
+            try:
+                await self._start_on_free_port(env)
+                break
+            except Exception:
+                if attempt == LIBREOFFICE_START_ATTEMPTS - 1:
+                    raise
+                print("LibreOffice instance failed to start, retrying on a new port")
+        self.jobs = 0
+        self.font_generation = font_generation
+        self.font_aliases = dict(font_aliases)
+
+    async def _start_on_free_port(self, env: dict):
+        self.port = get_free_port()
+        self.process = await asyncio.create_subprocess_exec(
+            get_libreoffice_path_env() or "libreoffice",
+            "--headless",
+            "--invisible",
+            "--nologo",
+            "--nodefault",
+            "--norestore",
+            "--nolockcheck",
+            f"-env:UserInstallation=file://{self.profile_directory}",
+            f"--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext",
+            env=env,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + LIBREOFFICE_START_TIMEOUT
+        while not await self.is_healthy():
+            if self.process.returncode is not None or loop.time() > deadline:
+                await self.stop()
+                raise Exception("LibreOffice instance failed to start")
+            await asyncio.sleep(0.2)
+
+    async def is_healthy(self) -> bool:
+        if self.process is None or self.process.returncode is not None:
+            return False
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection("127.0.0.1", self.port),
+                LIBREOFFICE_HEALTH_CHECK_TIMEOUT,
+            )
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        await writer.wait_closed()
+        return True
+
+    async def stop(self):
+        await stop_process(self.process)
+        self.process = None
+
+
+class LibreOfficePoolService:
+    """
+    Converts documents to PDF on a pool of long-lived headless LibreOffice
+    instances, so conversions skip the soffice cold start and run
+    concurrently up to LIBREOFFICE_POOL_SIZE.
+
+    Jobs are sent to an instance over UNO by libreoffice_uno_client.py, run
+    with LIBREOFFICE_PYTHON. Instances are health checked before every job,
+    restarted after LIBREOFFICE_MAX_JOBS_PER_INSTANCE jobs or a timeout, and
+    restarted when fonts are installed, since fontconfig is only read on
+    startup. Font aliases only restart the instance picked for a conversion
+    that needs aliases it did not load. If LIBREOFFICE_PYTHON cannot import
+    uno, every conversion runs a one-off `libreoffice --convert-to pdf`
+    process with its own aliases instead.
+    """
+
+    def __init__(self):
+        self._directory: Optional[str] = None
+        self._instances: List[LibreOfficeInstance] = []
+        self._idle_instances: Optional[asyncio.Queue] = None
+        self._uno_available: Optional[bool] = None
+
+        self._font_aliases: Dict[str, str] = {}
+        self._font_generation = 0
+
+        self._completed = 0
+        self._failed = 0
+        self._restarts = 0
+
+    @property
+    def pool_size(self) -> int:
+        return int(get_libreoffice_pool_size_env() or DEFAULT_LIBREOFFICE_POOL_SIZE)
+
+    @property
+    def max_jobs_per_instance(self) -> int:
+        return int(
+            get_libreoffice_max_jobs_per_instance_env()
+            or DEFAULT_LIBREOFFICE_MAX_JOBS_PER_INSTANCE
+        )
+
+    @property
+    def timeout(self) -> int:
+        return int(
+            get_libreoffice_conversion_timeout_env()
+            or DEFAULT_LIBREOFFICE_CONVERSION_TIMEOUT
+        )
+
+    @property
+    def fonts_conf_path(self) -> str:
+        return os.path.join(self._get_directory(), "fonts.conf")
+
+    def _get_directory(self) -> str:
+        if self._directory is None:
+            self._directory = TEMP_FILE_SERVICE.create_temp_dir("libreoffice")
+            write_font_alias_config(self.fonts_conf_path, self._font_aliases)
+        return self._directory
+
+    def _get_env(self, fonts_conf_path: Optional[str] = None) -> dict:
+        env = os.environ.copy()
+        env["FONTCONFIG_FILE"] = fonts_conf_path or self.fonts_conf_path
+        return env
+
+    def _get_idle_instances(self) -> asyncio.Queue:
+        if self._idle_instances is None:
+            self._idle_instances = asyncio.Queue()
+            for index in range(self.pool_size):
+                instance = LibreOfficeInstance(
+                    os.path.join(self._get_directory(), f"profile_{index}")
+                )
+                self._instances.append(instance)
+                self._idle_instances.put_nowait(instance)
+        return self._idle_instances
+
+    async def _is_uno_available(self) -> bool:
+        if self._uno_available is None:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    get_libreoffice_python_env() or "python3",
+                    "-c",
+                    "import uno",
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+                self._uno_available = await process.wait() == 0
+            except OSError:
+                self._uno_available = False
+            if not self._uno_available:
+                print(
+                    "LibreOffice UNO bindings not found, converting with one-off processes"
+                )
+        return self._uno_available
+
+    def update_font_aliases(self, font_aliases: Dict[str, str]):
+        """
+        Adds font_aliases to the config instances load when they (re)start.
+        Running instances keep their aliases until a conversion needs new
+        ones.
+        """
+        new_font_aliases = {
+            src: dst
+            for src, dst in font_aliases.items()
+            if self._font_aliases.get(src) != dst
+        }
+        if not new_font_aliases:
+            return
+        self._font_aliases.update(new_font_aliases)
+        write_font_alias_config(self.fonts_conf_path, self._font_aliases)
+
+    def invalidate_fonts(self):
+        """
+        Restarts every instance before its next job, e.g. after fonts were
+        installed.
+        """
+        self._font_generation += 1
+
+    async def convert_to_pdf(
+        self,
+        input_path: str,
+        output_directory: str,
+        font_aliases: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """
+        Converts input_path to a PDF with the same name in output_directory
+        and returns its path.
+        """
+        self._get_directory()
+
+        output_path = os.path.join(
+            output_directory,
+            f"{os.path.splitext(os.path.basename(input_path))[0]}.pdf",
+        )
+        try:
+            if await self._is_uno_available():
+                await self._convert_on_instance(
+                    input_path, output_path, font_aliases or {}
+                )
+            else:
+                await self._convert_once(
+                    input_path, output_directory, font_aliases or {}
+                )
+        except Exception:
+            self._failed += 1
+            raise
+
+        if not os.path.exists(output_path):
+            self._failed += 1
+            raise Exception("LibreOffice failed to generate PDF file")
+        self._completed += 1
+        return output_path
+
+    async def _prepare_instance(
+        self, instance: LibreOfficeInstance, font_aliases: Dict[str, str]
+    ):
+        if (
+            instance.jobs < self.max_jobs_per_instance
+            and instance.font_generation == self._font_generation
+            and instance.has_font_aliases(font_aliases)
+            and await instance.is_healthy()
+        ):
+            return
+        if instance.process is not None:
+            self._restarts += 1
+        await instance.stop()
+        await instance.start(
+            self._get_env(), self._font_generation, self._font_aliases
+        )
+
+    async def _convert_on_instance(
+        self, input_path: str, output_path: str, font_aliases: Dict[str, str]
+    ):
+        self.update_font_aliases(font_aliases)
+        idle_instances = self._get_idle_instances()
+        instance: LibreOfficeInstance = await idle_instances.get()
+        try:
+            await self._prepare_instance(instance, font_aliases)
+            process = await asyncio.create_subprocess_exec(
+                get_libreoffice_python_env() or "python3",
+                LIBREOFFICE_UNO_CLIENT_PATH,
+                str(instance.port),
+                input_path,
+                output_path,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                _, stderr = await asyncio.wait_for(process.communicate(), self.timeout)
+            except asyncio.TimeoutError:
+                await stop_process(process)
+                # The instance may be stuck on the document
+                await instance.stop()
+                raise Exception(
+                    f"LibreOffice PDF conversion timed out after {self.timeout} seconds"
+                )
+            instance.jobs += 1
+            if process.returncode != 0:
+                raise Exception(
+                    f"LibreOffice PDF conversion failed: {stderr.decode(errors='ignore')}"
+                )
+        finally:
+            idle_instances.put_nowait(instance)
+
+    async def _convert_once(
+        self,
+        input_path: str,
+        output_directory: str,
+        font_aliases: Dict[str, str],
+    ):
+        fonts_conf_path = os.path.join(
+            self._get_directory(), f"fonts_{uuid.uuid4()}.conf"
+        )
+        write_font_alias_config(fonts_conf_path, font_aliases)
+        try:
+            await self._run_convert_once(input_path, output_directory, fonts_conf_path)
+        finally:
+            os.remove(fonts_conf_path)
+
+    async def _run_convert_once(
+        self, input_path: str, output_directory: str, fonts_conf_path: str
+    ):
+        process = await asyncio.create_subprocess_exec(
+            get_libreoffice_path_env() or "libreoffice",
+            "--headless",
+            "--convert-to",
+            "pdf",
+            "--outdir",
+            output_directory,
+            input_path,
+            env=self._get_env(fonts_conf_path),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                process.communicate(), self.timeout
+            )
+        except asyncio.TimeoutError:
+            await stop_process(process)
+            raise Exception(
+                f"LibreOffice PDF conversion timed out after {self.timeout} seconds"
+            )
+        print(f"LibreOffice PDF conversion output: {stdout.decode(errors='ignore')}")
+        if process.returncode != 0:
+            raise Exception(
+                f"LibreOffice PDF conversion failed: {stderr.decode(errors='ignore')}"
+            )
+
+    def get_stats(self) -> dict:
+        return {
+            "pool_size": self.pool_size,
+            "uno_available": self._uno_available,
+            "running_instances": sum(
+                1
+                for instance in self._instances
+                if instance.process is not None
+                and instance.process.returncode is None
+            ),
+            "idle_instances": (
+                self._idle_instances.qsize() if self._idle_instances else None
+            ),
+            "completed": self._completed,
+            "failed": self._failed,
+            "restarts": self._restarts,
+        }
+
+    async def close(self):
+        for instance in self._instances:
+            await instance.stop()
+
+
+LIBREOFFICE_POOL_SERVICE = LibreOfficePoolService()
@@ -0,0 +1,53 @@
+"""
+Converts a document to PDF through a running headless LibreOffice instance.
+
+This file is not imported by the app. LibreOfficePoolService runs it with a
+Python interpreter that has the LibreOffice `uno` module (LIBREOFFICE_PYTHON):
+
+    python3 libreoffice_uno_client.py <port> <input_path> <output_path>
+"""
+
+import sys
+
+import uno
+from com.sun.star.beans import PropertyValue
+
+
+def make_property(name, value):
+    property_value = PropertyValue()
+    property_value.Name = name
+    property_value.Value = value
+    return property_value
+
+
+def convert_to_pdf(port: int, input_path: str, output_path: str):
+    local_context = uno.getComponentContext()
+    resolver = local_context.ServiceManager.createInstanceWithContext(
+        "com.sun.star.bridge.UnoUrlResolver", local_context
+    )
+    context = resolver.resolve(
+        f"uno:socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext"
+    )
+    desktop = context.ServiceManager.createInstanceWithContext(
+        "com.sun.star.frame.Desktop", context
+    )
+
+    document = desktop.loadComponentFromURL(
+        uno.systemPathToFileUrl(input_path),
+        "_blank",
+        0,
+        (make_property("Hidden", True), make_property("ReadOnly", True)),
+    )
+    if document is None:
+        raise RuntimeError(f"LibreOffice could not open {input_path}")
+    try:
+        document.storeToURL(
+            uno.systemPathToFileUrl(output_path),
+            (make_property("FilterName", "impress_pdf_Export"),),
+        )
+    finally:
+        document.close(True)
+
+
+if __name__ == "__main__":
+    convert_to_pdf(int(sys.argv[1]), sys.argv[2], sys.argv[3])
@@ -1,9 +1,12 @@
 import asyncio
+import importlib.util
 import dirtyjson
 import json
-from typing import AsyncGenerator, List, Optional
+import weakref
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Set, Tuple
+import httpx
 from fastapi import HTTPException
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient as OpenAIDefaultAsyncHttpxClient
 from openai.types.chat.chat_completion_chunk import (
     ChatCompletionChunk as OpenAIChatCompletionChunk,
 )
@@ -18,6 +21,7 @@ from google.genai.types import (
 )
 from google.genai.types import Tool as GoogleTool
 from anthropic import AsyncAnthropic
+from anthropic import DefaultAsyncHttpxClient as AnthropicDefaultAsyncHttpxClient
 from anthropic.types import Message as AnthropicMessage
 from anthropic import MessageStreamEvent as AnthropicMessageStreamEvent
 from enums.llm_provider import LLMProvider
@@ -50,6 +54,7 @@ from utils.get_env import (
     get_google_api_key_env,
     get_ollama_url_env,
     get_openai_api_key_env,
+    get_openai_base_url_env,
     get_tool_calls_env,
     get_web_grounding_env,
 )
@@ -62,6 +67,169 @@ from utils.schema_utils import (
 )
 
 
+LLMClientKey = Tuple[LLMProvider, Optional[str], Optional[str]]
+
+# Keep-alive pool shared by every request made through one cached client
+LLM_HTTP_MAX_CONNECTIONS = 100
+LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+LLM_HTTP_KEEPALIVE_EXPIRY = 60.0
+
+
+def _is_http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class LLMClientRegistry:
+    """
+    Process-wide cache of provider SDK clients.
+
+    Clients are keyed by provider, base URL and API key, so they are only rebuilt
+    when the user config middleware actually changes one of those env values.
+
+    Every owner that gets a client, e.g. an LLMClient, holds a reference to it
+    until the owner is garbage collected. A replaced client keeps its HTTP
+    connections open until its last owner is gone, so streaming calls that
+    are still running on it are not cut off.
+    """
+
+    def __init__(self):
+        self._clients: Dict[LLMProvider, Tuple[LLMClientKey, Any]] = {}
+        self._http_clients: Dict[LLMClientKey, httpx.AsyncClient] = {}
+        self._client_users: Dict[int, int] = {}
+        # Replaced clients that still have owners, by id
+        self._retired_clients: Dict[int, Tuple[Any, httpx.AsyncClient]] = {}
+        # Released without a running event loop, closed by aclose()
+        self._unclosed_http_clients: Set[httpx.AsyncClient] = set()
+        self._close_tasks: Set[asyncio.Task] = set()
+        self._lookups = 0
+        self._hits = 0
+        self._builds = 0
+
+    def get_client(
+        self,
+        key: LLMClientKey,
+        factory: Callable[[], Any],
+        owner: Optional[object] = None,
+    ):
+        self._lookups += 1
+        provider = key[0]
+        cached = self._clients.get(provider)
+        if cached and cached[0] == key:
+            self._hits += 1
+            client = cached[1]
+        else:
+            if cached:
+                self._retire_client(*cached)
+            client = factory()
+            self._builds += 1
+            self._clients[provider] = (key, client)
+
+        if owner is not None:
+            client_id = id(client)
+            self._client_users[client_id] = self._client_users.get(client_id, 0) + 1
+            weakref.finalize(owner, self._release_client, client_id)
+        return client
+
+    def _retire_client(self, key: LLMClientKey, client: Any):
+        http_client = self._http_clients.pop(key, None)
+        if http_client is None:
+            return
+        if self._client_users.get(id(client)):
+            self._retired_clients[id(client)] = (client, http_client)
+        else:
+            self._close_http_client(http_client)
+
+    def _release_client(self, client_id: int):
+        users = self._client_users.get(client_id, 0) - 1
+        if users > 0:
+            self._client_users[client_id] = users
+            return
+        self._client_users.pop(client_id, None)
+        retired = self._retired_clients.pop(client_id, None)
+        if retired:
+            self._close_http_client(retired[1])
+
+    def _close_http_client(self, http_client: httpx.AsyncClient):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._unclosed_http_clients.add(http_client)
+            return
+        task = loop.create_task(http_client.aclose())
+        self._close_tasks.add(task)
+        task.add_done_callback(self._close_tasks.discard)
+
+    def get_http_client(
+        self, key: LLMClientKey, factory: Callable[..., httpx.AsyncClient]
+    ) -> httpx.AsyncClient:
+        http_client = self._http_clients.get(key)
+        if http_client is None or http_client.is_closed:
+            http_client = factory(
+                limits=httpx.Limits(
+                    max_connections=LLM_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=LLM_HTTP_KEEPALIVE_EXPIRY,
+                ),
+                http2=_is_http2_available(),
+            )
+            self._http_clients[key] = http_client
+        return http_client
+
+    def _get_open_connections(self, http_client: httpx.AsyncClient) -> Optional[int]:
+        # httpx does not expose its pool, report nothing if its internals change
+        pool = getattr(getattr(http_client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        try:
+            return len(connections)
+        except TypeError:
+            return None
+
+    def get_stats(self) -> dict:
+        clients = []
+        for provider, (key, _) in self._clients.items():
+            http_client = self._http_clients.get(key)
+            clients.append(
+                {
+                    "provider": provider.value,
+                    "base_url": key[1],
+                    "open_connections": (
+                        self._get_open_connections(http_client)
+                        if http_client
+                        else None
+                    ),
+                }
+            )
+        return {
+            "lookups": self._lookups,
+            "hits": self._hits,
+            "builds": self._builds,
+            # Share of LLMClient instances that got an existing SDK client
+            "client_reuse_ratio": (
+                (self._hits / self._lookups) if self._lookups else 0.0
+            ),
+            "http2": _is_http2_available(),
+            "retired_clients": len(self._retired_clients),
+            "clients": clients,
+        }
+
+    async def aclose(self):
+        if self._close_tasks:
+            await asyncio.gather(*self._close_tasks, return_exceptions=True)
+        for http_client in [
+            *self._http_clients.values(),
+            *(http_client for _, http_client in self._retired_clients.values()),
+            *self._unclosed_http_clients,
+        ]:
+            await http_client.aclose()
+        self._http_clients.clear()
+        self._retired_clients.clear()
+        self._unclosed_http_clients.clear()
+        self._clients.clear()
+
+
+LLM_CLIENT_REGISTRY = LLMClientRegistry()
+
+
 class LLMClient:
     def __init__(self):
         self.llm_provider = get_llm_provider()
@@ -112,7 +280,16 @@ class LLMClient:
                 status_code=400,
                 detail="OpenAI API Key is not set",
             )
-        return AsyncOpenAI()
+        key = (LLMProvider.OPENAI, get_openai_base_url_env(), get_openai_api_key_env())
+        return LLM_CLIENT_REGISTRY.get_client(
+            key,
+            lambda: AsyncOpenAI(
+                http_client=LLM_CLIENT_REGISTRY.get_http_client(
+                    key, OpenAIDefaultAsyncHttpxClient
+                )
+            ),
+            self,
+        )
 
     def _get_google_client(self):
         if not get_google_api_key_env():
@@ -120,7 +297,8 @@ class LLMClient:
                 status_code=400,
                 detail="Google API Key is not set",
             )
-        return genai.Client()
+        key = (LLMProvider.GOOGLE, None, get_google_api_key_env())
+        return LLM_CLIENT_REGISTRY.get_client(key, lambda: genai.Client(), self)
 
     def _get_anthropic_client(self):
         if not get_anthropic_api_key_env():
@@ -128,12 +306,30 @@ class LLMClient:
                 status_code=400,
                 detail="Anthropic API Key is not set",
             )
-        return AsyncAnthropic()
+        key = (LLMProvider.ANTHROPIC, None, get_anthropic_api_key_env())
+        return LLM_CLIENT_REGISTRY.get_client(
+            key,
+            lambda: AsyncAnthropic(
+                http_client=LLM_CLIENT_REGISTRY.get_http_client(
+                    key, AnthropicDefaultAsyncHttpxClient
+                )
+            ),
+            self,
+        )
 
     def _get_ollama_client(self):
-        return AsyncOpenAI(
-            base_url=(get_ollama_url_env() or "http://localhost:11434") + "/v1",
-            api_key="ollama",
+        base_url = (get_ollama_url_env() or "http://localhost:11434") + "/v1"
+        key = (LLMProvider.OLLAMA, base_url, None)
+        return LLM_CLIENT_REGISTRY.get_client(
+            key,
+            lambda: AsyncOpenAI(
+                base_url=base_url,
+                api_key="ollama",
+                http_client=LLM_CLIENT_REGISTRY.get_http_client(
+                    key, OpenAIDefaultAsyncHttpxClient
+                ),
+            ),
+            self,
         )
 
     def _get_custom_client(self):
@@ -142,10 +338,22 @@ class LLMClient:
                 status_code=400,
                 detail="Custom LLM URL is not set",
             )
-        return AsyncOpenAI(
-            base_url=get_custom_llm_url_env(),
-            api_key=get_custom_llm_api_key_env() or "null",
-            timeout=90.0,
+        key = (
+            LLMProvider.CUSTOM,
+            get_custom_llm_url_env(),
+            get_custom_llm_api_key_env(),
+        )
+        return LLM_CLIENT_REGISTRY.get_client(
+            key,
+            lambda: AsyncOpenAI(
+                base_url=get_custom_llm_url_env(),
+                api_key=get_custom_llm_api_key_env() or "null",
+                timeout=90.0,
+                http_client=LLM_CLIENT_REGISTRY.get_http_client(
+                    key, OpenAIDefaultAsyncHttpxClient
+                ),
+            ),
+            self,
         )
 
     # ? Prompts
@@ -0,0 +1,218 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import math
+import multiprocessing
+import os
+from typing import AsyncIterator, List, Optional, Tuple
+
+import pdfplumber
+
+from utils.get_env import get_pdf_raster_workers_env
+
+DEFAULT_PDF_RASTER_WORKERS = 2
+DEFAULT_PDF_PAGE_DPI = 150
+MIN_PAGES_PER_SHARD = 4
+MAX_PAGES_PER_SHARD = 16
+PDF_PAGE_IMAGE_FORMATS = {"png": "PNG", "jpeg": "JPEG"}
+PDF_PAGE_JPEG_QUALITY = 85
+
+
+def get_pdf_page_count(file_path: str) -> int:
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def get_page_image_path(output_dir: str, page_number: int, image_format: str) -> str:
+    extension = "jpg" if image_format == "jpeg" else image_format
+    return os.path.join(output_dir, f"page_{page_number}.{extension}")
+
+
+def render_pdf_pages(
+    file_path: str,
+    output_dir: str,
+    first_page: int,
+    last_page: int,
+    dpi: int = DEFAULT_PDF_PAGE_DPI,
+    image_format: str = "png",
+) -> List[str]:
+    """
+    Renders pages first_page to last_page (1-based, inclusive) and saves
+    each page as soon as it is rendered. Runs in a rasterizer worker.
+    """
+    image_paths = []
+    with pdfplumber.open(file_path) as pdf:
+        for page in pdf.pages[first_page - 1 : last_page]:
+            img = page.to_image(resolution=dpi)
+            image_path = get_page_image_path(
+                output_dir, page.page_number, image_format
+            )
+            if image_format == "jpeg":
+                img.save(
+                    image_path,
+                    format="JPEG",
+                    quantize=False,
+                    quality=PDF_PAGE_JPEG_QUALITY,
+                )
+            else:
+                img.save(image_path)
+            image_paths.append(image_path)
+            # Release the page's parsed objects, long PDFs otherwise keep
+            # every page in memory until the file is closed
+            page.close()
+    return image_paths
+
+
+def get_page_ranges(page_count: int, workers: int) -> List[Tuple[int, int]]:
+    """
+    Splits pages into contiguous ranges, several per worker so finished
+    pages become available early and slow ranges do not stall a worker.
+    """
+    pages_per_shard = math.ceil(page_count / (workers * 4)) if page_count else 1
+    pages_per_shard = max(MIN_PAGES_PER_SHARD, min(MAX_PAGES_PER_SHARD, pages_per_shard))
+    return [
+        (first_page, min(first_page + pages_per_shard - 1, page_count))
+        for first_page in range(1, page_count + 1, pages_per_shard)
+    ]
+
+
+class PdfRasterizerService:
+    """
+    Renders PDF pages to images on a process pool, one page range per task.
+
+    Page images are written to disk by the workers as soon as they are
+    rendered, and iterate_page_images yields them in page order as their
+    ranges finish. If a worker dies the pool is replaced and the remaining
+    ranges are rendered again once.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._rendered_pages = 0
+        self._restarts = 0
+
+    @property
+    def workers(self) -> int:
+        return int(get_pdf_raster_workers_env() or DEFAULT_PDF_RASTER_WORKERS)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _reset_executor(self, executor: ProcessPoolExecutor):
+        # A broken pool fails every job, the next one creates a new pool
+        if self._executor is executor:
+            self._executor = None
+            self._restarts += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def iterate_page_images(
+        self,
+        file_path: str,
+        output_dir: str,
+        dpi: int = DEFAULT_PDF_PAGE_DPI,
+        image_format: str = "png",
+    ) -> AsyncIterator[str]:
+        if image_format not in PDF_PAGE_IMAGE_FORMATS:
+            raise ValueError(f"Unsupported page image format: {image_format}")
+
+        page_count = await asyncio.to_thread(get_pdf_page_count, file_path)
+        page_ranges = get_page_ranges(page_count, self.workers)
+
+        loop = asyncio.get_running_loop()
+        if len(page_ranges) == 1:
+            # Not worth the round trip to a worker
+            futures = [
+                asyncio.ensure_future(
+                    asyncio.to_thread(
+                        render_pdf_pages,
+                        file_path,
+                        output_dir,
+                        *page_ranges[0],
+                        dpi,
+                        image_format,
+                    )
+                )
+            ]
+        else:
+            executor = self._get_executor()
+            futures = [
+                loop.run_in_executor(
+                    executor,
+                    render_pdf_pages,
+                    file_path,
+                    output_dir,
+                    first_page,
+                    last_page,
+                    dpi,
+                    image_format,
+                )
+                for first_page, last_page in page_ranges
+            ]
+
+        try:
+            index = 0
+            retried = False
+            while index < len(futures):
+                try:
+                    image_paths = await futures[index]
+                except BrokenProcessPool:
+                    self._reset_executor(executor)
+                    if retried:
+                        raise
+                    retried = True
+                    executor = self._get_executor()
+                    futures[index:] = [
+                        loop.run_in_executor(
+                            executor,
+                            render_pdf_pages,
+                            file_path,
+                            output_dir,
+                            first_page,
+                            last_page,
+                            dpi,
+                            image_format,
+                        )
+                        for first_page, last_page in page_ranges[index:]
+                    ]
+                    continue
+                for image_path in image_paths:
+                    self._rendered_pages += 1
+                    yield image_path
+                index += 1
+        finally:
+            for future in futures:
+                future.cancel()
+
+    async def get_page_images(
+        self,
+        file_path: str,
+        output_dir: str,
+        dpi: int = DEFAULT_PDF_PAGE_DPI,
+        image_format: str = "png",
+    ) -> List[str]:
+        return [
+            image_path
+            async for image_path in self.iterate_page_images(
+                file_path, output_dir, dpi, image_format
+            )
+        ]
+
+    def get_stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "rendered_pages": self._rendered_pages,
+            "restarts": self._restarts,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+PDF_RASTERIZER_SERVICE = PdfRasterizerService()
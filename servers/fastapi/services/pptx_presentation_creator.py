@@ -1,5 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
 import os
-from typing import List, Optional
+import tempfile
+from typing import Dict, List, Optional, Tuple
 from lxml import etree
 from services.html_to_text_runs_service import (
     parse_html_text_to_text_runs as parse_inline_html_to_runs,
@@ -10,6 +14,7 @@ from pptx.shapes.autoshape import Shape
 from pptx.slide import Slide
 from pptx.text.text import _Paragraph, TextFrame, Font, _Run
 from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.constants import NAMESPACE
 from lxml.etree import fromstring, tostring
 from PIL import Image
 from pptx.oxml.xmlchemy import OxmlElement
@@ -34,7 +39,14 @@ from models.pptx_models import (
     PptxTextBoxModel,
     PptxTextRunModel,
 )
+from services.disk_cache_service import DiskCacheService, link_or_copy_file
+from utils.asset_directory_utils import get_cache_directory
 from utils.download_helpers import download_files
+from utils.get_env import (
+    get_app_data_directory_env,
+    get_picture_cache_max_size_mb_env,
+    get_slide_cache_max_size_mb_env,
+)
 from utils.image_utils import (
     clip_image,
     create_circle_image,
@@ -47,10 +59,93 @@ import uuid
 
 BLANK_SLIDE_LAYOUT = 6
 
+DEFAULT_PICTURE_CACHE_MAX_SIZE_MB = 512
+
+# Slide coordinates are in points, 72 per inch
+POINTS_PER_INCH = 72
+PICTURE_JPEG_QUALITY = 85
+# Pillow releases the GIL while resampling and encoding
+PICTURE_PROCESSING_THREADS = min(4, os.cpu_count() or 1)
+
+DEFAULT_SLIDE_CACHE_MAX_SIZE_MB = 512
+# Relationship attributes that point slide XML at its images
+RELATIONSHIP_ID_ATTRIBUTES = [
+    f"{{{NAMESPACE.OFC_RELATIONSHIPS}}}{name}" for name in ("embed", "link", "id")
+]
+
+_PICTURE_CACHE: Optional[DiskCacheService] = None
+_SLIDE_CACHE: Optional[DiskCacheService] = None
+_SLIDE_MEDIA_CACHE: Optional[DiskCacheService] = None
+
+
+def get_picture_cache() -> Optional[DiskCacheService]:
+    global _PICTURE_CACHE
+    if not get_app_data_directory_env():
+        return None
+    if _PICTURE_CACHE is None:
+        _PICTURE_CACHE = DiskCacheService(
+            get_cache_directory("pictures"),
+            max_size_bytes=int(
+                get_picture_cache_max_size_mb_env() or DEFAULT_PICTURE_CACHE_MAX_SIZE_MB
+            )
+            * 1024
+            * 1024,
+        )
+    return _PICTURE_CACHE
+
+
+def get_slide_caches() -> Optional[Tuple[DiskCacheService, DiskCacheService]]:
+    """
+    Returns the rendered slide XML cache and the cache of images those
+    slides reference, keyed by image sha1.
+    """
+    global _SLIDE_CACHE, _SLIDE_MEDIA_CACHE
+    if not get_app_data_directory_env():
+        return None
+    if _SLIDE_CACHE is None:
+        max_size_bytes = (
+            int(get_slide_cache_max_size_mb_env() or DEFAULT_SLIDE_CACHE_MAX_SIZE_MB)
+            * 1024
+            * 1024
+        )
+        _SLIDE_CACHE = DiskCacheService(
+            get_cache_directory("slides"), max_size_bytes=max_size_bytes // 4
+        )
+        _SLIDE_MEDIA_CACHE = DiskCacheService(
+            get_cache_directory("slide-media"),
+            max_size_bytes=max_size_bytes - max_size_bytes // 4,
+        )
+    return _SLIDE_CACHE, _SLIDE_MEDIA_CACHE
+
+
+def get_file_hash(path: str) -> str:
+    file_hash = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
 
 class PptxPresentationCreator:
-    def __init__(self, ppt_model: PptxPresentationModel, temp_dir: str):
+    def __init__(
+        self,
+        ppt_model: PptxPresentationModel,
+        temp_dir: str,
+        image_dpi: Optional[int] = None,
+        incremental: bool = False,
+        slide_cache_keys: Optional[List[str]] = None,
+        cached_slides: Optional[Dict[int, dict]] = None,
+    ):
         self._temp_dir = temp_dir
+        # If set, pictures are resampled to this DPI of their rendered size
+        # and opaque ones are recompressed as JPEG
+        self._image_dpi = image_dpi
+        # If set, unchanged slides are restored from the slide cache
+        self._incremental = incremental
+        # Looked up before network assets are fetched, so the assets of
+        # restored slides are not downloaded. Passed on to export workers.
+        self.slide_cache_keys = slide_cache_keys
+        self.cached_slides = cached_slides
 
         self._ppt_model = ppt_model
         self._slide_models = ppt_model.slides
@@ -59,6 +154,10 @@ class PptxPresentationCreator:
         self._ppt.slide_width = Pt(1280)
         self._ppt.slide_height = Pt(720)
 
+        # Processed picture paths by transform cache key, for this export
+        self._processed_pictures: Dict[str, str] = {}
+        self._file_hashes: Dict[str, str] = {}
+
     def get_sub_element(self, parent, tagname, **kwargs):
         """Helper method to create XML elements"""
         element = OxmlElement(tagname)
@@ -66,7 +165,22 @@ class PptxPresentationCreator:
         parent.append(element)
         return element
 
+    def load_cached_slides(self):
+        if self.slide_cache_keys is not None:
+            return
+        self.slide_cache_keys = (
+            [self.get_slide_cache_key(each) for each in self._slide_models]
+            if self._incremental
+            else []
+        )
+        self.cached_slides = self.get_cached_slides(self.slide_cache_keys)
+
     async def fetch_network_assets(self):
+        """
+        Downloads the network pictures of the model. In incremental mode the
+        slides restored from the slide cache are skipped.
+        """
+        self.load_cached_slides()
         image_urls = []
         models_with_network_asset: List[PptxPictureBoxModel] = []
 
@@ -85,7 +199,9 @@ class PptxPresentationCreator:
                         image_urls.append(image_path)
                         models_with_network_asset.append(each_shape)
 
-        for each_slide in self._slide_models:
+        for index, each_slide in enumerate(self._slide_models):
+            if index in self.cached_slides:
+                continue
             for each_shape in each_slide.shapes:
                 if isinstance(each_shape, PptxPictureBoxModel):
                     image_path = each_shape.picture.path
@@ -112,13 +228,153 @@ class PptxPresentationCreator:
 
     async def create_ppt(self):
         await self.fetch_network_assets()
+        self.build_slides()
+
+    def build_slides(self):
+        """
+        Builds every slide from the model. Network assets must already be
+        fetched; this is synchronous so it can run in an export worker.
+        """
+        self.load_cached_slides()
+        slide_cache_keys = self.slide_cache_keys
+        cached_slides = self.cached_slides
+        self.prepare_pictures(
+            [
+                slide_model
+                for index, slide_model in enumerate(self._slide_models)
+                if index not in cached_slides
+            ]
+        )
 
-        for slide_model in self._slide_models:
+        for index, slide_model in enumerate(self._slide_models):
             # Adding global shapes to slide
             if self._ppt_model.shapes:
                 slide_model.shapes.append(self._ppt_model.shapes)
 
-            self.add_and_populate_slide(slide_model)
+            if index in cached_slides:
+                self.restore_cached_slide(slide_model, cached_slides[index])
+                continue
+
+            slide = self.add_and_populate_slide(slide_model)
+            if self._incremental:
+                self.cache_slide(slide, slide_cache_keys[index])
+
+        if self._incremental:
+            print(
+                f"[EXPORT] Restored {len(cached_slides)}/{len(self._slide_models)} slides from cache"
+            )
+
+    def get_slide_cache_key(self, slide_model: PptxSlideModel) -> str:
+        """
+        Hash of the slide model, with local picture paths replaced by a hash
+        of the file so slides stay cached across changes of their path.
+        Network pictures are keyed by their url, as the key is computed
+        before they are downloaded.
+        """
+        slide_data = slide_model.model_dump(mode="json")
+        for shape_data, shape_model in zip(slide_data["shapes"], slide_model.shapes):
+            if not isinstance(shape_model, PptxPictureBoxModel):
+                continue
+            image_path = shape_model.picture.path
+            if os.path.isfile(image_path):
+                if image_path not in self._file_hashes:
+                    self._file_hashes[image_path] = get_file_hash(image_path)
+                shape_data["picture"]["path"] = self._file_hashes[image_path]
+
+        return hashlib.sha256(
+            json.dumps(
+                {"slide": slide_data, "image_dpi": self._image_dpi}, sort_keys=True
+            ).encode("utf-8")
+        ).hexdigest()
+
+    def get_cached_slides(self, slide_cache_keys: List[str]) -> Dict[int, dict]:
+        slide_caches = get_slide_caches()
+        if not slide_cache_keys or not slide_caches:
+            return {}
+        slide_cache, slide_media_cache = slide_caches
+
+        cached_slides = {}
+        for index, cache_key in enumerate(slide_cache_keys):
+            cached_slide = slide_cache.get(cache_key)
+            if not cached_slide:
+                continue
+            image_paths = {}
+            for image in cached_slide["images"]:
+                cached_image = slide_media_cache.get(image["sha1"])
+                if not cached_image:
+                    break
+                # Copied out, so eviction can not remove it before the slide
+                # is restored
+                image_path = os.path.join(
+                    self._temp_dir,
+                    f"{uuid.uuid4()}{os.path.splitext(cached_image['path'])[1]}",
+                )
+                try:
+                    link_or_copy_file(cached_image["path"], image_path)
+                except FileNotFoundError:
+                    break
+                image_paths[image["rId"]] = image_path
+            else:
+                cached_slides[index] = {**cached_slide, "image_paths": image_paths}
+        return cached_slides
+
+    def cache_slide(self, slide: Slide, cache_key: str):
+        """
+        Stores the slide XML and its images. Slides with relationships other
+        than images, the layout and notes are not cached.
+        """
+        slide_caches = get_slide_caches()
+        if not slide_caches:
+            return
+        slide_cache, slide_media_cache = slide_caches
+
+        images = []
+        for r_id, relationship in slide.part.rels.items():
+            if relationship.reltype in (RT.SLIDE_LAYOUT, RT.NOTES_SLIDE):
+                continue
+            if relationship.reltype != RT.IMAGE or relationship.is_external:
+                return
+            image_part = relationship.target_part
+            if not slide_media_cache.get(image_part.sha1):
+                with tempfile.NamedTemporaryFile(
+                    dir=self._temp_dir,
+                    suffix=f".{image_part.partname.ext}",
+                    delete=False,
+                ) as f:
+                    f.write(image_part.blob)
+                slide_media_cache.set(image_part.sha1, source_path=f.name)
+            images.append({"rId": r_id, "sha1": image_part.sha1})
+
+        slide_cache.set(
+            cache_key,
+            {
+                "xml": etree.tostring(slide._element, encoding="unicode"),
+                "images": images,
+            },
+        )
+
+    def restore_cached_slide(self, slide_model: PptxSlideModel, cached_slide: dict):
+        slide = self._ppt.slides.add_slide(self._ppt.slide_layouts[BLANK_SLIDE_LAYOUT])
+
+        # Images get new relationship ids in this package
+        r_ids = {}
+        for old_r_id, image_path in cached_slide["image_paths"].items():
+            _, r_ids[old_r_id] = slide.part.get_or_add_image_part(image_path)
+
+        cached_element = fromstring(cached_slide["xml"])
+        for element in cached_element.iter():
+            for attribute in RELATIONSHIP_ID_ATTRIBUTES:
+                if element.get(attribute) in r_ids:
+                    element.set(attribute, r_ids[element.get(attribute)])
+
+        slide_element = slide._element
+        for child in list(slide_element):
+            slide_element.remove(child)
+        slide_element.attrib.update(cached_element.attrib)
+        slide_element.extend(list(cached_element))
+
+        if slide_model.note:
+            slide.notes_slide.notes_text_frame.text = slide_model.note
 
     def set_presentation_theme(self):
         slide_master = self._ppt.slide_master
@@ -164,6 +420,8 @@ class PptxPresentationCreator:
             elif model_type is PptxConnectorModel:
                 self.add_connector(slide, shape_model)
 
+        return slide
+
     def add_connector(self, slide: Slide, connector_model: PptxConnectorModel):
         if connector_model.thickness == 0:
             return
@@ -174,49 +432,200 @@ class PptxPresentationCreator:
         connector_shape.line.color.rgb = RGBColor.from_string(connector_model.color)
         self.set_fill_opacity(connector_shape, connector_model.opacity)
 
-    def add_picture(self, slide: Slide, picture_model: PptxPictureBoxModel):
-        image_path = picture_model.picture.path
-        if (
-            picture_model.clip
+    def needs_picture_processing(self, picture_model: PptxPictureBoxModel) -> bool:
+        return bool(
+            self._image_dpi
+            or picture_model.clip
             or picture_model.border_radius
             or picture_model.invert
             or picture_model.opacity
             or picture_model.object_fit
             or picture_model.shape
+        )
+
+    def get_picture_cache_key(self, picture_model: PptxPictureBoxModel) -> str:
+        image_path = picture_model.picture.path
+        if image_path not in self._file_hashes:
+            self._file_hashes[image_path] = get_file_hash(image_path)
+
+        transform = {
+            "source": self._file_hashes[image_path],
+            "image_dpi": self._image_dpi,
+            "width": picture_model.position.width,
+            "height": picture_model.position.height,
+            "clip": picture_model.clip,
+            "opacity": picture_model.opacity,
+            "invert": picture_model.invert,
+            "border_radius": picture_model.border_radius,
+            "shape": picture_model.shape.value if picture_model.shape else None,
+            "object_fit": (
+                picture_model.object_fit.model_dump(mode="json")
+                if picture_model.object_fit
+                else None
+            ),
+        }
+        return hashlib.sha256(
+            json.dumps(transform, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+    def get_picture_scale(
+        self, image: Image.Image, picture_model: PptxPictureBoxModel
+    ) -> float:
+        """
+        Returns how many pixels to render per point of the picture box.
+        Without image_dpi pictures are rendered at one pixel per point. With
+        it, pictures are only ever downsampled, never upscaled past their
+        source resolution.
+        """
+        if (
+            not self._image_dpi
+            or picture_model.position.width <= 0
+            or picture_model.position.height <= 0
         ):
-            try:
-                image = Image.open(image_path)
-            except Exception:
-                print(f"Could not open image: {image_path}")
-                return
+            return 1.0
+        source_scale = min(
+            image.width / picture_model.position.width,
+            image.height / picture_model.position.height,
+        )
+        return min(self._image_dpi / POINTS_PER_INCH, source_scale)
+
+    def save_processed_picture(self, image: Image.Image, output_path: str) -> str:
+        """
+        Saves as PNG, or as JPEG when image_dpi is set and the picture has
+        no transparency. Returns the saved path.
+        """
+        if self._image_dpi and image.getchannel("A").getextrema()[0] == 255:
+            output_path = f"{os.path.splitext(output_path)[0]}.jpg"
+            image.convert("RGB").save(
+                output_path, "JPEG", quality=PICTURE_JPEG_QUALITY, optimize=True
+            )
+        else:
+            image.save(output_path, "PNG", optimize=bool(self._image_dpi))
+        return output_path
+
+    def process_picture(
+        self, picture_model: PptxPictureBoxModel, output_path: str
+    ) -> Optional[str]:
+        image_path = picture_model.picture.path
+        try:
+            image = Image.open(image_path)
+        except Exception:
+            print(f"Could not open image: {image_path}")
+            return None
+
+        image = image.convert("RGBA")
+        scale = self.get_picture_scale(image, picture_model)
+        width = max(1, round(picture_model.position.width * scale))
+        height = max(1, round(picture_model.position.height * scale))
+        border_radius = (
+            [round(radius * scale) for radius in picture_model.border_radius]
+            if picture_model.border_radius
+            else None
+        )
 
-            image = image.convert("RGBA")
-            # ? Applying border radius twice to support both clip and object fit
-            if picture_model.border_radius:
-                image = round_image_corners(image, picture_model.border_radius)
-            if picture_model.object_fit:
-                image = fit_image(
-                    image,
-                    picture_model.position.width,
-                    picture_model.position.height,
-                    picture_model.object_fit,
+        # ? Applying border radius twice to support both clip and object fit
+        if border_radius:
+            image = round_image_corners(image, border_radius)
+        if picture_model.object_fit:
+            image = fit_image(image, width, height, picture_model.object_fit)
+        elif picture_model.clip:
+            image = clip_image(image, width, height)
+        elif self._image_dpi:
+            # The picture is stretched to its box when added, so resampling to
+            # the box size renders the same
+            image = image.resize((width, height), Image.LANCZOS)
+        if border_radius:
+            image = round_image_corners(image, border_radius)
+        if picture_model.shape == PptxBoxShapeEnum.CIRCLE:
+            image = create_circle_image(image)
+        if picture_model.invert:
+            image = invert_image(image)
+        if picture_model.opacity:
+            image = set_image_opacity(image, picture_model.opacity)
+        return self.save_processed_picture(image, output_path)
+
+    def get_processed_picture_path(
+        self, picture_model: PptxPictureBoxModel
+    ) -> Optional[str]:
+        """
+        Returns the path of the transformed picture. Identical pictures are
+        processed once per export and reused across exports through the
+        picture cache, so python-pptx also embeds them only once.
+        """
+        try:
+            cache_key = self.get_picture_cache_key(picture_model)
+        except OSError:
+            print(f"Could not open image: {picture_model.picture.path}")
+            return None
+
+        if cache_key in self._processed_pictures:
+            return self._processed_pictures[cache_key]
+
+        output_path = os.path.join(self._temp_dir, str(uuid.uuid4()))
+        picture_cache = get_picture_cache()
+        cached_picture = picture_cache.get(cache_key) if picture_cache else None
+        if cached_picture:
+            try:
+                link_or_copy_file(
+                    cached_picture["path"], output_path + cached_picture["extension"]
                 )
-            elif picture_model.clip:
-                image = clip_image(
-                    image,
-                    picture_model.position.width,
-                    picture_model.position.height,
+            except FileNotFoundError:
+                # Evicted since it was looked up
+                cached_picture = None
+        if cached_picture:
+            output_path += cached_picture["extension"]
+        else:
+            output_path = self.process_picture(picture_model, f"{output_path}.png")
+            if not output_path:
+                return None
+            if picture_cache:
+                picture_cache.set(cache_key, source_path=output_path)
+
+        self._processed_pictures[cache_key] = output_path
+        return output_path
+
+    def prepare_pictures(self, slide_models: List[PptxSlideModel]):
+        """
+        Processes every distinct picture of the given slides on a thread pool
+        before the slides are built, so add_picture only picks up the results.
+        """
+        picture_models = [
+            each_shape
+            for each_shape in [
+                *(self._ppt_model.shapes or []),
+                *(
+                    each_shape
+                    for each_slide in slide_models
+                    for each_shape in each_slide.shapes
+                ),
+            ]
+            if isinstance(each_shape, PptxPictureBoxModel)
+            and self.needs_picture_processing(each_shape)
+        ]
+
+        unique_picture_models: Dict[str, PptxPictureBoxModel] = {}
+        for picture_model in picture_models:
+            try:
+                cache_key = self.get_picture_cache_key(picture_model)
+            except OSError:
+                continue
+            unique_picture_models.setdefault(cache_key, picture_model)
+
+        if len(unique_picture_models) < 2:
+            return
+        with ThreadPoolExecutor(max_workers=PICTURE_PROCESSING_THREADS) as executor:
+            list(
+                executor.map(
+                    self.get_processed_picture_path, unique_picture_models.values()
                 )
-            if picture_model.border_radius:
-                image = round_image_corners(image, picture_model.border_radius)
-            if picture_model.shape == PptxBoxShapeEnum.CIRCLE:
-                image = create_circle_image(image)
-            if picture_model.invert:
-                image = invert_image(image)
-            if picture_model.opacity:
-                image = set_image_opacity(image, picture_model.opacity)
-            image_path = os.path.join(self._temp_dir, f"{uuid.uuid4()}.png")
-            image.save(image_path)
+            )
+
+    def add_picture(self, slide: Slide, picture_model: PptxPictureBoxModel):
+        image_path = picture_model.picture.path
+        if self.needs_picture_processing(picture_model):
+            image_path = self.get_processed_picture_path(picture_model)
+            if not image_path:
+                return
 
         margined_position = self.get_margined_position(
             picture_model.position, picture_model.margin
@@ -1,21 +1,44 @@
 import asyncio
-from typing import List
+from collections import defaultdict, deque
+import math
+import re
+from typing import Deque, Dict, List, Optional, Tuple
 
 from models.document_chunk import DocumentChunk
 
+HEADING_LINE_PATTERN = re.compile(r"^[^\S\n]*(#[^\n]*)$", re.MULTILINE)
+CHARACTERS_PER_TOKEN = 4
+# Text before the first heading, usually the title and abstract, scores like
+# a first level 1 heading and wins the tie
+PREAMBLE_SCORE = 15.0
+
+# (heading, offset of the heading line, offset of the line after it)
+HeadingOffset = Tuple[str, int, int]
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARACTERS_PER_TOKEN)
+
+
+def format_chunk(chunk: DocumentChunk) -> str:
+    if not chunk.heading:
+        return chunk.content
+    return f"{chunk.heading}\n{chunk.content}"
+
 
 class ScoreBasedChunker:
 
+    def extract_heading_offsets(self, text: str) -> List[HeadingOffset]:
+        heading_offsets = []
+        for match in HEADING_LINE_PATTERN.finditer(text):
+            content_start = match.end() + 1
+            heading_offsets.append(
+                (match.group(1).strip(), match.start(), min(content_start, len(text)))
+            )
+        return heading_offsets
+
     def extract_headings(self, text: str) -> List[str]:
-        lines = text.split("\n")
-        headings = []
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith("#"):
-                headings.append(line)
-        
-        return headings
+        return [heading for heading, _, _ in self.extract_heading_offsets(text)]
 
     def score_headings(self, headings: List[str]) -> List[float]:
         heading_scores = []
@@ -24,9 +47,9 @@ class ScoreBasedChunker:
 
         for i, heading in enumerate(headings):
             score = 0.0
-            
+
             heading_level = len(heading) - len(heading.lstrip("#"))
-            
+
             if heading_level <= 3:
                 score += 10.0 - (heading_level - 1) * 2.0
             else:
@@ -46,17 +69,26 @@ class ScoreBasedChunker:
 
         return heading_scores
 
-    def get_chunks_from_headings(
-        self,
-        text: str,
-        headings: List[str],
-        heading_scores: List[float],
-        top_k: int = 10,
-    ) -> List[DocumentChunk]:
-        if not heading_scores:
-            heading_scores = self.score_headings(headings)
+    def get_heading_positions(
+        self, headings: List[str], heading_offsets: List[HeadingOffset]
+    ) -> Dict[int, Tuple[int, int]]:
+        """
+        Maps every heading index to the offsets of its line in the text. The
+        n-th line of a repeated heading belongs to the n-th index with that
+        heading.
+        """
+        unmatched_indices: Dict[str, Deque[int]] = defaultdict(deque)
+        for heading_idx, heading in enumerate(headings):
+            unmatched_indices[heading].append(heading_idx)
 
-        chunks = []
+        heading_positions = {}
+        for heading, line_start, content_start in heading_offsets:
+            indices = unmatched_indices.get(heading)
+            if indices:
+                heading_positions[indices.popleft()] = (line_start, content_start)
+        return heading_positions
+
+    def select_top_k(self, heading_scores: List[float], top_k: int) -> List[int]:
         heading_indices = []
 
         for i, score in enumerate(heading_scores):
@@ -64,7 +96,7 @@ class ScoreBasedChunker:
                 heading_indices.append((i, score))
 
         if len(heading_indices) == 0:
-            return chunks
+            return []
 
         heading_indices.sort(key=lambda x: (-x[1], x[0]))
 
@@ -111,53 +143,165 @@ class ScoreBasedChunker:
 
             selected_indices.sort()
 
-        lines = text.split("\n")
-        heading_positions = {}
-        
-        for i, line in enumerate(lines):
-            line_stripped = line.strip()
-            if line_stripped.startswith("#"):
-                for heading_idx, heading in enumerate(headings):
-                    if heading == line_stripped and heading_idx not in heading_positions:
-                        heading_positions[heading_idx] = i
-                        break
-        
+        return selected_indices
+
+    def get_chunks_from_headings(
+        self,
+        text: str,
+        headings: List[str],
+        heading_scores: List[float],
+        top_k: int = 10,
+        heading_offsets: Optional[List[HeadingOffset]] = None,
+    ) -> List[DocumentChunk]:
+        """
+        Returns the top_k best scored headings as chunks. A chunk's content
+        runs until the next selected heading, so it includes the sections of
+        the headings that were not selected.
+        """
+        if not heading_scores:
+            heading_scores = self.score_headings(headings)
+        if heading_offsets is None:
+            heading_offsets = self.extract_heading_offsets(text)
+
+        selected_indices = self.select_top_k(heading_scores, top_k)
+        heading_positions = self.get_heading_positions(headings, heading_offsets)
+        selected_indices = [idx for idx in selected_indices if idx in heading_positions]
+
+        chunks = []
         for i, heading_idx in enumerate(selected_indices):
-            if heading_idx not in heading_positions:
-                continue
-                
-            heading = headings[heading_idx]
-            heading_line_idx = heading_positions[heading_idx]
-            
+            _, content_start = heading_positions[heading_idx]
             if i + 1 < len(selected_indices):
-                next_heading_idx = selected_indices[i + 1]
-                if next_heading_idx in heading_positions:
-                    next_heading_line_idx = heading_positions[next_heading_idx]
-                    content_end = next_heading_line_idx
-                else:
-                    content_end = len(lines)
+                content_end = heading_positions[selected_indices[i + 1]][0]
             else:
-                content_end = len(lines)
+                content_end = len(text)
 
-            content_lines = lines[heading_line_idx + 1 : content_end]
-            content = "\n".join(content_lines).strip()
+            chunks.append(
+                DocumentChunk(
+                    heading=headings[heading_idx],
+                    content=text[content_start:content_end].strip(),
+                    heading_index=heading_idx,
+                    score=heading_scores[heading_idx],
+                )
+            )
 
-            chunk = DocumentChunk(
-                heading=heading,
-                content=content,
-                heading_index=heading_idx,
-                score=heading_scores[heading_idx],
+        return chunks
+
+    def get_chunks_within_token_budget(
+        self,
+        text: str,
+        token_budget: int,
+        headings: Optional[List[str]] = None,
+        heading_scores: Optional[List[float]] = None,
+        heading_offsets: Optional[List[HeadingOffset]] = None,
+    ) -> List[DocumentChunk]:
+        """
+        Fills token_budget with the best scored sections, skipping sections
+        that no longer fit. A section runs until the next heading, so each
+        chunk costs the same whichever other sections are selected. Text
+        before the first heading is a section without heading, with
+        heading_index -1. Chunks are returned in document order.
+        """
+        if heading_offsets is None:
+            heading_offsets = self.extract_heading_offsets(text)
+        if headings is None:
+            headings = [heading for heading, _, _ in heading_offsets]
+        if not heading_scores:
+            heading_scores = self.score_headings(headings)
+
+        heading_positions = self.get_heading_positions(headings, heading_offsets)
+        section_ends = {}
+        ordered_indices = sorted(heading_positions, key=lambda idx: heading_positions[idx])
+        for i, heading_idx in enumerate(ordered_indices):
+            section_ends[heading_idx] = (
+                heading_positions[ordered_indices[i + 1]][0]
+                if i + 1 < len(ordered_indices)
+                else len(text)
             )
-            chunks.append(chunk)
-            
+
+        candidates = sorted(
+            (idx for idx in heading_positions if heading_scores[idx] > 0),
+            key=lambda idx: (-heading_scores[idx], idx),
+        )
+
+        chunks = []
+        remaining_tokens = token_budget
+        preamble_end = min(
+            (line_start for line_start, _ in heading_positions.values()),
+            default=len(text),
+        )
+        preamble = text[:preamble_end].strip()
+        if preamble and estimate_tokens(preamble) <= remaining_tokens:
+            remaining_tokens -= estimate_tokens(preamble)
+            chunks.append(
+                DocumentChunk(
+                    heading="",
+                    content=preamble,
+                    heading_index=-1,
+                    score=PREAMBLE_SCORE,
+                )
+            )
+
+        for heading_idx in candidates:
+            _, content_start = heading_positions[heading_idx]
+            content = text[content_start : section_ends[heading_idx]].strip()
+            tokens = estimate_tokens(headings[heading_idx]) + estimate_tokens(content)
+            if tokens > remaining_tokens:
+                continue
+            remaining_tokens -= tokens
+            chunks.append(
+                DocumentChunk(
+                    heading=headings[heading_idx],
+                    content=content,
+                    heading_index=heading_idx,
+                    score=heading_scores[heading_idx],
+                )
+            )
+
+        chunks.sort(key=lambda chunk: chunk.heading_index)
         return chunks
 
-    async def get_n_chunks(self, text: str, n: int) -> List[DocumentChunk]:
-        headings = await asyncio.to_thread(self.extract_headings, text)
-        heading_scores = await asyncio.to_thread(self.score_headings, headings)
-        chunks = await asyncio.to_thread(
-            self.get_chunks_from_headings, text, headings, heading_scores, n
+    def get_context_within_token_budget(self, text: str, token_budget: int) -> str:
+        """
+        Returns text if it fits token_budget, otherwise the best scored
+        sections that fit. If not even one section fits, the best one, or
+        text without headings, is cut to the budget.
+        """
+        if estimate_tokens(text) <= token_budget:
+            return text
+        chunks = self.get_chunks_within_token_budget(text, token_budget)
+        if not chunks:
+            # A section never costs more tokens than it has characters
+            best_chunk = min(
+                self.get_chunks_within_token_budget(text, len(text)),
+                key=lambda chunk: (-chunk.score, chunk.heading_index),
+                default=None,
+            )
+            if best_chunk is None:
+                return ""
+            return format_chunk(best_chunk)[: token_budget * CHARACTERS_PER_TOKEN]
+        return "\n\n".join(format_chunk(chunk) for chunk in chunks)
+
+    def _get_n_chunks(self, text: str, n: int) -> List[DocumentChunk]:
+        heading_offsets = self.extract_heading_offsets(text)
+        headings = [heading for heading, _, _ in heading_offsets]
+        return self.get_chunks_from_headings(
+            text, headings, self.score_headings(headings), n, heading_offsets
         )
+
+    async def get_n_chunks(self, text: str, n: int) -> List[DocumentChunk]:
+        chunks = await asyncio.to_thread(self._get_n_chunks, text, n)
         if len(chunks) < n:
             raise ValueError(f"Only {len(chunks)} chunks found, requested {n}")
         return chunks
+
+    async def get_chunks_for_token_budget(
+        self, text: str, token_budget: int
+    ) -> List[DocumentChunk]:
+        return await asyncio.to_thread(
+            self.get_chunks_within_token_budget, text, token_budget
+        )
+
+    async def get_context_for_token_budget(self, text: str, token_budget: int) -> str:
+        return await asyncio.to_thread(
+            self.get_context_within_token_budget, text, token_budget
+        )
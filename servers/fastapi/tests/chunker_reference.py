@@ -0,0 +1,91 @@
+"""
+The ScoreBasedChunker before headings were found in a single pass, which
+split the text into lines twice and matched every heading line against
+every heading. The tests compare the chunker with it.
+"""
+
+from typing import List
+
+from models.document_chunk import DocumentChunk
+from services.score_based_chunker import ScoreBasedChunker
+
+
+def legacy_extract_headings(text: str) -> List[str]:
+    lines = text.split("\n")
+    headings = []
+
+    for line in lines:
+        line = line.strip()
+        if line.startswith("#"):
+            headings.append(line)
+
+    return headings
+
+
+def legacy_get_chunks_from_headings(
+    text: str,
+    headings: List[str],
+    heading_scores: List[float],
+    top_k: int = 10,
+) -> List[DocumentChunk]:
+    selected_indices = ScoreBasedChunker().select_top_k(heading_scores, top_k)
+
+    chunks = []
+    lines = text.split("\n")
+    heading_positions = {}
+
+    for i, line in enumerate(lines):
+        line_stripped = line.strip()
+        if line_stripped.startswith("#"):
+            for heading_idx, heading in enumerate(headings):
+                if heading == line_stripped and heading_idx not in heading_positions:
+                    heading_positions[heading_idx] = i
+                    break
+
+    for i, heading_idx in enumerate(selected_indices):
+        if heading_idx not in heading_positions:
+            continue
+
+        heading = headings[heading_idx]
+        heading_line_idx = heading_positions[heading_idx]
+
+        if i + 1 < len(selected_indices):
+            next_heading_idx = selected_indices[i + 1]
+            if next_heading_idx in heading_positions:
+                content_end = heading_positions[next_heading_idx]
+            else:
+                content_end = len(lines)
+        else:
+            content_end = len(lines)
+
+        content = "\n".join(lines[heading_line_idx + 1 : content_end]).strip()
+        chunks.append(
+            DocumentChunk(
+                heading=heading,
+                content=content,
+                heading_index=heading_idx,
+                score=heading_scores[heading_idx],
+            )
+        )
+
+    return chunks
+
+
+def legacy_get_n_chunks(text: str, n: int) -> List[DocumentChunk]:
+    headings = legacy_extract_headings(text)
+    heading_scores = ScoreBasedChunker().score_headings(headings)
+    return legacy_get_chunks_from_headings(text, headings, heading_scores, n)
+
+
+def create_markdown(n_headings: int) -> str:
+    sections = []
+    for index in range(n_headings):
+        level = 1 + index % 4
+        # Repeated titles, as in documents with one "Summary" per chapter
+        title = f"Section {index}" if index % 5 else "Summary"
+        sections.append(
+            f"{'#' * level} {title}\n\n"
+            f"Paragraph {index} describes the results of section {index}.\n"
+            "It spans a couple of lines of body text.\n"
+        )
+    return "Document introduction.\n\n" + "\n".join(sections)
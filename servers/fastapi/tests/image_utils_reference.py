@@ -0,0 +1,106 @@
+"""
+The pure-PIL/per-pixel image transforms that utils/image_utils.py used
+before they were vectorized. The tests check that the vectorized
+transforms give the same pixels.
+"""
+
+from typing import List
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+
+def legacy_round_image_corners(image: Image.Image, radii: List[int]) -> Image.Image:
+    w, h = image.size
+    max_radius = min(w // 2, h // 2)
+    clamped_radii = [min(radius, max_radius) for radius in radii]
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+
+    rounded_mask = Image.new("L", image.size, 0)
+    rectangular_mask = Image.new("L", image.size, 255)
+    for i, radius in enumerate(clamped_radii):
+        if radius > 0:
+            circle = Image.new("L", (radius * 2, radius * 2), 0)
+            draw = ImageDraw.Draw(circle)
+            draw.ellipse((0, 0, radius * 2 - 1, radius * 2 - 1), fill=255)
+            if i == 0:
+                rounded_mask.paste(circle.crop((0, 0, radius, radius)), (0, 0))
+                rectangular_mask.paste(0, (0, 0, radius, radius))
+            elif i == 1:
+                rounded_mask.paste(
+                    circle.crop((radius, 0, radius * 2, radius)), (w - radius, 0)
+                )
+                rectangular_mask.paste(0, (w - radius, 0, w, radius))
+            elif i == 2:
+                rounded_mask.paste(
+                    circle.crop((radius, radius, radius * 2, radius * 2)),
+                    (w - radius, h - radius),
+                )
+                rectangular_mask.paste(0, (w - radius, h - radius, w, h))
+            else:
+                rounded_mask.paste(
+                    circle.crop((0, radius, radius, radius * 2)), (0, h - radius)
+                )
+                rectangular_mask.paste(0, (0, h - radius, radius, h))
+
+    original_alpha = image.getchannel("A")
+    corner_mask = Image.composite(rounded_mask, rectangular_mask, rounded_mask)
+    final_alpha = Image.composite(
+        original_alpha, Image.new("L", image.size, 0), corner_mask
+    )
+    result = Image.new("RGBA", image.size)
+    result.paste(image.convert("RGB"), (0, 0))
+    result.putalpha(final_alpha)
+    return result
+
+
+def legacy_invert_image(img: Image.Image) -> Image.Image:
+    new_data = []
+    for r, g, b, a in img.getdata():
+        if a != 0:
+            new_data.append((255 - r, 255 - g, 255 - b, a))
+        else:
+            new_data.append((0, 0, 0, 0))
+    new_img = Image.new("RGBA", img.size)
+    new_img.putdata(new_data)
+    return new_img
+
+
+def legacy_create_circle_image(image: Image.Image) -> Image.Image:
+    img = image.convert("RGBA")
+    size = img.size
+    mask = Image.new("RGBA", size, color=(0, 0, 0, 0))
+    draw = ImageDraw.Draw(mask)
+    center_x = size[0] // 2
+    center_y = size[1] // 2
+    radius = min(size) // 2
+    draw.ellipse(
+        (
+            center_x - radius,
+            center_y - radius,
+            center_x + radius,
+            center_y + radius,
+        ),
+        fill=(255, 255, 255, 255),
+    )
+    return Image.composite(img, mask, mask)
+
+
+def legacy_set_image_opacity(image: Image.Image, opacity: float) -> Image.Image:
+    opacity = max(0.0, min(1.0, opacity))
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+    new_alpha = image.getchannel("A").point(lambda x: int(x * opacity))
+    result = Image.new("RGBA", image.size)
+    result.paste(image.convert("RGB"), (0, 0))
+    result.putalpha(new_alpha)
+    return result
+
+
+def create_random_image(width: int, height: int) -> Image.Image:
+    rng = np.random.default_rng(0)
+    data = rng.integers(0, 256, size=(height, width, 4), dtype=np.uint8)
+    # Make some pixels fully transparent so invert_image takes both branches
+    data[::7, ::5, 3] = 0
+    return Image.fromarray(data, "RGBA")
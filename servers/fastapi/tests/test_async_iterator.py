@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from utils.async_iterator import bounded_as_completed
+
+
+def test_bounded_as_completed_limits_in_flight_calls():
+    in_flight = 0
+    max_in_flight = 0
+
+    async def worker(index: int, delay: float):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(delay)
+        in_flight -= 1
+        return index * 10
+
+    async def run():
+        delays = [0.05, 0.01, 0.03, 0.01, 0.02, 0.01]
+        return [
+            each async for each in bounded_as_completed(delays, worker, limit=3)
+        ]
+
+    results = asyncio.run(run())
+
+    assert max_in_flight == 3
+    assert sorted(results) == [(i, i * 10) for i in range(6)]
+    # The slow first item must not hold back the ones started after it
+    assert results[-1][0] == 0
+
+
+def test_bounded_as_completed_propagates_first_failure():
+    cancelled = []
+
+    async def worker(index: int, _):
+        if index == 0:
+            raise ValueError("failed")
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(index)
+            raise
+
+    async def run():
+        async for _ in bounded_as_completed(range(4), worker, limit=2):
+            pass
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+    assert cancelled == [1]
+
+
+def test_bounded_as_completed_waits_for_cancelled_calls():
+    finished = []
+
+    async def worker(index: int, _):
+        if index < 2:
+            raise ValueError(f"failed {index}")
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0)
+            finished.append(index)
+            raise
+
+    async def run():
+        with pytest.raises(ValueError):
+            async for _ in bounded_as_completed(range(3), worker, limit=3):
+                pass
+        # Nothing started by the generator outlives it
+        assert finished == [2]
+
+    asyncio.run(run())
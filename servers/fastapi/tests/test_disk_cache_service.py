@@ -0,0 +1,118 @@
+import os
+import time
+
+from services.disk_cache_service import DiskCacheService
+
+
+def test_disk_cache_stores_blobs_and_values(tmp_path):
+    cache = DiskCacheService(str(tmp_path / "cache"), max_size_bytes=1024 * 1024)
+    source = tmp_path / "image.png"
+    source.write_bytes(b"png")
+
+    blob_path = cache.set("blob", source_path=str(source))
+    cache.set("url", {"url": "https://example.com/image.jpg"})
+
+    assert cache.get("blob")["path"] == blob_path
+    assert open(blob_path, "rb").read() == b"png"
+    assert cache.get("url")["url"] == "https://example.com/image.jpg"
+    assert cache.get("missing") is None
+    assert cache.get_stats()["hits"] == 2
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_disk_cache_expires_entries_after_ttl(tmp_path):
+    cache = DiskCacheService(str(tmp_path), max_size_bytes=1024 * 1024)
+    metadata_path = os.path.join(str(tmp_path), "url.json")
+
+    cache.set("url", {"url": "https://example.com/image.jpg"}, ttl_seconds=-1)
+
+    assert cache.get("url") is None
+    assert not os.path.exists(metadata_path)
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskCacheService(str(tmp_path / "cache"), max_size_bytes=1024 * 1024)
+    for age, name in [(30, "first"), (20, "second"), (10, "third")]:
+        source = tmp_path / f"{name}.bin"
+        source.write_bytes(b"0" * 1000)
+        cache.set(name, source_path=str(source))
+        past = time.time() - age
+        os.utime(os.path.join(cache.directory, f"{name}.json"), (past, past))
+
+    cache.get("first")
+    cache.max_size_bytes = 2500
+    cache.evict()
+
+    assert cache.get("first") is not None
+    assert cache.get("second") is None
+    assert cache.get("third") is not None
+    assert cache.evictions >= 1
+
+
+def test_disk_cache_only_scans_directory_past_size_estimate(tmp_path, monkeypatch):
+    cache = DiskCacheService(str(tmp_path), max_size_bytes=1024 * 1024)
+    scans = 0
+    evict = cache.evict
+
+    def counting_evict():
+        nonlocal scans
+        scans += 1
+        evict()
+
+    monkeypatch.setattr(cache, "evict", counting_evict)
+    for index in range(5):
+        cache.set(f"url_{index}", {"url": f"https://example.com/{index}.jpg"})
+    assert scans == 1
+
+    cache.max_size_bytes = 1
+    cache.set("url_5", {"url": "https://example.com/5.jpg"})
+    assert scans == 2
+    assert cache.get("url_0") is None
+
+
+def test_disk_cache_ignores_entries_removed_concurrently(tmp_path):
+    cache = DiskCacheService(str(tmp_path), max_size_bytes=1024 * 1024)
+    source = tmp_path / "image.png"
+    source.write_bytes(b"png")
+    cache.set("blob", source_path=str(source))
+    metadata = {"extension": ".png"}
+
+    cache._remove_entry("blob", metadata)
+    # A second eviction of the same entry, e.g. from another process
+    cache._remove_entry("blob", metadata)
+
+    assert cache.get("blob") is None
+
+
+def test_disk_cache_frees_headroom_when_full(tmp_path, monkeypatch):
+    cache = DiskCacheService(str(tmp_path / "cache"), max_size_bytes=100_000)
+    scans = 0
+    evict = cache.evict
+
+    def counting_evict():
+        nonlocal scans
+        scans += 1
+        evict()
+
+    monkeypatch.setattr(cache, "evict", counting_evict)
+    source = tmp_path / "image.bin"
+    source.write_bytes(b"0" * 1000)
+    for index in range(300):
+        cache.set(f"blob_{index}", source_path=str(source))
+
+    # A full cache is not rescanned on every set
+    assert scans < 50
+    assert cache._estimated_size <= cache.max_size_bytes
+
+
+def test_disk_cache_get_misses_entry_evicted_while_read(tmp_path, monkeypatch):
+    cache = DiskCacheService(str(tmp_path), max_size_bytes=1024 * 1024)
+    cache.set("url", {"url": "https://example.com/image.jpg"})
+
+    def evicted_utime(path, times=None):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, "utime", evicted_utime)
+
+    assert cache.get("url") is None
+    assert cache.get_stats()["misses"] == 1
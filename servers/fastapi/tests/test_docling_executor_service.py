@@ -0,0 +1,58 @@
+import asyncio
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+import importlib.util
+
+from fastapi import HTTPException
+import pytest
+
+from services.docling_executor_service import DoclingExecutorService
+
+
+class BrokenExecutor:
+    def __init__(self):
+        self.is_shut_down = False
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_exception(BrokenProcessPool("A worker was killed"))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.is_shut_down = True
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("docling") is not None,
+    reason="Checks the error raised when docling can not be loaded",
+)
+def test_parse_to_markdown_replaces_broken_pool_and_reports_load_errors(tmp_path):
+    document_path = tmp_path / "report.docx"
+    document_path.write_bytes(b"document")
+    service = DoclingExecutorService()
+    broken_executor = BrokenExecutor()
+    service._executor = broken_executor
+
+    try:
+        # The worker survives its initializer and raises the load error
+        with pytest.raises(ModuleNotFoundError):
+            asyncio.run(service.parse_to_markdown(str(document_path)))
+    finally:
+        service.shutdown()
+
+    assert broken_executor.is_shut_down
+    assert service.get_stats()["restarts"] == 1
+    assert service.get_stats()["failed"] == 1
+
+
+def test_parse_to_markdown_fails_cleanly_when_pool_keeps_breaking(
+    tmp_path, monkeypatch
+):
+    service = DoclingExecutorService()
+    monkeypatch.setattr(service, "_get_executor", BrokenExecutor)
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(service.parse_to_markdown(str(tmp_path / "report.docx")))
+
+    assert exc_info.value.status_code == 500
+    assert service.get_stats()["in_flight"] == 0
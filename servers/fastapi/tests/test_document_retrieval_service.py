@@ -0,0 +1,139 @@
+import asyncio
+import uuid
+
+from services import document_retrieval_service
+from services.document_retrieval_service import (
+    DocumentRetrievalService,
+    chunk_document,
+    get_document_index_cache_key,
+)
+
+KEYWORDS = ["revenue", "hiring", "roadmap"]
+
+DOCUMENT = """Quarterly report for the board.
+
+# Revenue
+Revenue grew 20% to $4M.
+
+# Hiring
+We hired 12 engineers.
+
+## Roadmap
+The roadmap adds two products.
+"""
+
+
+def embed_keywords(texts):
+    return [[text.lower().count(keyword) + 0.01 for keyword in KEYWORDS] for text in texts]
+
+
+def test_chunk_document_keeps_preamble_and_splits_long_sections():
+    chunks = chunk_document(DOCUMENT)
+
+    assert [chunk.heading for chunk in chunks] == ["", "# Revenue", "# Hiring", "## Roadmap"]
+    assert chunks[0].content == "Quarterly report for the board."
+    assert chunks[1].content == "Revenue grew 20% to $4M."
+
+    long_chunks = chunk_document("# Notes\n" + "\n\n".join(["a" * 30] * 4), 70)
+    assert [chunk.content for chunk in long_chunks] == [
+        "a" * 30 + "\n\n" + "a" * 30,
+        "a" * 30 + "\n\n" + "a" * 30,
+    ]
+
+
+def test_get_slide_contexts_returns_relevant_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(document_retrieval_service, "_EMBEDDING_FUNCTION", embed_keywords)
+    monkeypatch.setenv("DOCUMENT_CONTEXT_TOP_K", "1")
+    monkeypatch.delenv("APP_DATA_DIRECTORY", raising=False)
+    document_path = tmp_path / "report.txt"
+    document_path.write_text(DOCUMENT)
+    service = DocumentRetrievalService()
+    presentation_id = uuid.uuid4()
+
+    async def run():
+        index = await service.get_index(presentation_id, [str(document_path)])
+        # Indexed documents are reused for the same files
+        assert await service.get_index(presentation_id, [str(document_path)]) is index
+        return await service.get_slide_contexts(
+            index, ["Hiring plan", "Revenue growth", "Product roadmap"]
+        )
+
+    contexts = asyncio.run(run())
+
+    assert contexts == [
+        "# Hiring\nWe hired 12 engineers.",
+        "# Revenue\nRevenue grew 20% to $4M.",
+        "## Roadmap\nThe roadmap adds two products.",
+    ]
+    assert service.get_stats()["indexed_chunks"] == 4
+    assert service.get_stats()["queries"] == 3
+
+
+def test_get_index_loads_persisted_index_without_parsing(tmp_path, monkeypatch):
+    monkeypatch.setattr(document_retrieval_service, "_EMBEDDING_FUNCTION", embed_keywords)
+    monkeypatch.setattr(document_retrieval_service, "_DOCUMENT_INDEX_CACHE", None)
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path / "app_data"))
+    document_path = tmp_path / "report.txt"
+    document_path.write_text(DOCUMENT)
+    presentation_id = uuid.uuid4()
+
+    index = asyncio.run(
+        DocumentRetrievalService().get_index(presentation_id, [str(document_path)])
+    )
+    # A restarted server finds the index on disk
+    service = DocumentRetrievalService()
+    cached_index = asyncio.run(
+        service.get_index(presentation_id, [str(document_path)])
+    )
+
+    assert cached_index.chunks == index.chunks
+    assert (cached_index.embeddings == index.embeddings).all()
+    assert service.get_stats()["indexed_chunks"] == 0
+
+    # A different file uploaded to the same path is indexed again
+    document_path.write_text(DOCUMENT.replace("12 engineers", "15 engineers"))
+    service = DocumentRetrievalService()
+    updated_index = asyncio.run(
+        service.get_index(presentation_id, [str(document_path)])
+    )
+
+    assert updated_index.chunks[2].content == "We hired 15 engineers."
+    assert service.get_stats()["indexed_chunks"] == 4
+
+
+def test_get_presentation_slide_contexts_falls_back_without_context(
+    tmp_path, monkeypatch
+):
+    def fail_to_embed(texts):
+        raise RuntimeError("Embedding model is not available")
+
+    monkeypatch.setattr(document_retrieval_service, "_EMBEDDING_FUNCTION", fail_to_embed)
+    monkeypatch.delenv("APP_DATA_DIRECTORY", raising=False)
+    document_path = tmp_path / "report.txt"
+    document_path.write_text(DOCUMENT)
+    service = DocumentRetrievalService()
+
+    contexts = asyncio.run(
+        service.get_presentation_slide_contexts(
+            uuid.uuid4(), [str(document_path)], ["Hiring plan", "Revenue growth"]
+        )
+    )
+
+    assert contexts == [None, None]
+    assert service.get_stats()["failures"] == 1
+
+
+def test_document_index_cache_key_includes_embedding_model(tmp_path, monkeypatch):
+    document_path = tmp_path / "report.txt"
+    document_path.write_text(DOCUMENT)
+    presentation_id = uuid.uuid4()
+
+    cache_key = get_document_index_cache_key(presentation_id, [str(document_path)])
+    monkeypatch.setattr(
+        document_retrieval_service, "DOCUMENT_EMBEDDING_MODEL", "all-mpnet-base-v2"
+    )
+
+    assert (
+        get_document_index_cache_key(presentation_id, [str(document_path)])
+        != cache_key
+    )
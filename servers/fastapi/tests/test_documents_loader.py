@@ -0,0 +1,171 @@
+import asyncio
+import os
+
+from fastapi import HTTPException
+from PIL import Image
+import pytest
+
+from services import documents_loader as documents_loader_module
+from services.docling_executor_service import DOCLING_EXECUTOR_SERVICE
+from services.documents_loader import DocumentsLoader
+
+
+def test_load_documents_parses_files_concurrently(tmp_path, monkeypatch):
+    file_paths = []
+    for name in ("a.docx", "b.pptx", "c.docx"):
+        file_path = tmp_path / name
+        file_path.write_bytes(b"document")
+        file_paths.append(str(file_path))
+    text_path = tmp_path / "notes.txt"
+    text_path.write_text("plain text")
+    file_paths.append(str(text_path))
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def parse_to_markdown(file_path, page_range=None):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # Finish in reverse order to check results keep the input order
+        await asyncio.sleep(0.01 * (3 - file_paths.index(file_path)))
+        in_flight -= 1
+        return f"# {file_path}"
+
+    monkeypatch.setattr(DOCLING_EXECUTOR_SERVICE, "parse_to_markdown", parse_to_markdown)
+
+    documents_loader = DocumentsLoader(file_paths=file_paths)
+    asyncio.run(documents_loader.load_documents())
+
+    assert max_in_flight == 3
+    assert documents_loader.documents == [
+        f"# {file_paths[0]}",
+        f"# {file_paths[1]}",
+        f"# {file_paths[2]}",
+        "plain text",
+    ]
+    assert documents_loader.images == [[], [], [], []]
+
+
+def test_load_documents_checks_every_file_before_parsing(tmp_path, monkeypatch):
+    existing_path = tmp_path / "a.docx"
+    existing_path.write_bytes(b"document")
+    parsed = []
+
+    async def parse_to_markdown(file_path, page_range=None):
+        parsed.append(file_path)
+        return ""
+
+    monkeypatch.setattr(DOCLING_EXECUTOR_SERVICE, "parse_to_markdown", parse_to_markdown)
+
+    documents_loader = DocumentsLoader(
+        file_paths=[str(existing_path), str(tmp_path / "missing.docx")]
+    )
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(documents_loader.load_documents())
+
+    assert exc_info.value.status_code == 404
+    assert parsed == []
+
+
+def test_parsed_documents_are_cached_by_content(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path / "app_data"))
+    monkeypatch.setattr(documents_loader_module, "_DOCUMENT_CACHE", None)
+    parsed = []
+
+    async def parse_to_markdown(file_path, page_range=None):
+        parsed.append(file_path)
+        with open(file_path, "rb") as f:
+            return f"# {f.read().decode()} é"
+
+    monkeypatch.setattr(DOCLING_EXECUTOR_SERVICE, "parse_to_markdown", parse_to_markdown)
+
+    first_path = tmp_path / "report.docx"
+    first_path.write_bytes(b"quarterly report")
+    # Same bytes under another name, e.g. a re-upload for /files/decompose
+    copy_path = tmp_path / "report-copy.pptx"
+    copy_path.write_bytes(b"quarterly report")
+
+    documents_loader = DocumentsLoader(file_paths=[str(first_path)])
+    asyncio.run(documents_loader.load_documents())
+    documents_loader = DocumentsLoader(file_paths=[str(first_path), str(copy_path)])
+    asyncio.run(documents_loader.load_documents())
+
+    assert parsed == [str(first_path)]
+    assert documents_loader.documents == [
+        "# quarterly report é",
+        "# quarterly report é",
+    ]
+
+    first_path.write_bytes(b"updated report")
+    documents_loader = DocumentsLoader(file_paths=[str(first_path)])
+    asyncio.run(documents_loader.load_documents())
+
+    assert parsed == [str(first_path), str(first_path)]
+    assert documents_loader.documents == ["# updated report é"]
+    assert documents_loader_module.get_document_cache().get_stats()["hits"] == 2
+
+
+def test_iterate_documents_streams_pdf_page_windows(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path / "app_data"))
+    monkeypatch.setattr(documents_loader_module, "_DOCUMENT_CACHE", None)
+    pdf_path = tmp_path / "manual.pdf"
+    pages = [Image.new("RGB", (100, 100), (i, i, i)) for i in range(25)]
+    pages[0].save(pdf_path, "PDF", save_all=True, append_images=pages[1:])
+    text_path = tmp_path / "notes.txt"
+    text_path.write_text("plain text")
+
+    parsed = []
+    in_flight = 0
+    max_in_flight = 0
+
+    async def parse_to_markdown(file_path, page_range=None):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        parsed.append(page_range)
+        return f"pages {page_range[0]}-{page_range[1]}"
+
+    monkeypatch.setattr(DOCLING_EXECUTOR_SERVICE, "parse_to_markdown", parse_to_markdown)
+
+    async def run():
+        documents_loader = DocumentsLoader(file_paths=[str(pdf_path), str(text_path)])
+        return [
+            (os.path.basename(file_path), section)
+            async for file_path, section in documents_loader.iterate_documents()
+        ]
+
+    assert asyncio.run(run()) == [
+        ("manual.pdf", "pages 1-10"),
+        ("manual.pdf", "pages 11-20"),
+        ("manual.pdf", "pages 21-25"),
+        ("notes.txt", "plain text"),
+    ]
+    # Only the next window is parsed ahead
+    assert max_in_flight == 2
+    assert sorted(parsed) == [(1, 10), (11, 20), (21, 25)]
+
+    # Windows are cached separately
+    asyncio.run(run())
+    assert len(parsed) == 3
+
+
+def test_load_documents_parses_pdfs_in_one_pass(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "manual.pdf"
+    pages = [Image.new("RGB", (100, 100), (i, i, i)) for i in range(25)]
+    pages[0].save(pdf_path, "PDF", save_all=True, append_images=pages[1:])
+    parsed = []
+
+    async def parse_to_markdown(file_path, page_range=None):
+        parsed.append(page_range)
+        return "manual"
+
+    monkeypatch.setattr(DOCLING_EXECUTOR_SERVICE, "parse_to_markdown", parse_to_markdown)
+
+    documents_loader = DocumentsLoader(file_paths=[str(pdf_path)])
+    asyncio.run(documents_loader.load_documents())
+
+    assert parsed == [None]
+    assert documents_loader.documents == ["manual"]
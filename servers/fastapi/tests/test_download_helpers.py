@@ -0,0 +1,94 @@
+import asyncio
+import os
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from services.http_client_service import HTTP_CLIENT_SERVICE
+from utils import download_helpers
+from utils.download_helpers import download_files
+
+
+def create_test_app(requests: dict) -> web.Application:
+    async def image(request):
+        requests["image"] = requests.get("image", 0) + 1
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(body=b"png-bytes", headers={"ETag": '"v1"'})
+
+    async def flaky(request):
+        requests["flaky"] = requests.get("flaky", 0) + 1
+        if requests["flaky"] < 3:
+            return web.Response(status=503)
+        return web.Response(body=b"jpg-bytes", content_type="image/jpeg")
+
+    app = web.Application()
+    app.router.add_get("/image.png", image)
+    app.router.add_get("/flaky", flaky)
+    return app
+
+
+def run_with_server(requests: dict, callback):
+    async def run():
+        server = TestServer(create_test_app(requests))
+        await server.start_server()
+        try:
+            return await callback(server)
+        finally:
+            await HTTP_CLIENT_SERVICE.close()
+            await server.close()
+
+    return asyncio.run(run())
+
+
+def test_download_files_dedups_and_reuses_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path / "app_data"))
+    monkeypatch.setattr(download_helpers, "_DOWNLOAD_CACHE", None)
+    requests = {}
+
+    async def download(server):
+        url = str(server.make_url("/image.png"))
+        first = await download_files([url, url, url], str(tmp_path / "first"))
+        second = await download_files([url], str(tmp_path / "second"))
+        return first, second
+
+    first, second = run_with_server(requests, download)
+
+    assert requests["image"] == 1
+    assert first == [first[0]] * 3
+    assert open(first[0], "rb").read() == b"png-bytes"
+    assert open(second[0], "rb").read() == b"png-bytes"
+    assert os.path.dirname(second[0]) == str(tmp_path / "second")
+
+
+def test_download_file_revalidates_stale_cache_with_etag(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path / "app_data"))
+    monkeypatch.setattr(download_helpers, "_DOWNLOAD_CACHE", None)
+    monkeypatch.setattr(download_helpers, "DOWNLOAD_CACHE_FRESHNESS", 0)
+    requests = {}
+
+    async def download(server):
+        url = str(server.make_url("/image.png"))
+        await download_helpers.download_file(url, str(tmp_path / "first"))
+        return await download_helpers.download_file(url, str(tmp_path / "second"))
+
+    path = run_with_server(requests, download)
+
+    assert requests["image"] == 2
+    assert open(path, "rb").read() == b"png-bytes"
+
+
+def test_download_file_retries_server_errors(tmp_path, monkeypatch):
+    monkeypatch.delenv("APP_DATA_DIRECTORY", raising=False)
+    monkeypatch.setattr(download_helpers, "DOWNLOAD_RETRY_BACKOFF", 0)
+    requests = {}
+
+    async def download(server):
+        url = str(server.make_url("/flaky"))
+        return await download_helpers.download_file(url, str(tmp_path))
+
+    path = run_with_server(requests, download)
+
+    assert requests["flaky"] == 3
+    assert path.endswith(".jpg")
+    assert open(path, "rb").read() == b"jpg-bytes"
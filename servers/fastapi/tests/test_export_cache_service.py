@@ -0,0 +1,93 @@
+import os
+import uuid
+
+from models.presentation_and_path import PresentationAndPath
+from models.sql.presentation import PresentationModel
+from models.sql.slide import SlideModel
+from services.export_cache_service import (
+    ExportCacheService,
+    get_presentation_content_hash,
+)
+
+
+def create_presentation():
+    presentation = PresentationModel(
+        id=uuid.uuid4(), content="", n_slides=2, language="English", title="Deck"
+    )
+    slides = [
+        SlideModel(
+            presentation=presentation.id,
+            layout_group="general",
+            layout=f"layout-{index}",
+            index=index,
+            content={"title": f"Slide {index}"},
+            html_content=None,
+            properties=None,
+        )
+        for index in range(2)
+    ]
+    return presentation, slides
+
+
+def test_content_hash_depends_on_slides_and_format():
+    presentation, slides = create_presentation()
+    content_hash = get_presentation_content_hash(presentation, slides, "pptx")
+
+    assert content_hash == get_presentation_content_hash(
+        presentation, list(reversed(slides)), "pptx"
+    )
+    assert content_hash != get_presentation_content_hash(presentation, slides, "pdf")
+    assert content_hash != get_presentation_content_hash(
+        presentation, slides, "pptx", image_dpi=150
+    )
+
+    slides[1].content = {"title": "Edited"}
+    assert content_hash != get_presentation_content_hash(presentation, slides, "pptx")
+
+
+def test_export_cache_restores_file_until_invalidated(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    service = ExportCacheService()
+    presentation_id = uuid.uuid4()
+    export_path = tmp_path / "exports" / "Deck.pptx"
+    export_path.parent.mkdir()
+    export_path.write_bytes(b"pptx")
+
+    service.set(
+        PresentationAndPath(presentation_id=presentation_id, path=str(export_path)),
+        "pptx",
+        "hash",
+    )
+    assert service.get(presentation_id, "pptx", "other-hash") is None
+
+    service.set(
+        PresentationAndPath(presentation_id=presentation_id, path=str(export_path)),
+        "pptx",
+        "hash",
+    )
+    os.remove(export_path)
+    cached = service.get(presentation_id, "pptx", "hash")
+    assert cached.path == str(export_path)
+    assert export_path.read_bytes() == b"pptx"
+
+    service.invalidate(presentation_id)
+    assert service.get(presentation_id, "pptx", "hash") is None
+
+
+def test_export_cache_ignores_files_overwritten_in_place(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    service = ExportCacheService()
+    presentation_id = uuid.uuid4()
+    export_path = tmp_path / "Deck.pptx"
+    export_path.write_bytes(b"pptx")
+
+    service.set(
+        PresentationAndPath(presentation_id=presentation_id, path=str(export_path)),
+        "pptx",
+        "hash",
+    )
+    # Another presentation with the same title exported over the file
+    with open(export_path, "wb") as f:
+        f.write(b"another deck")
+
+    assert service.get(presentation_id, "pptx", "hash") is None
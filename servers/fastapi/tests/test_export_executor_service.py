@@ -0,0 +1,120 @@
+import asyncio
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+import os
+
+from fastapi import HTTPException
+from pptx import Presentation
+from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE
+import pytest
+
+from models.pptx_models import (
+    PptxAutoShapeBoxModel,
+    PptxFillModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+)
+from services.export_executor_service import ExportExecutorService
+
+
+def create_pptx_model(n_slides: int) -> PptxPresentationModel:
+    return PptxPresentationModel(
+        slides=[
+            PptxSlideModel(
+                shapes=[
+                    PptxAutoShapeBoxModel(
+                        type=MSO_AUTO_SHAPE_TYPE.RECTANGLE,
+                        position=PptxPositionModel(
+                            left=20, top=20, width=100, height=100
+                        ),
+                        fill=PptxFillModel(color="000000", opacity=0.5),
+                    )
+                ]
+            )
+            for _ in range(n_slides)
+        ]
+    )
+
+
+def test_export_pptx_builds_file_in_worker(tmp_path, monkeypatch):
+    monkeypatch.setenv("EXPORT_WORKERS", "1")
+    service = ExportExecutorService()
+    pptx_path = str(tmp_path / "deck.pptx")
+
+    try:
+        result = asyncio.run(
+            service.export_pptx(create_pptx_model(3), str(tmp_path), pptx_path)
+        )
+    finally:
+        service.shutdown()
+
+    assert result == pptx_path
+    assert os.path.exists(pptx_path)
+    assert len(Presentation(pptx_path).slides) == 3
+    assert service.get_stats()["completed"] == 1
+    assert service.get_stats()["in_flight"] == 0
+
+
+def test_export_pptx_rejects_when_queue_is_full(tmp_path, monkeypatch):
+    monkeypatch.setenv("EXPORT_WORKERS", "1")
+    monkeypatch.setenv("EXPORT_QUEUE_DEPTH", "0")
+    service = ExportExecutorService()
+    service._in_flight = 1
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(
+            service.export_pptx(
+                create_pptx_model(1), str(tmp_path), str(tmp_path / "deck.pptx")
+            )
+        )
+
+    assert exc_info.value.status_code == 503
+    assert service.get_stats()["rejected"] == 1
+
+
+class BrokenExecutor:
+    def __init__(self):
+        self.is_shut_down = False
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_exception(BrokenProcessPool("A worker was killed"))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.is_shut_down = True
+
+
+def test_export_pptx_replaces_broken_pool(tmp_path, monkeypatch):
+    monkeypatch.setenv("EXPORT_WORKERS", "1")
+    service = ExportExecutorService()
+    broken_executor = BrokenExecutor()
+    service._executor = broken_executor
+    pptx_path = str(tmp_path / "deck.pptx")
+
+    try:
+        result = asyncio.run(
+            service.export_pptx(create_pptx_model(1), str(tmp_path), pptx_path)
+        )
+    finally:
+        service.shutdown()
+
+    assert result == pptx_path
+    assert broken_executor.is_shut_down
+    assert service.get_stats()["restarts"] == 1
+
+
+def test_export_pptx_fails_cleanly_when_pool_keeps_breaking(tmp_path, monkeypatch):
+    service = ExportExecutorService()
+    monkeypatch.setattr(service, "_get_executor", BrokenExecutor)
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(
+            service.export_pptx(
+                create_pptx_model(1), str(tmp_path), str(tmp_path / "deck.pptx")
+            )
+        )
+
+    assert exc_info.value.status_code == 500
+    assert service.get_stats()["in_flight"] == 0
@@ -0,0 +1,67 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+import uuid
+
+from fastapi import HTTPException
+import pytest
+
+from api.v1.ppt.endpoints import presentation as presentation_endpoints
+from models.generate_presentation_request import GeneratePresentationRequest
+from models.presentation_layout import PresentationLayoutModel, SlideLayoutModel
+
+
+def test_failed_slide_cancels_started_asset_fetches(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    layout = PresentationLayoutModel(
+        name="general",
+        ordered=True,
+        slides=[
+            SlideLayoutModel(id=f"layout-{index}", json_schema={})
+            for index in range(3)
+        ],
+    )
+    started = []
+    finished = []
+
+    async def get_slide_content(slide_layout, *args):
+        if slide_layout.id == "layout-1":
+            # Fails once the first slide is already fetching its assets
+            await asyncio.sleep(0.01)
+            raise ValueError("Slide generation failed")
+        return {"title": slide_layout.id}
+
+    async def fetch_assets(image_generation_service, slide):
+        started.append(slide.index)
+        try:
+            await asyncio.sleep(10)
+        finally:
+            finished.append(slide.index)
+        return []
+
+    monkeypatch.setattr(
+        presentation_endpoints, "get_layout_by_name", AsyncMock(return_value=layout)
+    )
+    monkeypatch.setattr(
+        presentation_endpoints,
+        "get_slide_content_from_type_and_outline",
+        get_slide_content,
+    )
+    monkeypatch.setattr(
+        presentation_endpoints, "process_slide_and_fetch_assets", fetch_assets
+    )
+    monkeypatch.setattr(presentation_endpoints, "get_llm_concurrency", lambda: 1)
+    monkeypatch.setattr(presentation_endpoints, "CONCURRENT_SERVICE", MagicMock())
+    request = GeneratePresentationRequest(
+        content="", slides_markdown=["First", "Second", "Third"]
+    )
+
+    async def run():
+        with pytest.raises(HTTPException):
+            await presentation_endpoints.generate_presentation_handler(
+                request, uuid.uuid4(), None, MagicMock()
+            )
+        # No asset fetch outlives the request
+        assert started == [0]
+        assert finished == [0]
+
+    asyncio.run(run())
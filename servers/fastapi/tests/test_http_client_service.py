@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import time
+
+from services.http_client_service import HttpClientService
+
+
+def test_get_session_reuses_session():
+    async def run():
+        service = HttpClientService()
+        session = service.get_session()
+        assert service.get_session() is session
+        assert session.connector.limit_per_host == 16
+        await service.close()
+        assert session.closed
+
+        new_session = service.get_session()
+        assert new_session is not session
+        await service.close()
+
+    asyncio.run(run())
+
+
+def test_get_session_recreates_session_for_new_loop():
+    service = HttpClientService()
+
+    async def get_session():
+        session = service.get_session()
+        await session.close()
+        return session
+
+    first_session = asyncio.run(get_session())
+    second_session = asyncio.run(get_session())
+    assert second_session is not first_session
+
+
+def test_get_session_closes_session_of_previous_loop():
+    service = HttpClientService()
+
+    async def get_session():
+        return service.get_session()
+
+    first_session = asyncio.run(get_session())
+
+    async def run():
+        session = service.get_session()
+        await asyncio.sleep(0)
+        await service.close()
+        return session
+
+    second_session = asyncio.run(run())
+    assert first_session.closed
+    assert second_session is not first_session
+
+
+def test_get_session_only_trusts_env_when_asked():
+    async def run():
+        service = HttpClientService()
+        try:
+            assert service.get_session().trust_env is False
+            assert service.get_session(trust_env=True).trust_env is True
+        finally:
+            await service.close()
+
+    asyncio.run(run())
+
+
+def test_get_session_keeps_one_session_per_running_loop():
+    service = HttpClientService()
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever)
+    thread.start()
+
+    async def get_session():
+        return service.get_session()
+
+    try:
+        other_session = asyncio.run_coroutine_threadsafe(
+            get_session(), other_loop
+        ).result()
+
+        async def run():
+            session = service.get_session()
+            # The other loop's callers keep their session
+            assert session is not other_session
+            assert not other_session.closed
+            await service.close()
+            return session
+
+        session = asyncio.run(run())
+        assert session.closed
+        # Closed on its own loop
+        for _ in range(100):
+            if other_session.closed:
+                break
+            time.sleep(0.01)
+        assert other_session.closed
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join()
+        other_loop.close()
@@ -0,0 +1,92 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+
+from services import icon_finder_service
+from services.icon_finder_service import IconFinderService, IconIndexStatus
+from services.icon_index import NumpyIconIndex
+
+
+def test_search_falls_back_to_lexical_match_until_ready():
+    service = IconFinderService()
+    icons = [("chart-line-up-bold", "growth"), ("users-bold", "team people")]
+
+    async def run():
+        with patch(
+            "services.icon_finder_service.load_bold_icons", return_value=icons
+        ), patch.object(service, "_start_initialization") as start_initialization:
+            results = await service.search_icons_batch(["growth chart", "team"])
+            start_initialization.assert_called()
+            return results
+
+    assert asyncio.run(run()) == [
+        ["/static/icons/bold/chart-line-up-bold.svg"],
+        ["/static/icons/bold/users-bold.svg"],
+    ]
+    assert service.get_cache_stats()["size"] == 0
+    assert service.get_cache_stats()["misses"] == 2
+
+
+def test_failed_index_load_is_retried_after_interval(monkeypatch):
+    monkeypatch.setattr(icon_finder_service, "ICON_INDEX_RETRY_INTERVAL", 0.05)
+    service = IconFinderService()
+    attempts = []
+
+    def create_icon_index():
+        attempts.append(len(attempts))
+        if len(attempts) == 1:
+            raise RuntimeError("ONNX model is not downloaded yet")
+        return object()
+
+    monkeypatch.setattr(icon_finder_service, "create_icon_index", create_icon_index)
+    monkeypatch.setattr(service, "warm_up_cache", AsyncMock())
+    monkeypatch.setattr(service, "search_icons_lexical", lambda query, k: [])
+
+    async def run():
+        await service.search_icons("growth")
+        await service._initialize_task
+        assert service.status == IconIndexStatus.FAILED
+
+        # Too early to retry
+        await service.search_icons("growth")
+        await service._initialize_task
+        assert len(attempts) == 1
+
+        await asyncio.sleep(0.05)
+        await service.search_icons("growth")
+        await service._initialize_task
+
+    asyncio.run(run())
+
+    assert len(attempts) == 2
+    assert service.is_ready
+
+
+class FakeEmbeddingFunction:
+    vocabulary = ["chart", "users", "lock"]
+
+    def __call__(self, texts):
+        return [
+            [float(word in text) for word in self.vocabulary] for text in texts
+        ]
+
+
+def test_numpy_icon_index_returns_nearest_icons(tmp_path):
+    icons = [("chart-bold", "growth"), ("users-bold", "team"), ("lock-bold", "")]
+    with patch(
+        "services.icon_index.get_icon_embedding_function",
+        return_value=FakeEmbeddingFunction(),
+    ), patch("services.icon_index.load_bold_icons", return_value=icons):
+        index = NumpyIconIndex(
+            str(tmp_path / "icons.npy"), str(tmp_path / "icons.json")
+        )
+        # A second instance memory-maps the saved matrix instead of rebuilding
+        reloaded_index = NumpyIconIndex(
+            str(tmp_path / "icons.npy"), str(tmp_path / "icons.json")
+        )
+
+    assert index.query(["users", "lock"], 1) == [["users-bold"], ["lock-bold"]]
+    assert sorted(index.query(["lock chart"], 2)[0]) == ["chart-bold", "lock-bold"]
+    assert reloaded_index.query(["lock"], 1) == [["lock-bold"]]
+    assert isinstance(reloaded_index.embeddings, np.memmap)
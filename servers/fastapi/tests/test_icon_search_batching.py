@@ -0,0 +1,58 @@
+import asyncio
+
+from services import icon_finder_service
+from services.icon_finder_service import IconFinderService, IconIndexStatus
+
+
+class FakeIconIndex:
+    def __init__(self):
+        self.queries = []
+
+    def query(self, texts, k):
+        self.queries.append(list(texts))
+        return [[f"{text}-{i}-bold" for i in range(k)] for text in texts]
+
+
+def get_ready_service() -> IconFinderService:
+    service = IconFinderService()
+    service.index = FakeIconIndex()
+    service.status = IconIndexStatus.READY
+    return service
+
+
+def test_concurrent_searches_share_one_query():
+    service = get_ready_service()
+
+    async def run():
+        return await asyncio.gather(
+            service.search_icons("growth"),
+            service.search_icons("team"),
+            service.search_icons("growth"),
+        )
+
+    results = asyncio.run(run())
+
+    assert results == [
+        ["/static/icons/bold/growth-0-bold.svg"],
+        ["/static/icons/bold/team-0-bold.svg"],
+        ["/static/icons/bold/growth-0-bold.svg"],
+    ]
+    assert service.index.queries == [["growth", "team"]]
+
+
+def test_full_batch_is_queried_without_waiting(monkeypatch):
+    monkeypatch.setattr(icon_finder_service, "ICON_SEARCH_MAX_BATCH_SIZE", 2)
+    monkeypatch.setattr(icon_finder_service, "ICON_SEARCH_BATCH_WINDOW", 10)
+    service = get_ready_service()
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(service.search_icons("growth"), service.search_icons("team")),
+            timeout=1,
+        )
+
+    assert asyncio.run(run()) == [
+        ["/static/icons/bold/growth-0-bold.svg"],
+        ["/static/icons/bold/team-0-bold.svg"],
+    ]
+    assert service.index.queries == [["growth", "team"]]
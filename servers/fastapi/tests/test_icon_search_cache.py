@@ -0,0 +1,51 @@
+import asyncio
+
+from services import icon_finder_service
+from services.icon_finder_service import IconFinderService, IconIndexStatus
+
+
+class FakeIconIndex:
+    def __init__(self):
+        self.queries = []
+
+    def query(self, texts, k):
+        self.queries.append(list(texts))
+        return [[f"{text}-{i}-bold" for i in range(k)] for text in texts]
+
+
+def get_ready_service() -> IconFinderService:
+    service = IconFinderService()
+    service.index = FakeIconIndex()
+    service.status = IconIndexStatus.READY
+    return service
+
+
+def test_repeated_queries_are_served_from_cache():
+    service = get_ready_service()
+
+    async def run():
+        await service.search_icons("Growth")
+        return await service.search_icons_batch(["growth ", "team"])
+
+    results = asyncio.run(run())
+
+    assert results[0] == ["/static/icons/bold/Growth-0-bold.svg"]
+    assert service.index.queries == [["Growth"], ["team"]]
+    assert service.get_cache_stats()["hits"] == 1
+
+
+def test_cache_evicts_least_recently_used_queries(monkeypatch):
+    monkeypatch.setattr(icon_finder_service, "ICON_CACHE_MAX_SIZE", 2)
+    service = get_ready_service()
+
+    async def run():
+        await service.search_icons_batch(["growth", "team"])
+        # Makes "team" the least recently used query
+        await service.search_icons_batch(["growth"])
+        await service.search_icons_batch(["security"])
+        await service.search_icons_batch(["growth", "team"])
+
+    asyncio.run(run())
+
+    assert service.index.queries == [["growth", "team"], ["security"], ["team"]]
+    assert service.get_cache_stats()["size"] == 2
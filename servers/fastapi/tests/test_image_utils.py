@@ -0,0 +1,47 @@
+import pytest
+
+from tests.image_utils_reference import (
+    create_random_image,
+    legacy_create_circle_image,
+    legacy_invert_image,
+    legacy_round_image_corners,
+    legacy_set_image_opacity,
+)
+from utils.image_utils import (
+    create_circle_image,
+    invert_image,
+    round_image_corners,
+    set_image_opacity,
+)
+
+
+@pytest.mark.parametrize("size", [(1, 1), (37, 53), (200, 120)])
+def test_vectorized_transforms_match_legacy_output(size):
+    image = create_random_image(*size)
+
+    for radii in ([0, 0, 0, 0], [10, 0, 25, 400], [5, 5, 5, 5]):
+        assert (
+            round_image_corners(image, radii).tobytes()
+            == legacy_round_image_corners(image, radii).tobytes()
+        )
+    assert invert_image(image).tobytes() == legacy_invert_image(image).tobytes()
+    assert (
+        create_circle_image(image).tobytes()
+        == legacy_create_circle_image(image).tobytes()
+    )
+    for opacity in (0.0, 0.37, 1.0):
+        assert (
+            set_image_opacity(image, opacity).tobytes()
+            == legacy_set_image_opacity(image, opacity).tobytes()
+        )
+
+
+def test_transforms_accept_rgb_images():
+    image = create_random_image(40, 30).convert("RGB")
+
+    assert round_image_corners(image, [10, 10, 10, 10]).mode == "RGBA"
+    assert create_circle_image(image).mode == "RGBA"
+    assert set_image_opacity(image, 0.5).getpixel((0, 0))[3] == 127
+    assert invert_image(image).getpixel((0, 0))[:3] == tuple(
+        255 - value for value in image.getpixel((0, 0))
+    )
@@ -0,0 +1,240 @@
+import asyncio
+import os
+import socket
+import stat
+import sys
+
+import pytest
+
+from services import libreoffice_pool_service
+from services.libreoffice_pool_service import LibreOfficePoolService
+
+
+FAKE_SOFFICE = """
+import socket
+import sys
+
+port = int(sys.argv[-1].split("port=")[1].split(";")[0])
+with open({starts_path!r}, "a") as f:
+    f.write(str(port) + "\\n")
+server = socket.socket()
+server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+server.bind(("127.0.0.1", port))
+server.listen()
+while True:
+    connection, _ = server.accept()
+    connection.close()
+"""
+
+FAKE_UNO_CLIENT = """
+import shutil
+import sys
+import time
+
+if "slow" in sys.argv[2]:
+    time.sleep(30)
+shutil.copy(sys.argv[2], sys.argv[3])
+"""
+
+FAKE_LIBREOFFICE_CONVERT = """
+import os
+import socket
+import shutil
+import sys
+
+output_directory = sys.argv[sys.argv.index("--outdir") + 1]
+input_path = sys.argv[-1]
+name = os.path.splitext(os.path.basename(input_path))[0]
+with open(os.environ["FONTCONFIG_FILE"]) as f:
+    assert "Open Sans" in f.read()
+shutil.copy(input_path, os.path.join(output_directory, name + ".pdf"))
+"""
+
+
+def write_script(path, source: str) -> str:
+    path.write_text(f"#!{sys.executable}\n{source}")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+
+def write_input(tmp_path, name: str) -> str:
+    input_path = tmp_path / name
+    input_path.write_bytes(b"pptx")
+    return str(input_path)
+
+
+@pytest.fixture
+def pooled_service(tmp_path, monkeypatch):
+    starts_path = tmp_path / "starts.log"
+    monkeypatch.setenv(
+        "LIBREOFFICE_PATH",
+        write_script(
+            tmp_path / "soffice",
+            FAKE_SOFFICE.format(starts_path=str(starts_path)),
+        ),
+    )
+    monkeypatch.setenv("LIBREOFFICE_PYTHON", sys.executable)
+    monkeypatch.setenv("LIBREOFFICE_POOL_SIZE", "1")
+    monkeypatch.setattr(
+        libreoffice_pool_service,
+        "LIBREOFFICE_UNO_CLIENT_PATH",
+        write_script(tmp_path / "client.py", FAKE_UNO_CLIENT),
+    )
+    service = LibreOfficePoolService()
+    service._uno_available = True
+    return service, starts_path
+
+
+def test_convert_to_pdf_reuses_and_recycles_instances(pooled_service, tmp_path, monkeypatch):
+    service, starts_path = pooled_service
+    monkeypatch.setenv("LIBREOFFICE_MAX_JOBS_PER_INSTANCE", "2")
+
+    async def run():
+        try:
+            for index in range(3):
+                pdf_path = await service.convert_to_pdf(
+                    write_input(tmp_path, f"deck_{index}.pptx"), str(tmp_path)
+                )
+                assert pdf_path == str(tmp_path / f"deck_{index}.pdf")
+                assert os.path.exists(pdf_path)
+            return service.get_stats()
+        finally:
+            await service.close()
+
+    stats = asyncio.run(run())
+
+    assert len(starts_path.read_text().splitlines()) == 2
+    assert stats["completed"] == 3
+    assert stats["restarts"] == 1
+
+
+def test_convert_to_pdf_restarts_instances_on_new_font_aliases(pooled_service, tmp_path):
+    service, starts_path = pooled_service
+
+    async def run():
+        try:
+            input_path = write_input(tmp_path, "deck.pptx")
+            await service.convert_to_pdf(input_path, str(tmp_path))
+            await service.convert_to_pdf(
+                input_path, str(tmp_path), {"Open Sans Light": "Open Sans"}
+            )
+            # Known aliases do not restart the instance again
+            await service.convert_to_pdf(
+                input_path, str(tmp_path), {"Open Sans Light": "Open Sans"}
+            )
+        finally:
+            await service.close()
+
+    asyncio.run(run())
+
+    assert len(starts_path.read_text().splitlines()) == 2
+    with open(service.fonts_conf_path) as f:
+        assert "<string>Open Sans Light</string>" in f.read()
+
+
+def test_convert_to_pdf_stops_instance_on_timeout(pooled_service, tmp_path, monkeypatch):
+    service, starts_path = pooled_service
+    monkeypatch.setenv("LIBREOFFICE_CONVERSION_TIMEOUT", "1")
+
+    async def run():
+        try:
+            with pytest.raises(Exception, match="timed out after 1 seconds"):
+                await service.convert_to_pdf(
+                    write_input(tmp_path, "slow.pptx"), str(tmp_path)
+                )
+            assert service.get_stats()["running_instances"] == 0
+
+            await service.convert_to_pdf(
+                write_input(tmp_path, "deck.pptx"), str(tmp_path)
+            )
+            return service.get_stats()
+        finally:
+            await service.close()
+
+    stats = asyncio.run(run())
+
+    assert len(starts_path.read_text().splitlines()) == 2
+    assert stats["failed"] == 1
+    assert stats["completed"] == 1
+
+
+def test_convert_to_pdf_falls_back_without_uno(tmp_path, monkeypatch):
+    monkeypatch.setenv(
+        "LIBREOFFICE_PATH",
+        write_script(tmp_path / "libreoffice", FAKE_LIBREOFFICE_CONVERT),
+    )
+    monkeypatch.setenv("LIBREOFFICE_PYTHON", str(tmp_path / "missing-python"))
+    service = LibreOfficePoolService()
+
+    pdf_path = asyncio.run(
+        service.convert_to_pdf(
+            write_input(tmp_path, "deck.pptx"),
+            str(tmp_path),
+            {"Open Sans Light": "Open Sans"},
+        )
+    )
+
+    assert pdf_path == str(tmp_path / "deck.pdf")
+    assert service.get_stats()["uno_available"] is False
+
+
+def test_convert_to_pdf_only_restarts_instances_missing_font_aliases(
+    pooled_service, tmp_path, monkeypatch
+):
+    service, starts_path = pooled_service
+    monkeypatch.setenv("LIBREOFFICE_POOL_SIZE", "2")
+
+    async def run():
+        try:
+            input_path = write_input(tmp_path, "deck.pptx")
+            # Instances are used in turn
+            for font_aliases in [
+                None,
+                {"Open Sans Light": "Open Sans"},
+                None,
+                {"Open Sans Light": "Open Sans"},
+                {"Roboto Thin": "Roboto"},
+            ]:
+                await service.convert_to_pdf(input_path, str(tmp_path), font_aliases)
+            return service.get_stats()
+        finally:
+            await service.close()
+
+    stats = asyncio.run(run())
+
+    assert len(starts_path.read_text().splitlines()) == 3
+    assert stats["restarts"] == 1
+
+
+def test_instance_start_retries_when_port_is_taken(
+    pooled_service, tmp_path, monkeypatch
+):
+    service, starts_path = pooled_service
+    # Bound without listening, so soffice can not bind it and health checks
+    # are refused
+    taken_socket = socket.socket()
+    taken_socket.bind(("127.0.0.1", 0))
+    free_ports = [
+        taken_socket.getsockname()[1],
+        libreoffice_pool_service.get_free_port(),
+    ]
+    monkeypatch.setattr(
+        libreoffice_pool_service, "get_free_port", lambda: free_ports.pop(0)
+    )
+
+    async def run():
+        try:
+            await service.convert_to_pdf(
+                write_input(tmp_path, "deck.pptx"), str(tmp_path)
+            )
+            return service.get_stats()
+        finally:
+            await service.close()
+
+    try:
+        stats = asyncio.run(run())
+    finally:
+        taken_socket.close()
+
+    assert len(starts_path.read_text().splitlines()) == 2
+    assert stats["completed"] == 1
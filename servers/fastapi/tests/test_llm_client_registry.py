@@ -0,0 +1,84 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+
+from enums.llm_provider import LLMProvider
+from services.llm_client import LLMClient, LLMClientRegistry
+
+
+def test_registry_reuses_client_for_same_key():
+    registry = LLMClientRegistry()
+    key = (LLMProvider.OPENAI, None, "sk-test")
+
+    first = registry.get_client(key, object)
+    second = registry.get_client(key, object)
+
+    assert first is second
+    stats = registry.get_stats()
+    assert stats["builds"] == 1
+    assert stats["client_reuse_ratio"] == 0.5
+
+
+def test_registry_rebuilds_client_when_key_changes():
+    registry = LLMClientRegistry()
+
+    first = registry.get_client((LLMProvider.OPENAI, None, "sk-old"), object)
+    second = registry.get_client((LLMProvider.OPENAI, None, "sk-new"), object)
+
+    assert first is not second
+    assert registry.get_stats()["builds"] == 2
+    assert len(registry.get_stats()["clients"]) == 1
+
+
+def test_llm_client_shares_sdk_client_across_instances():
+    registry = LLMClientRegistry()
+    env = {"LLM": "openai", "OPENAI_API_KEY": "sk-test"}
+    with patch.dict("os.environ", env), patch(
+        "services.llm_client.LLM_CLIENT_REGISTRY", registry
+    ):
+        assert LLMClient()._client is LLMClient()._client
+
+        with patch.dict("os.environ", {"OPENAI_API_KEY": "sk-rotated"}):
+            assert LLMClient()._client.api_key == "sk-rotated"
+
+
+class Owner:
+    pass
+
+
+def test_registry_closes_retired_http_client_after_last_owner():
+    registry = LLMClientRegistry()
+    old_key = (LLMProvider.OPENAI, None, "sk-old")
+
+    async def run():
+        owners = [Owner(), Owner()]
+        registry.get_client(old_key, object, owners[0])
+        registry.get_client(old_key, object, owners[1])
+        http_client = registry.get_http_client(old_key, httpx.AsyncClient)
+        registry.get_client((LLMProvider.OPENAI, None, "sk-new"), object, Owner())
+        assert registry.get_stats()["retired_clients"] == 1
+
+        # A call still running on the retired client keeps it open
+        owners.pop()
+        await asyncio.sleep(0)
+        assert not http_client.is_closed
+
+        owners.pop()
+        await asyncio.sleep(0.01)
+        assert http_client.is_closed
+        assert registry.get_stats()["retired_clients"] == 0
+
+    asyncio.run(run())
+
+
+def test_registry_closes_unowned_retired_http_client_on_aclose():
+    registry = LLMClientRegistry()
+    old_key = (LLMProvider.OPENAI, None, "sk-old")
+    registry.get_client(old_key, object)
+    http_client = registry.get_http_client(old_key, httpx.AsyncClient)
+    registry.get_client((LLMProvider.OPENAI, None, "sk-new"), object)
+
+    assert not http_client.is_closed
+    asyncio.run(registry.aclose())
+    assert http_client.is_closed
@@ -0,0 +1,123 @@
+import asyncio
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+import os
+
+from PIL import Image, ImageDraw
+import pdfplumber
+import pytest
+
+from services.pdf_rasterizer_service import PdfRasterizerService, get_page_ranges
+
+
+def create_pdf(path, n_pages: int) -> str:
+    pages = []
+    for index in range(n_pages):
+        page = Image.new("RGB", (400, 300), (255, 255, 255))
+        ImageDraw.Draw(page).rectangle(
+            (20 + index * 10, 20, 120 + index * 10, 120), fill=(index * 20, 80, 160)
+        )
+        pages.append(page)
+    pages[0].save(path, "PDF", save_all=True, append_images=pages[1:])
+    return str(path)
+
+
+def test_get_page_ranges_covers_every_page_once():
+    for page_count in (0, 1, 5, 37, 120):
+        page_ranges = get_page_ranges(page_count, 2)
+        pages = [
+            page for first, last in page_ranges for page in range(first, last + 1)
+        ]
+        assert pages == list(range(1, page_count + 1))
+
+
+def test_get_page_images_matches_serial_rendering(tmp_path, monkeypatch):
+    monkeypatch.setenv("PDF_RASTER_WORKERS", "2")
+    pdf_path = create_pdf(tmp_path / "deck.pdf", 10)
+    output_dir = tmp_path / "pages"
+    output_dir.mkdir()
+    service = PdfRasterizerService()
+
+    try:
+        image_paths = asyncio.run(service.get_page_images(pdf_path, str(output_dir)))
+    finally:
+        service.shutdown()
+
+    assert image_paths == [
+        str(output_dir / f"page_{page}.png") for page in range(1, 11)
+    ]
+    with pdfplumber.open(pdf_path) as pdf:
+        for page, image_path in zip(pdf.pages, image_paths):
+            expected = page.to_image(resolution=150)
+            expected.save(tmp_path / "expected.png")
+            with Image.open(tmp_path / "expected.png") as expected_image:
+                with Image.open(image_path) as image:
+                    assert image.tobytes() == expected_image.tobytes()
+    assert service.get_stats()["rendered_pages"] == 10
+
+
+def test_iterate_page_images_renders_jpeg_at_dpi(tmp_path):
+    pdf_path = create_pdf(tmp_path / "deck.pdf", 3)
+    service = PdfRasterizerService()
+
+    async def run():
+        return [
+            image_path
+            async for image_path in service.iterate_page_images(
+                pdf_path, str(tmp_path), dpi=36, image_format="jpeg"
+            )
+        ]
+
+    image_paths = asyncio.run(run())
+
+    assert [os.path.basename(path) for path in image_paths] == [
+        "page_1.jpg",
+        "page_2.jpg",
+        "page_3.jpg",
+    ]
+    with Image.open(image_paths[0]) as image:
+        assert image.format == "JPEG"
+        assert image.size == (200, 150)
+
+
+def test_iterate_page_images_rejects_unknown_format(tmp_path):
+    service = PdfRasterizerService()
+
+    async def run():
+        async for _ in service.iterate_page_images(
+            create_pdf(tmp_path / "deck.pdf", 1), str(tmp_path), image_format="tiff"
+        ):
+            pass
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+
+
+class BrokenExecutor:
+    def __init__(self):
+        self.is_shut_down = False
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_exception(BrokenProcessPool("A worker was killed"))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.is_shut_down = True
+
+
+def test_iterate_page_images_replaces_broken_pool(tmp_path, monkeypatch):
+    monkeypatch.setenv("PDF_RASTER_WORKERS", "2")
+    pdf_path = create_pdf(tmp_path / "deck.pdf", 10)
+    service = PdfRasterizerService()
+    broken_executor = BrokenExecutor()
+    service._executor = broken_executor
+
+    try:
+        image_paths = asyncio.run(service.get_page_images(pdf_path, str(tmp_path)))
+    finally:
+        service.shutdown()
+
+    assert len(image_paths) == 10
+    assert broken_executor.is_shut_down
+    assert service.get_stats()["restarts"] == 1
@@ -0,0 +1,80 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.v1.ppt.endpoints import pptx_slides
+from api.v1.ppt.endpoints.pptx_slides import (
+    PPTX_FONTS_ROUTER,
+    _get_slide_fonts,
+    extract_fonts_from_oxml,
+)
+from scripts.benchmark_pptx_fonts import create_pptx, legacy_get_slide_fonts
+
+PPTX_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+)
+
+SLIDE_XML = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<p:sld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"
+       xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">
+  <p:cSld><p:spTree><p:sp><p:txBody>
+    <a:p>
+      <a:pPr><a:buFont typeface="Wingdings"/></a:pPr>
+      <a:r>
+        <a:rPr><a:latin typeface="Montserrat Bold"/><a:ea typeface="+mn-ea"/>
+          <a:cs typeface="Noto Sans Arabic"/><a:sym typeface="Symbol"/></a:rPr>
+        <a:t>Text</a:t>
+      </a:r>
+      <a:endParaRPr><a:latin typeface=" "/></a:endParaRPr>
+    </a:p>
+  </p:txBody></p:sp></p:spTree></p:cSld>
+</p:sld>
+"""
+
+
+def test_extract_fonts_from_oxml_collects_every_typeface():
+    assert sorted(extract_fonts_from_oxml(SLIDE_XML)) == [
+        "Montserrat Bold",
+        "Noto Sans Arabic",
+        "Symbol",
+        "Wingdings",
+    ]
+    assert extract_fonts_from_oxml("<p:sld") == []
+
+
+def test_get_slide_fonts_matches_extracting_the_archive(tmp_path):
+    pptx_path = str(tmp_path / "deck.pptx")
+    create_pptx(pptx_path, 12, runs_per_slide=6)
+
+    slide_names, slide_fonts = _get_slide_fonts(pptx_path)
+
+    assert slide_names == [f"ppt/slides/slide{i}.xml" for i in range(1, 13)]
+    assert slide_fonts == legacy_get_slide_fonts(pptx_path, str(tmp_path))
+
+
+def test_process_pptx_fonts_reads_fonts_from_archive(tmp_path, monkeypatch):
+    pptx_path = str(tmp_path / "deck.pptx")
+    create_pptx(pptx_path, 3, runs_per_slide=2)
+
+    async def check_google_font_availability(font_name):
+        return font_name != "Playfair Display"
+
+    monkeypatch.setattr(
+        pptx_slides, "check_google_font_availability", check_google_font_availability
+    )
+
+    app = FastAPI()
+    app.include_router(PPTX_FONTS_ROUTER)
+    with open(pptx_path, "rb") as f:
+        response = TestClient(app).post(
+            "/pptx-fonts/process",
+            files={"pptx_file": ("deck.pptx", f, PPTX_CONTENT_TYPE)},
+        )
+
+    assert response.status_code == 200
+    supported_fonts = response.json()["fonts"]["internally_supported_fonts"]
+    assert sorted(font["name"] for font in supported_fonts) == [
+        "Lato",
+        "Montserrat",
+        "Open Sans",
+        "Roboto",
+    ]
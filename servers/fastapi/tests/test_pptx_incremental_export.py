@@ -0,0 +1,151 @@
+import asyncio
+import os
+import shutil
+import uuid
+
+from pptx import Presentation
+from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE
+from PIL import Image
+
+from models.pptx_models import (
+    PptxAutoShapeBoxModel,
+    PptxFillModel,
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+)
+from services import pptx_presentation_creator
+from services.pptx_presentation_creator import PptxPresentationCreator
+
+
+def create_pptx_model(image_path: str, colors: list) -> PptxPresentationModel:
+    return PptxPresentationModel(
+        slides=[
+            PptxSlideModel(
+                note=f"Slide {index}",
+                shapes=[
+                    PptxAutoShapeBoxModel(
+                        type=MSO_AUTO_SHAPE_TYPE.RECTANGLE,
+                        position=PptxPositionModel(
+                            left=20, top=20, width=100, height=100
+                        ),
+                        fill=PptxFillModel(color=color, opacity=1),
+                    ),
+                    PptxPictureBoxModel(
+                        position=PptxPositionModel(
+                            left=200, top=20, width=120, height=80
+                        ),
+                        clip=False,
+                        picture=PptxPictureModel(is_network=False, path=image_path),
+                    ),
+                ],
+            )
+            for index, color in enumerate(colors)
+        ]
+    )
+
+
+def export(tmp_path, name: str, colors: list, incremental: bool):
+    image_path = str(tmp_path / "photo.png")
+    pptx_creator = PptxPresentationCreator(
+        create_pptx_model(image_path, colors), str(tmp_path), incremental=incremental
+    )
+    restored_slides = []
+    restore_cached_slide = pptx_creator.restore_cached_slide
+    pptx_creator.restore_cached_slide = lambda *args: (
+        restored_slides.append(args),
+        restore_cached_slide(*args),
+    )
+    pptx_creator.build_slides()
+    pptx_path = str(tmp_path / name)
+    pptx_creator.save(pptx_path)
+    return pptx_path, len(restored_slides)
+
+
+def get_slides_summary(pptx_path: str):
+    return [
+        (
+            [
+                (shape.shape_type, shape.left, shape.top, shape.width, shape.height)
+                for shape in slide.shapes
+            ],
+            [
+                shape.fill.fore_color.rgb
+                for shape in slide.shapes
+                if shape.shape_type == 1
+            ],
+            [shape.image.sha1 for shape in slide.shapes if shape.shape_type == 13],
+            slide.notes_slide.notes_text_frame.text,
+        )
+        for slide in Presentation(pptx_path).slides
+    ]
+
+
+def test_incremental_export_restores_unchanged_slides(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path / "app_data"))
+    monkeypatch.setattr(pptx_presentation_creator, "_SLIDE_CACHE", None)
+    monkeypatch.setattr(pptx_presentation_creator, "_SLIDE_MEDIA_CACHE", None)
+    Image.new("RGB", (300, 200), (255, 0, 0)).save(tmp_path / "photo.png")
+
+    full_path, _ = export(tmp_path, "full.pptx", ["FF0000", "00FF00", "0000FF"], False)
+    _, first_restored = export(
+        tmp_path, "first.pptx", ["FF0000", "00FF00", "0000FF"], True
+    )
+    second_path, second_restored = export(
+        tmp_path, "second.pptx", ["FF0000", "00FF00", "0000FF"], True
+    )
+    edited_path, edited_restored = export(
+        tmp_path, "edited.pptx", ["FF0000", "FFFF00", "0000FF"], True
+    )
+
+    assert first_restored == 0
+    assert second_restored == 3
+    assert edited_restored == 2
+    assert get_slides_summary(second_path) == get_slides_summary(full_path)
+
+    edited_summary = get_slides_summary(edited_path)
+    assert str(edited_summary[1][1][0]) == "FFFF00"
+    assert edited_summary[0] == get_slides_summary(full_path)[0]
+
+
+def test_incremental_export_skips_downloads_of_restored_slides(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path / "app_data"))
+    monkeypatch.setattr(pptx_presentation_creator, "_SLIDE_CACHE", None)
+    monkeypatch.setattr(pptx_presentation_creator, "_SLIDE_MEDIA_CACHE", None)
+    Image.new("RGB", (300, 200), (255, 0, 0)).save(tmp_path / "photo.png")
+    downloaded_urls = []
+
+    async def download_files(urls, save_directory):
+        downloaded_urls.extend(urls)
+        paths = []
+        for url in urls:
+            path = os.path.join(save_directory, f"{uuid.uuid4()}.png")
+            shutil.copy(tmp_path / "photo.png", path)
+            paths.append(path)
+        return paths
+
+    monkeypatch.setattr(pptx_presentation_creator, "download_files", download_files)
+
+    def export_network_model(name: str, colors: list):
+        pptx_creator = PptxPresentationCreator(
+            create_pptx_model("https://example.com/photo.png", colors),
+            str(tmp_path),
+            incremental=True,
+        )
+        asyncio.run(pptx_creator.create_ppt())
+        pptx_creator.save(str(tmp_path / name))
+
+    export_network_model("first.pptx", ["FF0000", "00FF00", "0000FF"])
+    assert len(downloaded_urls) == 3
+
+    downloaded_urls.clear()
+    export_network_model("edited.pptx", ["FF0000", "FFFF00", "0000FF"])
+    # Only the edited slide fetches its picture
+    assert downloaded_urls == ["https://example.com/photo.png"]
+    first_summary = get_slides_summary(str(tmp_path / "first.pptx"))
+    edited_summary = get_slides_summary(str(tmp_path / "edited.pptx"))
+    assert [each[2] for each in edited_summary] == [each[2] for each in first_summary]
@@ -0,0 +1,144 @@
+import os
+from unittest.mock import patch
+
+from PIL import Image
+from pptx import Presentation
+
+from models.pptx_models import (
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+)
+from services import pptx_presentation_creator
+from services.pptx_presentation_creator import PptxPresentationCreator
+
+
+def create_pptx_model(image_path: str, n_slides: int) -> PptxPresentationModel:
+    return PptxPresentationModel(
+        slides=[
+            PptxSlideModel(
+                shapes=[
+                    PptxPictureBoxModel(
+                        position=PptxPositionModel(
+                            left=0, top=0, width=120, height=80
+                        ),
+                        border_radius=[10, 10, 10, 10],
+                        picture=PptxPictureModel(is_network=False, path=image_path),
+                    )
+                ]
+            )
+            for _ in range(n_slides)
+        ]
+    )
+
+
+def build_pptx(image_path: str, temp_dir: str, n_slides: int):
+    pptx_creator = PptxPresentationCreator(
+        create_pptx_model(image_path, n_slides), temp_dir
+    )
+    with patch.object(
+        PptxPresentationCreator,
+        "process_picture",
+        autospec=True,
+        side_effect=PptxPresentationCreator.process_picture,
+    ) as process_picture:
+        pptx_creator.build_slides()
+    return pptx_creator, process_picture.call_count
+
+
+def test_repeated_pictures_are_processed_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path / "app_data"))
+    monkeypatch.setattr(pptx_presentation_creator, "_PICTURE_CACHE", None)
+    image_path = str(tmp_path / "logo.png")
+    Image.new("RGB", (300, 200), (255, 0, 0)).save(image_path)
+
+    first_export_dir = tmp_path / "first"
+    first_export_dir.mkdir()
+    pptx_creator, first_calls = build_pptx(image_path, str(first_export_dir), 5)
+    pptx_path = str(tmp_path / "deck.pptx")
+    pptx_creator.save(pptx_path)
+
+    second_export_dir = tmp_path / "second"
+    second_export_dir.mkdir()
+    _, second_calls = build_pptx(image_path, str(second_export_dir), 5)
+
+    assert first_calls == 1
+    assert second_calls == 0
+    assert len(list(first_export_dir.iterdir())) == 1
+
+    image_parts = {
+        shape.image.sha1
+        for slide in Presentation(pptx_path).slides
+        for shape in slide.shapes
+    }
+    assert len(image_parts) == 1
+
+
+def test_changed_source_image_is_processed_again(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path / "app_data"))
+    monkeypatch.setattr(pptx_presentation_creator, "_PICTURE_CACHE", None)
+    image_path = str(tmp_path / "logo.png")
+
+    Image.new("RGB", (300, 200), (255, 0, 0)).save(image_path)
+    _, first_calls = build_pptx(image_path, str(tmp_path), 1)
+    Image.new("RGB", (300, 200), (0, 0, 255)).save(image_path)
+    _, second_calls = build_pptx(image_path, str(tmp_path), 1)
+
+    assert first_calls == 1
+    assert second_calls == 1
+
+
+def test_image_dpi_downsamples_and_recompresses_pictures(tmp_path, monkeypatch):
+    monkeypatch.delenv("APP_DATA_DIRECTORY", raising=False)
+    opaque_path = str(tmp_path / "photo.png")
+    Image.new("RGB", (2000, 1500), (0, 128, 255)).save(opaque_path)
+    transparent_path = str(tmp_path / "logo.png")
+    Image.new("RGBA", (2000, 1500), (0, 128, 255, 0)).save(transparent_path)
+
+    pptx_model = create_pptx_model(opaque_path, 1)
+    pptx_model.slides[0].shapes[0].border_radius = None
+    pptx_model.slides[0].shapes.append(
+        PptxPictureBoxModel(
+            position=PptxPositionModel(left=0, top=0, width=120, height=80),
+            clip=False,
+            picture=PptxPictureModel(is_network=False, path=transparent_path),
+        )
+    )
+    pptx_creator = PptxPresentationCreator(pptx_model, str(tmp_path), image_dpi=144)
+    pptx_creator.build_slides()
+
+    processed_pictures = list(pptx_creator._processed_pictures.values())
+    assert sorted(os.path.splitext(path)[1] for path in processed_pictures) == [
+        ".jpg",
+        ".png",
+    ]
+    for path in processed_pictures:
+        assert Image.open(path).size == (240, 160)
+
+
+def test_image_dpi_does_not_upscale_small_pictures(tmp_path, monkeypatch):
+    monkeypatch.delenv("APP_DATA_DIRECTORY", raising=False)
+    image_path = str(tmp_path / "small.png")
+    Image.new("RGB", (150, 100), (0, 128, 255)).save(image_path)
+
+    pptx_model = create_pptx_model(image_path, 1)
+    pptx_creator = PptxPresentationCreator(pptx_model, str(tmp_path), image_dpi=300)
+    pptx_creator.build_slides()
+
+    (path,) = pptx_creator._processed_pictures.values()
+    assert Image.open(path).size == (150, 100)
+
+
+def test_image_dpi_keeps_pictures_smaller_than_their_box(tmp_path, monkeypatch):
+    monkeypatch.delenv("APP_DATA_DIRECTORY", raising=False)
+    image_path = str(tmp_path / "thumbnail.png")
+    Image.new("RGB", (60, 40), (0, 128, 255)).save(image_path)
+
+    pptx_model = create_pptx_model(image_path, 1)
+    pptx_creator = PptxPresentationCreator(pptx_model, str(tmp_path), image_dpi=300)
+    pptx_creator.build_slides()
+
+    (path,) = pptx_creator._processed_pictures.values()
+    assert Image.open(path).size == (60, 40)
@@ -0,0 +1,164 @@
+import json
+import os
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from PIL import Image
+from pptx import Presentation
+from pptx.util import Inches
+
+from api.v1.ppt.endpoints import pptx_slides
+from api.v1.ppt.endpoints.pptx_slides import PPTX_SLIDES_ROUTER
+from services.libreoffice_pool_service import LIBREOFFICE_POOL_SERVICE
+from services.temp_file_service import TEMP_FILE_SERVICE
+
+PPTX_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+)
+
+
+def create_pptx(path, fonts):
+    presentation = Presentation()
+    for font in fonts:
+        slide = presentation.slides.add_slide(presentation.slide_layouts[6])
+        text_box = slide.shapes.add_textbox(
+            Inches(1), Inches(1), Inches(4), Inches(1)
+        )
+        run = text_box.text_frame.paragraphs[0].add_run()
+        run.text = font
+        run.font.name = font
+    presentation.save(path)
+    return str(path)
+
+
+def parse_events(body: str):
+    events = []
+    for message in body.strip().split("\n\n"):
+        _, data = message.split("\n", 1)
+        events.append(json.loads(data.removeprefix("data: ")))
+    return events
+
+
+def test_stream_pptx_slides_emits_each_slide(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path / "app_data"))
+    pptx_path = create_pptx(
+        tmp_path / "deck.pptx", ["Montserrat Bold", "Open Sans", "Montserrat"]
+    )
+    converted = {}
+
+    async def convert_to_pdf(input_path, output_directory, font_aliases=None):
+        converted["font_aliases"] = font_aliases
+        pdf_path = os.path.join(output_directory, "presentation.pdf")
+        pages = [Image.new("RGB", (320, 180), (i * 60, 90, 120)) for i in range(3)]
+        pages[0].save(pdf_path, "PDF", save_all=True, append_images=pages[1:])
+        return pdf_path
+
+    async def check_google_font_availability(font_name):
+        return font_name == "Montserrat"
+
+    monkeypatch.setattr(LIBREOFFICE_POOL_SERVICE, "convert_to_pdf", convert_to_pdf)
+    monkeypatch.setattr(
+        pptx_slides, "check_google_font_availability", check_google_font_availability
+    )
+
+    app = FastAPI()
+    app.include_router(PPTX_SLIDES_ROUTER)
+    with open(pptx_path, "rb") as f:
+        response = TestClient(app).post(
+            "/pptx-slides/process/stream",
+            files={"pptx_file": ("deck.pptx", f, PPTX_CONTENT_TYPE)},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(response.text)
+    assert [event["type"] for event in events] == [
+        "status",
+        "status",
+        "slide",
+        "slide",
+        "slide",
+        "complete",
+    ]
+
+    slides = [event["slide"] for event in events if event["type"] == "slide"]
+    assert [slide["slide_number"] for slide in slides] == [1, 2, 3]
+    assert [slide["normalized_fonts"] for slide in slides] == [
+        ["Montserrat"],
+        ["Open Sans"],
+        ["Montserrat"],
+    ]
+    assert 'typeface="Open Sans"' in slides[1]["xml_content"]
+    for slide in slides:
+        screenshot_path = str(tmp_path / "app_data") + slide["screenshot_url"][
+            len("/app_data") :
+        ]
+        assert os.path.getsize(screenshot_path) > 0
+
+    assert converted["font_aliases"] == {"Montserrat Bold": "Montserrat"}
+    assert events[-1]["pptx_slides"]["total_slides"] == 3
+    assert events[-1]["pptx_slides"]["fonts"]["internally_supported_fonts"] == [
+        {
+            "name": "Montserrat",
+            "google_fonts_url": "https://fonts.googleapis.com/css2?family=Montserrat&display=swap",
+        }
+    ]
+
+
+def test_stream_pptx_slides_reports_conversion_errors(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path / "app_data"))
+    pptx_path = create_pptx(tmp_path / "deck.pptx", ["Open Sans"])
+
+    async def convert_to_pdf(input_path, output_directory, font_aliases=None):
+        raise Exception("LibreOffice PDF conversion failed: boom")
+
+    async def check_google_font_availability(font_name):
+        return True
+
+    monkeypatch.setattr(LIBREOFFICE_POOL_SERVICE, "convert_to_pdf", convert_to_pdf)
+    monkeypatch.setattr(
+        pptx_slides, "check_google_font_availability", check_google_font_availability
+    )
+
+    app = FastAPI()
+    app.include_router(PPTX_SLIDES_ROUTER)
+    with open(pptx_path, "rb") as f:
+        response = TestClient(app).post(
+            "/pptx-slides/process/stream",
+            files={"pptx_file": ("deck.pptx", f, PPTX_CONTENT_TYPE)},
+        )
+
+    events = parse_events(response.text)
+    assert events[-1]["type"] == "error"
+    assert "boom" in events[-1]["detail"]
+
+
+def test_stream_pptx_slides_removes_temp_dir_when_fonts_fail(tmp_path, monkeypatch):
+    pptx_path = create_pptx(tmp_path / "deck.pptx", ["Open Sans"])
+    temp_dirs = []
+    create_temp_dir = TEMP_FILE_SERVICE.create_temp_dir
+
+    def tracked_create_temp_dir(*args):
+        temp_dirs.append(create_temp_dir(*args))
+        return temp_dirs[-1]
+
+    async def install_fonts(fonts, temp_dir):
+        raise HTTPException(status_code=400, detail="Invalid font file")
+
+    monkeypatch.setattr(TEMP_FILE_SERVICE, "create_temp_dir", tracked_create_temp_dir)
+    monkeypatch.setattr(pptx_slides, "_install_fonts", install_fonts)
+
+    app = FastAPI()
+    app.include_router(PPTX_SLIDES_ROUTER)
+    with open(pptx_path, "rb") as f:
+        response = TestClient(app).post(
+            "/pptx-slides/process/stream",
+            files=[
+                ("pptx_file", ("deck.pptx", f, PPTX_CONTENT_TYPE)),
+                ("fonts", ("font.ttf", b"font", "font/ttf")),
+            ],
+        )
+
+    assert response.status_code == 400
+    assert len(temp_dirs) == 1
+    assert not os.path.exists(temp_dirs[0])
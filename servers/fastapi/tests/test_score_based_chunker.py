@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+from tests.chunker_reference import (
+    create_markdown,
+    legacy_extract_headings,
+    legacy_get_n_chunks,
+)
+from services.score_based_chunker import ScoreBasedChunker, estimate_tokens
+
+
+def test_chunks_match_legacy_chunker():
+    chunker = ScoreBasedChunker()
+    text = create_markdown(200) + "\n  ## Indented heading\r\nBody\n#"
+
+    assert chunker.extract_headings(text) == legacy_extract_headings(text)
+    for top_k in (1, 2, 7, 50, 500):
+        assert chunker._get_n_chunks(text, top_k) == legacy_get_n_chunks(text, top_k)
+
+
+def test_get_n_chunks_raises_when_too_few_chunks():
+    with pytest.raises(ValueError, match="Only 1 chunks found, requested 2"):
+        asyncio.run(ScoreBasedChunker().get_n_chunks("# Only\nBody", 2))
+
+
+def test_token_budget_fills_budget_with_best_scored_sections():
+    text = "\n".join(
+        [
+            "Intro",
+            "# Overview",
+            "a" * 40,
+            "#### Detail",
+            "b" * 400,
+            "## Results",
+            "c" * 40,
+            "##### Footnote",
+            "d" * 4,
+        ]
+    )
+    chunker = ScoreBasedChunker()
+
+    chunks = chunker.get_chunks_within_token_budget(text, 33)
+
+    # Detail does not fit the budget, the smaller Footnote still does
+    assert [chunk.heading for chunk in chunks] == [
+        "",
+        "# Overview",
+        "## Results",
+        "##### Footnote",
+    ]
+    assert [chunk.content for chunk in chunks[:2]] == ["Intro", "a" * 40]
+    assert sum(estimate_tokens(c.heading) + estimate_tokens(c.content) for c in chunks) <= 33
+
+    assert asyncio.run(chunker.get_chunks_for_token_budget(text, 0)) == []
+
+
+def test_context_within_token_budget_keeps_small_text_and_best_sections():
+    chunker = ScoreBasedChunker()
+    text = "# Overview\n" + "a" * 40 + "\n#### Detail\n" + "b" * 400
+
+    assert chunker.get_context_within_token_budget(text, 200) == text
+    assert (
+        asyncio.run(chunker.get_context_for_token_budget(text, 20))
+        == "# Overview\n" + "a" * 40
+    )
+    assert (
+        chunker.get_context_within_token_budget("Title\n\n" + text, 20)
+        == "Title\n\n# Overview\n" + "a" * 40
+    )
+
+
+def test_context_within_token_budget_cuts_sections_that_do_not_fit():
+    chunker = ScoreBasedChunker()
+    text = "# First\n" + "a" * 4000 + "\n# Second\n" + "b" * 4000
+
+    assert chunker.get_context_within_token_budget(text, 100) == (
+        "# First\n" + "a" * 392
+    )
+    assert chunker.get_context_within_token_budget("c" * 400, 10) == "c" * 40
@@ -0,0 +1,84 @@
+import asyncio
+from datetime import datetime
+import json
+from unittest.mock import AsyncMock, MagicMock
+import uuid
+
+import pytest
+
+from api.v1.ppt.endpoints import presentation as presentation_endpoints
+from models.sql.presentation import PresentationModel
+
+# Slides finish in the order 1, 2, 0
+SLIDE_DELAYS = [0.06, 0.02, 0.04]
+
+
+@pytest.fixture
+def sql_session(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+
+    async def get_slide_content(slide_layout, *args):
+        index = int(slide_layout.id.split("-")[1])
+        await asyncio.sleep(SLIDE_DELAYS[index])
+        return {"title": f"Slide {index}"}
+
+    monkeypatch.setattr(
+        presentation_endpoints,
+        "get_slide_content_from_type_and_outline",
+        get_slide_content,
+    )
+    monkeypatch.setattr(
+        presentation_endpoints,
+        "process_slide_and_fetch_assets",
+        AsyncMock(return_value=[]),
+    )
+    monkeypatch.setattr(
+        presentation_endpoints, "process_slide_add_placeholder_assets", MagicMock()
+    )
+    monkeypatch.setattr(presentation_endpoints, "get_llm_concurrency", lambda: 3)
+
+    presentation = PresentationModel(
+        content="",
+        n_slides=3,
+        language="English",
+        outlines={"slides": [{"content": f"Outline {i}"} for i in range(3)]},
+        layout={
+            "name": "general",
+            "slides": [{"id": f"layout-{i}", "json_schema": {}} for i in range(3)],
+        },
+        structure={"slides": [0, 1, 2]},
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    )
+    session = MagicMock()
+    session.get = AsyncMock(return_value=presentation)
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+    return session
+
+
+def get_slide_chunks(sql_session, ordered: bool):
+    async def run():
+        response = await presentation_endpoints.stream_presentation(
+            uuid.uuid4(), ordered, sql_session
+        )
+        return [event async for event in response.body_iterator]
+
+    events = [json.loads(event.split("data: ", 1)[1]) for event in asyncio.run(run())]
+    assert events[-1]["type"] == "complete"
+    # The first and last chunks open and close the slides array
+    return [event for event in events if event.get("type") == "chunk"][1:-1]
+
+
+def test_ordered_stream_emits_slides_in_index_order(sql_session):
+    chunks = get_slide_chunks(sql_session, ordered=True)
+
+    assert [json.loads(chunk["chunk"])["index"] for chunk in chunks] == [0, 1, 2]
+    assert all("index" not in chunk for chunk in chunks)
+
+
+def test_unordered_stream_emits_slides_as_they_finish(sql_session):
+    chunks = get_slide_chunks(sql_session, ordered=False)
+
+    assert [chunk["index"] for chunk in chunks] == [1, 2, 0]
+    assert [json.loads(chunk["chunk"])["index"] for chunk in chunks] == [1, 2, 0]
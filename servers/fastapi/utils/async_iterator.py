@@ -1,7 +1,17 @@
 import asyncio
-from typing import AsyncGenerator, Callable, Iterator, TypeVar
+from typing import (
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
 T = TypeVar("T")
+R = TypeVar("R")
 
 
 def iterator_to_async(
@@ -14,3 +24,46 @@ def iterator_to_async(
             await asyncio.sleep(0)
 
     return wrapper
+
+
+async def bounded_as_completed(
+    items: Sequence[T],
+    worker: Callable[[int, T], Awaitable[R]],
+    limit: int,
+) -> AsyncGenerator[Tuple[int, R], None]:
+    """
+    Runs worker over items keeping at most `limit` calls in flight.
+    A new item is started as soon as any slot frees up, and (index, result)
+    pairs are yielded in completion order. The first failure cancels the rest,
+    and every started call has finished once the generator is closed.
+    """
+    limit = max(1, limit)
+    pending_items = iter(enumerate(items))
+    running: Dict[asyncio.Task, int] = {}
+
+    def start_next():
+        try:
+            index, item = next(pending_items)
+        except StopIteration:
+            return
+        running[asyncio.ensure_future(worker(index, item))] = index
+
+    try:
+        for _ in range(limit):
+            start_next()
+
+        while running:
+            done, _ = await asyncio.wait(
+                running.keys(), return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                index = running.pop(task)
+                result = task.result()
+                start_next()
+                yield index, result
+    finally:
+        for task in running:
+            task.cancel()
+        # Also retrieves the exceptions of calls that failed in the same wait
+        # as the one raised, so asyncio does not log them as never retrieved
+        await asyncio.gather(*running, return_exceptions=True)
@@ -1,57 +1,217 @@
 import asyncio
+import hashlib
 import os
 import mimetypes
-from typing import List, Optional
+import time
+from typing import Dict, List, Optional
 from urllib.parse import urlparse
 
 import aiohttp
 
 import uuid
 
+from services.disk_cache_service import DiskCacheService, link_or_copy_file
+from services.http_client_service import HTTP_CLIENT_SERVICE
+from utils.asset_directory_utils import get_cache_directory
+from utils.get_env import (
+    get_app_data_directory_env,
+    get_download_cache_max_size_mb_env,
+)
+
+DOWNLOAD_MAX_CONCURRENCY_PER_HOST = 6
+DOWNLOAD_MAX_RETRIES = 3
+# Seconds before the first retry, doubled on every further attempt
+DOWNLOAD_RETRY_BACKOFF = 0.5
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+DEFAULT_DOWNLOAD_CACHE_MAX_SIZE_MB = 512
+# Cached downloads are reused without revalidating against the server
+# for this long, after which they are revalidated with their ETag
+DOWNLOAD_CACHE_FRESHNESS = 24 * 60 * 60
+
+_DOWNLOAD_CACHE: Optional[DiskCacheService] = None
+
+_HOST_SEMAPHORES: Dict[str, asyncio.Semaphore] = {}
+_HOST_SEMAPHORES_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+class RetryableDownloadError(Exception):
+    pass
+
+
+def get_download_cache() -> Optional[DiskCacheService]:
+    global _DOWNLOAD_CACHE
+    if not get_app_data_directory_env():
+        return None
+    if _DOWNLOAD_CACHE is None:
+        _DOWNLOAD_CACHE = DiskCacheService(
+            get_cache_directory("downloads"),
+            max_size_bytes=int(
+                get_download_cache_max_size_mb_env()
+                or DEFAULT_DOWNLOAD_CACHE_MAX_SIZE_MB
+            )
+            * 1024
+            * 1024,
+        )
+    return _DOWNLOAD_CACHE
+
+
+def get_download_cache_key(url: str, headers: Optional[dict] = None) -> str:
+    key = url
+    if headers:
+        key += "|" + "|".join(f"{k}={v}" for k, v in sorted(headers.items()))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def get_host_semaphore(host: str) -> asyncio.Semaphore:
+    global _HOST_SEMAPHORES_LOOP
+    loop = asyncio.get_running_loop()
+    # Semaphores are bound to the event loop they are first used on
+    if _HOST_SEMAPHORES_LOOP is not loop:
+        _HOST_SEMAPHORES.clear()
+        _HOST_SEMAPHORES_LOOP = loop
+    if host not in _HOST_SEMAPHORES:
+        _HOST_SEMAPHORES[host] = asyncio.Semaphore(DOWNLOAD_MAX_CONCURRENCY_PER_HOST)
+    return _HOST_SEMAPHORES[host]
+
+
+def get_download_filename(url: str, response_headers) -> str:
+    filename = os.path.basename(urlparse(url).path)
+    if filename and "." in filename:
+        return filename
+
+    content_disposition = response_headers.get("Content-Disposition", "")
+    if "filename=" in content_disposition:
+        return content_disposition.split("filename=")[1].strip("\"'")
+
+    content_type = response_headers.get("Content-Type", "")
+    if content_type:
+        extension = mimetypes.guess_extension(content_type.split(";")[0])
+        if extension:
+            return f"{uuid.uuid4()}{extension}"
+
+    return filename or str(uuid.uuid4())
+
+
+def restore_cached_download(cached: dict, save_directory: str) -> str:
+    save_path = os.path.join(save_directory, cached["filename"])
+    link_or_copy_file(cached["path"], save_path)
+    return save_path
+
+
+async def write_response_to_file(response: aiohttp.ClientResponse, save_path: str):
+    # Written to a temporary file so a failed attempt never leaves a
+    # truncated image behind
+    partial_path = f"{save_path}.part"
+    file = await asyncio.to_thread(open, partial_path, "wb")
+    try:
+        async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+            await asyncio.to_thread(file.write, chunk)
+    finally:
+        await asyncio.to_thread(file.close)
+    await asyncio.to_thread(os.replace, partial_path, save_path)
+
+
+async def download_file_once(
+    url: str,
+    save_directory: str,
+    headers: Optional[dict],
+    cached: Optional[dict],
+) -> Optional[str]:
+    request_headers = dict(headers or {})
+    if cached and cached.get("etag"):
+        request_headers["If-None-Match"] = cached["etag"]
+
+    session = HTTP_CLIENT_SERVICE.get_session(trust_env=True)
+    async with session.get(url, headers=request_headers) as response:
+        if response.status == 304 and cached:
+            try:
+                save_path = await asyncio.to_thread(
+                    restore_cached_download, cached, save_directory
+                )
+            except FileNotFoundError:
+                save_path = None
+            etag = cached["etag"]
+        elif response.status >= 500:
+            raise RetryableDownloadError(f"HTTP status {response.status}")
+        elif response.status != 200:
+            print(f"Failed to download file. HTTP status: {response.status}")
+            return None
+        else:
+            save_path = os.path.join(
+                save_directory, get_download_filename(url, response.headers)
+            )
+            await write_response_to_file(response, save_path)
+            etag = response.headers.get("ETag")
+
+    if save_path is None:
+        # Evicted while it was revalidated, downloaded again in full
+        return await download_file_once(url, save_directory, headers, None)
+
+    download_cache = get_download_cache()
+    if download_cache:
+        # set() may also evict, which scans the cache directory
+        await asyncio.to_thread(
+            download_cache.set,
+            get_download_cache_key(url, headers),
+            {
+                "url": url,
+                "etag": etag,
+                "filename": os.path.basename(save_path),
+                "validated_at": time.time(),
+            },
+            source_path=save_path,
+        )
+    print(f"File downloaded successfully: {save_path}")
+    return save_path
+
 
 async def download_file(
     url: str, save_directory: str, headers: Optional[dict] = None
 ) -> Optional[str]:
+    """
+    Downloads url into save_directory and returns the saved path, or None
+    if the download failed.
+
+    Downloads are cached on disk by URL. A cached file is reused as is for
+    DOWNLOAD_CACHE_FRESHNESS seconds and revalidated with its ETag after
+    that. Server errors and timeouts are retried with exponential backoff.
+    """
     try:
         os.makedirs(save_directory, exist_ok=True)
 
-        parsed_url = urlparse(url)
-        filename = os.path.basename(parsed_url.path)
-
-        if not filename or "." not in filename:
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.head(url, headers=headers) as response:
-                    if response.status == 200:
-                        content_disposition = response.headers.get(
-                            "Content-Disposition", ""
-                        )
-                        if "filename=" in content_disposition:
-                            filename = content_disposition.split("filename=")[1].strip(
-                                "\"'"
-                            )
-                        else:
-                            content_type = response.headers.get("Content-Type", "")
-                            if content_type:
-                                extension = mimetypes.guess_extension(
-                                    content_type.split(";")[0]
-                                )
-                                if extension:
-                                    filename = f"{uuid.uuid4()}{extension}"
-
-        filename = filename or str(uuid.uuid4())
-        save_path = os.path.join(save_directory, filename)
-
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    with open(save_path, "wb") as file:
-                        async for chunk in response.content.iter_chunked(8192):
-                            file.write(chunk)
-                    print(f"File downloaded successfully: {save_path}")
-                    return save_path
-                else:
-                    print(f"Failed to download file. HTTP status: {response.status}")
-                    return None
+        download_cache = get_download_cache()
+        cached = (
+            await asyncio.to_thread(
+                download_cache.get, get_download_cache_key(url, headers)
+            )
+            if download_cache
+            else None
+        )
+        if cached and time.time() - cached["validated_at"] < DOWNLOAD_CACHE_FRESHNESS:
+            try:
+                return await asyncio.to_thread(
+                    restore_cached_download, cached, save_directory
+                )
+            except FileNotFoundError:
+                # Evicted since it was looked up
+                cached = None
+
+        async with get_host_semaphore(urlparse(url).netloc):
+            for attempt in range(DOWNLOAD_MAX_RETRIES + 1):
+                try:
+                    return await download_file_once(
+                        url, save_directory, headers, cached
+                    )
+                except (
+                    RetryableDownloadError,
+                    aiohttp.ClientConnectionError,
+                    asyncio.TimeoutError,
+                ) as e:
+                    if attempt == DOWNLOAD_MAX_RETRIES:
+                        raise
+                    print(f"Retrying download of {url} after error: {e}")
+                    await asyncio.sleep(DOWNLOAD_RETRY_BACKOFF * 2**attempt)
 
     except Exception as e:
         print(f"Error downloading file from {url}: {e}")
@@ -61,17 +221,22 @@ async def download_file(
 async def download_files(
     urls: List[str], save_directory: str, headers: Optional[dict] = None
 ) -> List[Optional[str]]:
-    print(f"Starting download of {len(urls)} files to {save_directory}")
-    coroutines = [download_file(url, save_directory, headers) for url in urls]
+    unique_urls = list(dict.fromkeys(urls))
+    print(
+        f"Starting download of {len(unique_urls)} files ({len(urls)} requested) to {save_directory}"
+    )
+    coroutines = [download_file(url, save_directory, headers) for url in unique_urls]
     results = await asyncio.gather(*coroutines, return_exceptions=True)
-    final_results = []
-    for i, result in enumerate(results):
+
+    paths_by_url = {}
+    for url, result in zip(unique_urls, results):
         if isinstance(result, Exception):
-            print(f"Exception during download of {urls[i]}: {result}")
-            final_results.append(None)
+            print(f"Exception during download of {url}: {result}")
+            paths_by_url[url] = None
         else:
-            final_results.append(result)
+            paths_by_url[url] = result
 
+    final_results = [paths_by_url[url] for url in urls]
     successful_downloads = sum(1 for result in final_results if result is not None)
     print(
         f"Download completed: {successful_downloads}/{len(urls)} files downloaded successfully"
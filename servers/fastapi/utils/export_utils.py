@@ -1,67 +1,114 @@
 import json
 import os
-import aiohttp
-from typing import Literal
+from typing import Literal, Optional
 import uuid
 from fastapi import HTTPException
 from pathvalidate import sanitize_filename
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
 
 from models.pptx_models import PptxPresentationModel
 from models.presentation_and_path import PresentationAndPath
-from services.pptx_presentation_creator import PptxPresentationCreator
+from models.sql.presentation import PresentationModel
+from models.sql.slide import SlideModel
+from services.export_cache_service import (
+    EXPORT_CACHE_SERVICE,
+    get_presentation_content_hash,
+)
+from services.export_executor_service import EXPORT_EXECUTOR_SERVICE
+from services.http_client_service import HTTP_CLIENT_SERVICE
 from services.temp_file_service import TEMP_FILE_SERVICE
 from utils.asset_directory_utils import get_exports_directory
 import uuid
 
 
 async def export_presentation(
-    presentation_id: uuid.UUID, title: str, export_as: Literal["pptx", "pdf"]
+    presentation_id: uuid.UUID,
+    title: str,
+    export_as: Literal["pptx", "pdf"],
+    image_dpi: Optional[int] = None,
+    incremental: bool = False,
 ) -> PresentationAndPath:
     if export_as == "pptx":
 
         # Get the converted PPTX model from the Next.js service
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"http://localhost/api/presentation_to_pptx_model?id={presentation_id}"
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    print(f"Failed to get PPTX model: {error_text}")
-                    raise HTTPException(
-                        status_code=500,
-                        detail="Failed to convert presentation to PPTX model",
-                    )
-                pptx_model_data = await response.json()
+        session = HTTP_CLIENT_SERVICE.get_session()
+        async with session.get(
+            f"http://localhost/api/presentation_to_pptx_model?id={presentation_id}"
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                print(f"Failed to get PPTX model: {error_text}")
+                raise HTTPException(
+                    status_code=500,
+                    detail="Failed to convert presentation to PPTX model",
+                )
+            pptx_model_data = await response.json()
 
         # Create PPTX file using the converted model
         pptx_model = PptxPresentationModel(**pptx_model_data)
         temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
-        pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
-        await pptx_creator.create_ppt()
 
         export_directory = get_exports_directory()
         pptx_path = os.path.join(
             export_directory,
             f"{sanitize_filename(title or str(uuid.uuid4()))}.pptx",
         )
-        pptx_creator.save(pptx_path)
+        await EXPORT_EXECUTOR_SERVICE.export_pptx(
+            pptx_model, temp_dir, pptx_path, image_dpi, incremental
+        )
 
         return PresentationAndPath(
             presentation_id=presentation_id,
             path=pptx_path,
         )
     else:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "http://localhost/api/export-as-pdf",
-                json={
-                    "id": str(presentation_id),
-                    "title": sanitize_filename(title or str(uuid.uuid4())),
-                },
-            ) as response:
-                response_json = await response.json()
+        session = HTTP_CLIENT_SERVICE.get_session()
+        async with session.post(
+            "http://localhost/api/export-as-pdf",
+            json={
+                "id": str(presentation_id),
+                "title": sanitize_filename(title or str(uuid.uuid4())),
+            },
+        ) as response:
+            response_json = await response.json()
 
         return PresentationAndPath(
             presentation_id=presentation_id,
             path=response_json["path"],
         )
+
+
+async def export_presentation_with_cache(
+    sql_session: AsyncSession,
+    presentation: PresentationModel,
+    export_as: Literal["pptx", "pdf"],
+    image_dpi: Optional[int] = None,
+    incremental: bool = False,
+) -> PresentationAndPath:
+    """
+    Returns the previous export of the presentation if none of its slides,
+    layout, title or export options changed since, otherwise exports it.
+    """
+    slides = await sql_session.scalars(
+        select(SlideModel).where(SlideModel.presentation == presentation.id)
+    )
+    content_hash = get_presentation_content_hash(
+        presentation, slides, export_as, image_dpi
+    )
+
+    presentation_and_path = EXPORT_CACHE_SERVICE.get(
+        presentation.id, export_as, content_hash
+    )
+    if presentation_and_path:
+        return presentation_and_path
+
+    presentation_and_path = await export_presentation(
+        presentation.id,
+        presentation.title or str(uuid.uuid4()),
+        export_as,
+        image_dpi,
+        incremental,
+    )
+    EXPORT_CACHE_SERVICE.set(presentation_and_path, export_as, content_hash)
+    return presentation_and_path
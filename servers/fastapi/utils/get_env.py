@@ -111,3 +111,66 @@ def get_openai_model_env():
 
 def get_custom_llm_url_env():
     return os.getenv("CUSTOM_LLM_URL")
+
+def get_llm_concurrency_env():
+    return os.getenv("LLM_CONCURRENCY")
+
+def get_image_cache_max_size_mb_env():
+    return os.getenv("IMAGE_CACHE_MAX_SIZE_MB")
+
+def get_stock_image_cache_ttl_env():
+    return os.getenv("STOCK_IMAGE_CACHE_TTL")
+
+def get_icon_index_backend_env():
+    return os.getenv("ICON_INDEX_BACKEND")
+
+def get_download_cache_max_size_mb_env():
+    return os.getenv("DOWNLOAD_CACHE_MAX_SIZE_MB")
+
+def get_export_workers_env():
+    return os.getenv("EXPORT_WORKERS")
+
+def get_export_queue_depth_env():
+    return os.getenv("EXPORT_QUEUE_DEPTH")
+
+def get_picture_cache_max_size_mb_env():
+    return os.getenv("PICTURE_CACHE_MAX_SIZE_MB")
+
+def get_export_cache_max_size_mb_env():
+    return os.getenv("EXPORT_CACHE_MAX_SIZE_MB")
+
+def get_slide_cache_max_size_mb_env():
+    return os.getenv("SLIDE_CACHE_MAX_SIZE_MB")
+
+def get_libreoffice_path_env():
+    return os.getenv("LIBREOFFICE_PATH")
+
+def get_libreoffice_python_env():
+    return os.getenv("LIBREOFFICE_PYTHON")
+
+def get_libreoffice_pool_size_env():
+    return os.getenv("LIBREOFFICE_POOL_SIZE")
+
+def get_libreoffice_max_jobs_per_instance_env():
+    return os.getenv("LIBREOFFICE_MAX_JOBS_PER_INSTANCE")
+
+def get_libreoffice_conversion_timeout_env():
+    return os.getenv("LIBREOFFICE_CONVERSION_TIMEOUT")
+
+def get_pdf_raster_workers_env():
+    return os.getenv("PDF_RASTER_WORKERS")
+
+def get_docling_workers_env():
+    return os.getenv("DOCLING_WORKERS")
+
+def get_document_cache_max_size_mb_env():
+    return os.getenv("DOCUMENT_CACHE_MAX_SIZE_MB")
+
+def get_document_context_top_k_env():
+    return os.getenv("DOCUMENT_CONTEXT_TOP_K")
+
+def get_document_index_cache_max_size_mb_env():
+    return os.getenv("DOCUMENT_INDEX_CACHE_MAX_SIZE_MB")
+
+def get_outline_context_token_budget_env():
+    return os.getenv("OUTLINE_CONTEXT_TOKEN_BUDGET")
@@ -1,5 +1,7 @@
-from typing import List
+from functools import lru_cache
+from typing import List, Tuple
 
+import numpy as np
 from PIL import Image, ImageDraw
 
 from models.pptx_models import PptxObjectFitEnum, PptxObjectFitModel
@@ -46,6 +48,46 @@ def clip_image(
     return clipped_image
 
 
+@lru_cache(maxsize=64)
+def get_quarter_circle_masks(radius: int) -> Tuple[np.ndarray, ...]:
+    """
+    Returns the top-left, top-right, bottom-right and bottom-left quarters of
+    a filled circle of the given radius as boolean arrays.
+    """
+    circle = Image.new("L", (radius * 2, radius * 2), 0)
+    draw = ImageDraw.Draw(circle)
+    draw.ellipse((0, 0, radius * 2 - 1, radius * 2 - 1), fill=255)
+    circle_mask = np.asarray(circle) > 0
+    return (
+        circle_mask[:radius, :radius],
+        circle_mask[:radius, radius:],
+        circle_mask[radius:, radius:],
+        circle_mask[radius:, :radius],
+    )
+
+
+@lru_cache(maxsize=64)
+def get_circle_mask(size: Tuple[int, int]) -> Image.Image:
+    mask = Image.new("L", size, 0)
+    draw = ImageDraw.Draw(mask)
+
+    # Calculate center position
+    center_x = size[0] // 2
+    center_y = size[1] // 2
+    radius = min(size) // 2
+
+    draw.ellipse(
+        (
+            center_x - radius,
+            center_y - radius,
+            center_x + radius,
+            center_y + radius,
+        ),
+        fill=255,
+    )
+    return mask
+
+
 def round_image_corners(image: Image.Image, radii: List[int]) -> Image.Image:
     if len(radii) != 4:
         raise ValueError(
@@ -62,80 +104,39 @@ def round_image_corners(image: Image.Image, radii: List[int]) -> Image.Image:
     if image.mode != "RGBA":
         image = image.convert("RGBA")
 
-    # Create a mask for the rounded corners (start with fully transparent)
-    rounded_mask = Image.new("L", image.size, 0)
-
-    # Create a rectangular mask (fully opaque)
-    rectangular_mask = Image.new("L", image.size, 255)
-
-    # Process each corner
+    # Pixels outside the rounded corners keep their alpha, the rest are cleared
+    corner_mask = np.ones((h, w), dtype=bool)
     for i, radius in enumerate(clamped_radii):
-        if radius > 0:  # Only process if radius is positive
-            # Create a circle for this radius
-            circle = Image.new("L", (radius * 2, radius * 2), 0)
-            draw = ImageDraw.Draw(circle)
-            draw.ellipse((0, 0, radius * 2 - 1, radius * 2 - 1), fill=255)
-
-            # Calculate position based on corner index
-            if i == 0:  # top-left
-                rounded_mask.paste(circle.crop((0, 0, radius, radius)), (0, 0))
-                rectangular_mask.paste(0, (0, 0, radius, radius))
-            elif i == 1:  # top-right
-                rounded_mask.paste(
-                    circle.crop((radius, 0, radius * 2, radius)), (w - radius, 0)
-                )
-                rectangular_mask.paste(0, (w - radius, 0, w, radius))
-            elif i == 2:  # bottom-right
-                rounded_mask.paste(
-                    circle.crop((radius, radius, radius * 2, radius * 2)),
-                    (w - radius, h - radius),
-                )
-                rectangular_mask.paste(0, (w - radius, h - radius, w, h))
-            else:  # bottom-left
-                rounded_mask.paste(
-                    circle.crop((0, radius, radius, radius * 2)), (0, h - radius)
-                )
-                rectangular_mask.paste(0, (0, h - radius, radius, h))
-
-    # Get the original alpha channel
-    original_alpha = image.getchannel("A")
-
-    # Combine the rectangular mask with the rounded corners
-    corner_mask = Image.composite(rounded_mask, rectangular_mask, rounded_mask)
-
-    # Combine the corner mask with the original alpha channel
-    final_alpha = Image.composite(
-        original_alpha, Image.new("L", image.size, 0), corner_mask
-    )
-
-    # Create a new image with the modified alpha channel
-    result = Image.new("RGBA", image.size)
-    result.paste(image.convert("RGB"), (0, 0))
-    result.putalpha(final_alpha)
-
+        if radius <= 0:
+            continue
+        quarter = get_quarter_circle_masks(radius)[i]
+        if i == 0:  # top-left
+            corner_mask[:radius, :radius] = quarter
+        elif i == 1:  # top-right
+            corner_mask[:radius, w - radius :] = quarter
+        elif i == 2:  # bottom-right
+            corner_mask[h - radius :, w - radius :] = quarter
+        else:  # bottom-left
+            corner_mask[h - radius :, :radius] = quarter
+
+    alpha = np.asarray(image.getchannel("A"))
+    final_alpha = np.where(corner_mask, alpha, 0).astype(np.uint8)
+
+    result = image.copy()
+    result.putalpha(Image.fromarray(final_alpha, "L"))
     return result
 
 
 def invert_image(img: Image.Image) -> Image.Image:
-    # Get image data
-    data = img.getdata()
-
-    # Process each pixel
-    new_data = []
-    for item in data:
-        # Get current pixel values
-        r, g, b, a = item
-
-        # Invert RGB values while preserving transparency
-        if a != 0:  # Skip fully transparent pixels
-            new_data.append((255 - r, 255 - g, 255 - b, a))
-        else:
-            new_data.append((0, 0, 0, 0))
+    data = np.array(img.convert("RGBA"))
+
+    # Invert RGB values while preserving transparency, fully transparent
+    # pixels become (0, 0, 0, 0)
+    transparent = data[..., 3] == 0
+    data[..., :3] = 255 - data[..., :3]
+    data[transparent] = 0
 
-    # Create new image with modified data
-    new_img = Image.new("RGBA", img.size)
-    new_img.putdata(new_data)
-    return new_img
+    return Image.fromarray(data, "RGBA")
 
 
 def create_circle_image(
@@ -143,32 +144,10 @@ def create_circle_image(
 ) -> Image.Image:
     # Convert to RGBA if not already
     img = image.convert("RGBA")
-    # Get the original image size
-    size = img.size
-    # Use the smaller dimension for the circle
-    circle_size = min(size)
-    # Create a transparent image of the same size as original
-    mask = Image.new("RGBA", size, color=(0, 0, 0, 0))
-    draw = ImageDraw.Draw(mask)
 
-    # Calculate center position
-    center_x = size[0] // 2
-    center_y = size[1] // 2
-    radius = circle_size // 2
-
-    # Create a circular mask
-    draw.ellipse(
-        (
-            center_x - radius,
-            center_y - radius,
-            center_x + radius,
-            center_y + radius,
-        ),
-        fill=(255, 255, 255, 255),
-    )
-
-    # Apply the circular mask
-    result = Image.composite(img, mask, mask)
+    # Keep the pixels inside the circle, the rest become fully transparent
+    result = Image.new("RGBA", img.size, (0, 0, 0, 0))
+    result.paste(img, (0, 0), get_circle_mask(img.size))
     return result
 
 
@@ -180,17 +159,11 @@ def set_image_opacity(image: Image.Image, opacity: float) -> Image.Image:
     if image.mode != "RGBA":
         image = image.convert("RGBA")
 
-    # Get the original alpha channel
-    original_alpha = image.getchannel("A")
+    # Scale the alpha channel through a lookup table
+    new_alpha = image.getchannel("A").point([int(x * opacity) for x in range(256)])
 
-    # Create new alpha channel with adjusted opacity
-    new_alpha = original_alpha.point(lambda x: int(x * opacity))
-
-    # Create new image with modified alpha channel
-    result = Image.new("RGBA", image.size)
-    result.paste(image.convert("RGB"), (0, 0))
+    result = image.copy()
     result.putalpha(new_alpha)
-
     return result
 
 
@@ -4,10 +4,21 @@ from typing import Optional
 from models.llm_message import LLMSystemMessage, LLMUserMessage
 from models.llm_tools import SearchWebTool
 from services.llm_client import LLMClient
+from services.score_based_chunker import ScoreBasedChunker
 from utils.get_dynamic_models import get_presentation_outline_model_with_n_slides
+from utils.get_env import get_outline_context_token_budget_env
 from utils.llm_client_error_handler import handle_llm_client_exceptions
 from utils.llm_provider import get_model
 
+# Documents larger than this are reduced to their best scored sections
+DEFAULT_OUTLINE_CONTEXT_TOKEN_BUDGET = 100000
+
+
+def get_outline_context_token_budget() -> int:
+    return int(
+        get_outline_context_token_budget_env() or DEFAULT_OUTLINE_CONTEXT_TOKEN_BUDGET
+    )
+
 
 def get_system_prompt(
     tone: Optional[str] = None,
@@ -98,6 +109,11 @@ async def generate_ppt_outline(
 
     client = LLMClient()
 
+    if additional_context:
+        additional_context = await ScoreBasedChunker().get_context_for_token_budget(
+            additional_context, get_outline_context_token_budget()
+        )
+
     try:
         async for chunk in client.stream_structured(
             model,
@@ -54,7 +54,9 @@ def get_system_prompt(
     """
 
 
-def get_user_prompt(outline: str, language: str):
+def get_user_prompt(
+    outline: str, language: str, document_context: Optional[str] = None
+):
     return f"""
         ## Current Date and Time
         {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
@@ -68,6 +70,9 @@ def get_user_prompt(outline: str, language: str):
 
         ## Slide Outline (STRICTLY FOLLOW THIS)
         {outline}
+
+        {"## Source Document Excerpts (use for facts and figures relevant to the outline)" if document_context else ""}
+        {document_context or ""}
     """
 
 
@@ -77,6 +82,7 @@ def get_messages(
     tone: Optional[str] = None,
     verbosity: Optional[str] = None,
     instructions: Optional[str] = None,
+    document_context: Optional[str] = None,
 ):
 
     return [
@@ -84,7 +90,7 @@ def get_messages(
             content=get_system_prompt(tone, verbosity, instructions),
         ),
         LLMUserMessage(
-            content=get_user_prompt(outline, language),
+            content=get_user_prompt(outline, language, document_context),
         ),
     ]
 
@@ -96,6 +102,7 @@ async def get_slide_content_from_type_and_outline(
     tone: Optional[str] = None,
     verbosity: Optional[str] = None,
     instructions: Optional[str] = None,
+    document_context: Optional[str] = None,
 ):
     client = LLMClient()
     model = get_model()
@@ -152,6 +159,7 @@ async def get_slide_content_from_type_and_outline(
                 tone,
                 verbosity,
                 instructions,
+                document_context,
             ),
             response_format=response_schema,
             strict=False,
@@ -3,6 +3,7 @@ from fastapi import HTTPException
 from constants.llm import (
     DEFAULT_ANTHROPIC_MODEL,
     DEFAULT_GOOGLE_MODEL,
+    DEFAULT_LLM_CONCURRENCY,
     DEFAULT_OPENAI_MODEL,
 )
 from enums.llm_provider import LLMProvider
@@ -10,6 +11,7 @@ from utils.get_env import (
     get_anthropic_model_env,
     get_custom_model_env,
     get_google_model_env,
+    get_llm_concurrency_env,
     get_llm_provider_env,
     get_ollama_model_env,
     get_openai_model_env,
@@ -63,3 +65,13 @@ def get_model():
             status_code=500,
             detail=f"Invalid LLM provider. Please select one of: openai, google, anthropic, ollama, custom",
         )
+
+
+def get_llm_concurrency() -> int:
+    concurrency = get_llm_concurrency_env()
+    if concurrency:
+        try:
+            return max(1, int(concurrency))
+        except ValueError:
+            pass
+    return DEFAULT_LLM_CONCURRENCY[get_llm_provider().value]